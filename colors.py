@@ -4,9 +4,6 @@
 # +
 # import(s)
 # -
-from colored import fg
-from colored import bg
-
 import argparse
 
 
@@ -24,6 +21,7 @@ YELLOW = '#FFFF00'
 RED = '#FF0000'
 GREEN = '#00FF00'
 BLUE = '#0000BB'
+STALEGRAY = '#A9A9A9'
 
 
 # +
@@ -202,6 +200,10 @@ COLORS = [
 # -
 def color_palette(_bg: str = DEFAULT_BG, _fg: str = DEFAULT_FG) -> None:
 
+    # colored is only needed here so it is imported on first use
+    from colored import fg
+    from colored import bg
+
     for _k, _v in CNAMES.items():
         try:
             print(f"{bg(_bg)}{fg(_fg)}{_k}/{_v}: {fg(_v)}Brown jars prevented the mixture from freezing too quickly")
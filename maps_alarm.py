@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+
+
+# +
+# import(s)
+# -
+from maps_registry import CompiledRegistry
+from maps_registry import NO_INDICES
+
+from typing import Any
+
+import collections
+import logging
+import math
+import time
+
+import numpy as np
+
+
+# +
+# constant(s)
+# -
+ALARM_STATES = ['normal', 'cold', 'hot', 'invalid']
+ALARM_NORMAL, ALARM_COLD, ALARM_HOT, ALARM_INVALID = 0, 1, 2, 3
+DEFAULT_DEADBAND = 0.0
+DEFAULT_HISTORY = 1000
+DEFAULT_HYSTERESIS = 0.01
+
+
+# +
+# function: as_float()
+# -
+# noinspection PyBroadException
+def as_float(value: Any = None) -> float:
+    """returns value as a float or NaN"""
+    try:
+        return float(value)
+    except:
+        return math.nan
+
+
+# +
+# class: AlarmEvent()
+# -
+AlarmEvent = collections.namedtuple('AlarmEvent', ['index', 'key', 'old', 'new', 'value', 'time'])
+
+
+# +
+# class: AlarmEngine()
+# use: ae = AlarmEngine(registry=reg, deadband=0.0, hysteresis=0.01, log=log)
+#      for _event in ae.evaluate(reg.indices(_batch), [_batch[_k] for _k in _batch if _k in reg.index]):
+#          ...
+# -
+class AlarmEngine(object):
+    """evaluates hot/cold/invalid alarms over a compiled registry and reports state changes only"""
+
+    # +
+    # (hidden) method: __init__()
+    # -
+    def __init__(self, registry: CompiledRegistry = None, deadband: float = DEFAULT_DEADBAND,
+                 hysteresis: float = DEFAULT_HYSTERESIS, history: int = DEFAULT_HISTORY,
+                 log: logging.Logger = None) -> None:
+
+        # get argument(s)
+        self.__registry = registry if registry is not None else CompiledRegistry()
+        self.__deadband = deadband if deadband >= 0.0 else DEFAULT_DEADBAND
+        self.__hysteresis = hysteresis if hysteresis >= 0.0 else DEFAULT_HYSTERESIS
+        self.__log = log
+
+        # deadband(s) and hysteresis are fractions of the span unless the registry gives them per stream
+        _span = self.__registry.hi - self.__registry.lo
+        _db = np.where(np.isnan(self.__registry.deadband), self.__deadband * _span, self.__registry.deadband)
+        _hy = np.where(np.isnan(self.__registry.hysteresis), self.__hysteresis * _span, self.__registry.hysteresis)
+
+        # a value must pass a limit by the deadband to raise and come back inside by the hysteresis to clear
+        self.__raise_lo = self.__registry.lo - _db
+        self.__raise_hi = self.__registry.hi + _db
+        self.__clear_lo = self.__registry.lo + _hy
+        self.__clear_hi = self.__registry.hi - _hy
+
+        # state(s) and event history
+        self.__states = np.zeros(self.__registry.nelms, dtype=np.int8)
+        self.__history = collections.deque(maxlen=history if history > 0 else DEFAULT_HISTORY)
+
+    # +
+    # variable getter(s)
+    # -
+    @property
+    def active(self) -> np.ndarray:
+        return np.flatnonzero(self.__states != ALARM_NORMAL)
+
+    @property
+    def history(self) -> list:
+        return list(self.__history)
+
+    @property
+    def nactive(self) -> int:
+        return int(np.count_nonzero(self.__states))
+
+    @property
+    def registry(self) -> CompiledRegistry:
+        return self.__registry
+
+    @property
+    def states(self) -> np.ndarray:
+        return self.__states
+
+    # +
+    # (hidden) method: __ranged__()
+    # -
+    def __ranged__(self, indices: np.ndarray = NO_INDICES, values: np.ndarray = None) -> np.ndarray:
+        """returns the new state(s) of ranged streams, NaN values keep their state"""
+        _old = self.__states[indices]
+        _hot = values > self.__raise_hi[indices]
+        _cold = values < self.__raise_lo[indices]
+        _new = _old.copy()
+        _new[(_old == ALARM_HOT) & (values <= self.__clear_hi[indices])] = ALARM_NORMAL
+        _new[(_old == ALARM_COLD) & (values >= self.__clear_lo[indices])] = ALARM_NORMAL
+        _new[_hot] = ALARM_HOT
+        _new[_cold] = ALARM_COLD
+        return _new
+
+    # +
+    # (hidden) method: __report__()
+    # -
+    def __report__(self, event: AlarmEvent = None) -> None:
+        self.__history.append(event)
+        if not self.__log:
+            return
+        _i, _extra = event.index, {'key': event.key, 'value': event.value}
+        if event.new == ALARM_COLD:
+            self.__log.warning(f"{event.key} value too cold! {event.value} < {self.__registry.lo[_i]}", extra=_extra)
+        elif event.new == ALARM_HOT:
+            self.__log.warning(f"{event.key} value too hot! {event.value} > {self.__registry.hi[_i]}", extra=_extra)
+        elif event.new == ALARM_INVALID:
+            self.__log.warning(f"{event.key} value not an option! {event.value} not in {self.__registry.choices.get(_i)}",
+                               extra=_extra)
+        else:
+            self.__log.info(f"{event.key} value back to normal, {event.value} (was {ALARM_STATES[event.old]})",
+                            extra=_extra)
+
+    # +
+    # method: evaluate()
+    # -
+    def evaluate(self, indices: np.ndarray = NO_INDICES, values: list = None) -> list:
+        """evaluates the value(s) of the indexed streams and returns an AlarmEvent for each state change"""
+        _events = []
+        if indices is None or len(indices) == 0:
+            return _events
+        _now = time.time()
+        _indices = np.asarray(indices, dtype=np.intp)
+
+        # ranged stream(s) in one vectorized pass
+        _mask = self.__registry.ranged[_indices]
+        if _mask.any():
+            _ri = _indices[_mask]
+            _rv = np.fromiter((as_float(_v) for _v, _m in zip(values, _mask) if _m), dtype=float, count=_ri.size)
+            _old = self.__states[_ri]
+            _new = self.__ranged__(_ri, _rv)
+            _changed = np.flatnonzero(_old != _new)
+            self.__states[_ri] = _new
+            for _j in _changed:
+                _events.append(AlarmEvent(int(_ri[_j]), self.__registry.keys[_ri[_j]], int(_old[_j]), int(_new[_j]), _rv[_j], _now))
+
+        # choice stream(s) are few so check them one at a time
+        _choices = self.__registry.choices
+        for _i, _v in zip(_indices, values):
+            if _i in _choices:
+                _old = int(self.__states[_i])
+                _new = ALARM_NORMAL if _v in _choices[_i] else ALARM_INVALID
+                if _new != _old:
+                    self.__states[_i] = _new
+                    _events.append(AlarmEvent(int(_i), self.__registry.keys[_i], _old, _new, _v, _now))
+
+        for _event in _events:
+            self.__report__(_event)
+        return _events
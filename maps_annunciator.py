@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+
+
+# +
+# import(s)
+# -
+from colors import BLUE
+from colors import DEFAULT_BG
+from colors import GREEN
+from colors import RED
+from colors import STALEGRAY
+from colors import YELLOW
+from maps_alarm import ALARM_COLD
+from maps_alarm import ALARM_HOT
+from maps_alarm import ALARM_INVALID
+from maps_alarm import ALARM_NORMAL
+from maps_alarm import ALARM_STATES
+from maps_qt import QAbstractItemView, QAbstractListModel, QBrush, QColor, QDockWidget, QHBoxLayout, QListView, \
+    QModelIndex, QPushButton, QVBoxLayout, QWidget, Qt
+
+from datetime import datetime
+from typing import Any
+
+import time
+
+
+# +
+# constant(s)
+# -
+DEFAULT_SHELVE = 3600
+ANNUNCIATOR_COLORS = {
+    ALARM_NORMAL: (GREEN, DEFAULT_BG),
+    ALARM_COLD: (BLUE, YELLOW),
+    ALARM_HOT: (RED, YELLOW),
+    ALARM_INVALID: (YELLOW, BLUE),
+}
+
+
+# +
+# class: AnnunciatorModel()
+# -
+# noinspection PyPep8Naming,PyMethodOverriding,PyUnresolvedReferences
+class AnnunciatorModel(QAbstractListModel):
+    """list model of active alarms, updated one event at a time, events for a shelved alarm are skipped"""
+
+    # +
+    # (hidden) method: __init__()
+    # -
+    def __init__(self, module: str = '', pages: dict = None, parent: Any = None) -> None:
+        super().__init__(parent)
+        self.__module = module
+        self.__pages = pages if isinstance(pages, dict) else {}
+        self.__rows = []
+        self.__index = {}
+        self.__alarms = {}
+        self.__shelved = {}
+        self.__nunacked = 0
+
+    # +
+    # variable getter(s)
+    # -
+    @property
+    def alarms(self) -> dict:
+        return self.__alarms
+
+    @property
+    def rows(self) -> list:
+        return self.__rows
+
+    @property
+    def nunacked(self) -> int:
+        return self.__nunacked
+
+    # +
+    # (over-ride) method(s)
+    # -
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.__rows)
+
+    def data(self, index: QModelIndex = QModelIndex(), role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid() or index.row() >= len(self.__rows):
+            return None
+        _k = self.__rows[index.row()]
+        _a = self.__alarms[_k]
+        _shelved = _a['shelved'] > time.time()
+        if role == Qt.ItemDataRole.DisplayRole:
+            _flags = f"{'' if _a['acked'] else ' UNACK'}{' CLEARED' if _a['state'] == ALARM_NORMAL else ''}{' SHELVED' if _shelved else ''}"
+            return f"{datetime.fromtimestamp(_a['since']).strftime('%H:%M:%S')} {ALARM_STATES[_a['state']].upper():7s} " \
+                   f"{_k} = {_a['value']} [{self.__module} {_a['page']}]{_flags}"
+        elif role == Qt.ItemDataRole.ToolTipRole:
+            return f"{_k}: {ALARM_STATES[_a['state']]} since {datetime.fromtimestamp(_a['since']).isoformat()}"
+        elif role == Qt.ItemDataRole.BackgroundRole:
+            return QBrush(QColor(STALEGRAY if _shelved else ANNUNCIATOR_COLORS[_a['state']][0]))
+        elif role == Qt.ItemDataRole.ForegroundRole:
+            return QBrush(QColor(DEFAULT_BG if _shelved else ANNUNCIATOR_COLORS[_a['state']][1]))
+        return None
+
+    # +
+    # (hidden) method: __changed__()
+    # -
+    def __changed__(self, key: str = '') -> None:
+        _row = self.__index[key]
+        self.dataChanged.emit(self.index(_row), self.index(_row))
+
+    # +
+    # (hidden) method: __remove__()
+    # -
+    def __remove__(self, key: str = '') -> None:
+        _row = self.__index.pop(key)
+        self.beginRemoveRows(QModelIndex(), _row, _row)
+        del self.__rows[_row]
+        for _i in range(_row, len(self.__rows)):
+            self.__index[self.__rows[_i]] = _i
+        if not self.__alarms.pop(key)['acked']:
+            self.__nunacked -= 1
+        self.__shelved.pop(key, None)
+        self.endRemoveRows()
+
+    # +
+    # (hidden) method: __unshelve__()
+    # -
+    def __unshelve__(self, key: str = '') -> None:
+        """repaints the alarm in the state it reached while shelved"""
+        self.__shelved.pop(key, None)
+        _a = self.__alarms[key]
+        _a['shelved'] = 0.0
+        if _a['state'] == ALARM_NORMAL and _a['acked']:
+            self.__remove__(key)
+        else:
+            self.__changed__(key)
+
+    # +
+    # method: apply()
+    # -
+    def apply(self, events: list = None) -> None:
+        """applies alarm events, cleared alarms stay listed until acknowledged"""
+        for _event in (events or []):
+            _k = _event.key
+            if _k in self.__shelved:
+                # only the state is kept, the row is repainted when the shelve ends
+                self.__alarms[_k]['state'], self.__alarms[_k]['value'] = _event.new, _event.value
+            elif _k in self.__alarms:
+                _a = self.__alarms[_k]
+                if _event.new == ALARM_NORMAL and _a['acked']:
+                    self.__remove__(_k)
+                    continue
+                _a['state'], _a['value'] = _event.new, _event.value
+                if _event.new != ALARM_NORMAL:
+                    if _a['acked']:
+                        self.__nunacked += 1
+                    _a['since'], _a['acked'] = _event.time, False
+                self.__changed__(_k)
+            elif _event.new != ALARM_NORMAL:
+                self.beginInsertRows(QModelIndex(), len(self.__rows), len(self.__rows))
+                self.__index[_k] = len(self.__rows)
+                self.__rows.append(_k)
+                self.__alarms[_k] = {'state': _event.new, 'value': _event.value, 'since': _event.time,
+                                     'page': self.__pages.get(_k, ''), 'acked': False, 'shelved': 0.0}
+                self.__nunacked += 1
+                self.endInsertRows()
+
+    # +
+    # method: acknowledge()
+    # -
+    def acknowledge(self, keys: list = None) -> None:
+        for _k in [_ for _ in (keys if keys is not None else list(self.__rows)) if _ in self.__alarms]:
+            if self.__alarms[_k]['state'] == ALARM_NORMAL:
+                self.__remove__(_k)
+            elif not self.__alarms[_k]['acked']:
+                self.__alarms[_k]['acked'] = True
+                self.__nunacked -= 1
+                self.__changed__(_k)
+
+    # +
+    # method: shelve()
+    # -
+    def shelve(self, keys: list = None, seconds: float = DEFAULT_SHELVE) -> None:
+        """shelves the alarm(s) for a number of seconds, 0 unshelves them"""
+        _until = time.time() + seconds if seconds > 0.0 else 0.0
+        for _k in [_ for _ in (keys or []) if _ in self.__alarms]:
+            if _until > 0.0:
+                self.__alarms[_k]['shelved'] = self.__shelved[_k] = _until
+                self.__changed__(_k)
+            else:
+                self.__unshelve__(_k)
+
+    # +
+    # method: sweep()
+    # -
+    def sweep(self, now: float = 0.0) -> None:
+        """unshelves the alarm(s) whose shelve has run out"""
+        _now = now if now > 0.0 else time.time()
+        for _k in [_k for _k, _until in self.__shelved.items() if _until <= _now]:
+            self.__unshelve__(_k)
+
+
+# +
+# class: AnnunciatorDock()
+# use: dock = AnnunciatorDock(module='all', pages={'Time.Now.JD': 12}, locate=callback, parent=self)
+#      self.addDockWidget(Qt.DockWidgetArea.BottomDockWidgetArea, dock)
+#      dock.apply(events)
+# -
+# noinspection PyUnresolvedReferences
+class AnnunciatorDock(QDockWidget):
+    """dockable list of the active alarms of one module with acknowledge and shelve"""
+
+    # +
+    # (hidden) method: __init__()
+    # -
+    def __init__(self, module: str = '', pages: dict = None, locate: Any = None, parent: Any = None) -> None:
+        super().__init__('Alarm(s)', parent)
+        self.setObjectName('AnnunciatorDock')
+        self.__locate = locate
+
+        # a list view only paints the visible rows so thousands of alarms stay cheap
+        self.__model = AnnunciatorModel(module=module, pages=pages, parent=self)
+        self.__view = QListView()
+        self.__view.setModel(self.__model)
+        self.__view.setUniformItemSizes(True)
+        self.__view.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.__view.doubleClicked.connect(self.__double_clicked__)
+
+        # button(s)
+        _ack = QPushButton('Acknowledge')
+        _ack.clicked.connect(lambda: self.__model.acknowledge(self.selected()))
+        _ack_all = QPushButton('Acknowledge All')
+        _ack_all.clicked.connect(lambda: self.__model.acknowledge())
+        _shelve = QPushButton('Shelve 1h')
+        _shelve.clicked.connect(lambda: self.__model.shelve(self.selected(), DEFAULT_SHELVE))
+        _unshelve = QPushButton('Unshelve')
+        _unshelve.clicked.connect(lambda: self.__model.shelve(self.selected(), 0.0))
+
+        _buttons = QHBoxLayout()
+        for _b in (_ack, _ack_all, _shelve, _unshelve):
+            _buttons.addWidget(_b)
+        _w = QWidget()
+        _v = QVBoxLayout(_w)
+        _v.addWidget(self.__view)
+        _v.addLayout(_buttons)
+        self.setWidget(_w)
+
+        self.__model.rowsInserted.connect(self.__update_title__)
+        self.__model.rowsRemoved.connect(self.__update_title__)
+        self.__model.dataChanged.connect(self.__update_title__)
+
+    # +
+    # variable getter(s)
+    # -
+    @property
+    def model(self) -> AnnunciatorModel:
+        return self.__model
+
+    # +
+    # (hidden) method: __double_clicked__()
+    # -
+    def __double_clicked__(self, index: QModelIndex = None) -> None:
+        if self.__locate is not None and index is not None and index.isValid():
+            self.__locate(self.__model.rows[index.row()])
+
+    # +
+    # (hidden) method: __update_title__()
+    # -
+    def __update_title__(self, *args) -> None:
+        self.setWindowTitle(f"Alarm(s): {len(self.__model.rows)} active, {self.__model.nunacked} unacknowledged")
+
+    # +
+    # method: apply()
+    # -
+    def apply(self, events: list = None) -> None:
+        self.__model.apply(events)
+
+    # +
+    # method: sweep()
+    # -
+    def sweep(self) -> None:
+        self.__model.sweep()
+
+    # +
+    # method: selected()
+    # -
+    def selected(self) -> list:
+        return [self.__model.rows[_i.row()] for _i in self.__view.selectionModel().selectedIndexes()]
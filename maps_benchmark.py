@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+
+
+# +
+# import(s)
+# -
+from maps_indi import TAB_DATA
+from maps_metrics import rss_bytes
+from maps_synthetic import register_synthetic
+
+from datetime import datetime
+
+import argparse
+import copy
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+
+# +
+# constant(s)
+# -
+__doc__ = """python3 maps_benchmark.py --help"""
+BENCHMARK_GUIS = ['status', 'control']
+DEFAULT_DELAYS = '1,100'
+DEFAULT_DURATION = 3.0
+DEFAULT_ITEMS = '25,100'
+DEFAULT_OUTPUT = 'maps_benchmark.json'
+DEFAULT_QT = '5,6'
+MODULES = [_ for _ in list(TAB_DATA.keys())]
+
+
+# +
+# function: split_csv()
+# -
+def split_csv(value: str = '', cast: type = str) -> list:
+    return [cast(_.strip()) for _ in f"{value}".split(',') if _.strip() != '']
+
+
+# +
+# function: totals()
+# -
+def totals(metrics: list = None) -> dict:
+    """returns {metric name: sum over samples} from a gui's pipeline snapshot()"""
+    return {_m.name: sum(float(_v) for _, _v in _m.samples) for _m in (metrics or [])}
+
+
+# +
+# function: reset_registry()
+# -
+def reset_registry(pristine: dict = None) -> None:
+    """puts back a fresh copy of the stream registry, as each gui stores its own label(s) and widget(s) in it"""
+    TAB_DATA.clear()
+    TAB_DATA.update(copy.deepcopy(pristine))
+
+
+# +
+# function: bench_one()
+# -
+# noinspection PyUnresolvedReferences
+def bench_one(app=None, timer=None, klass=None, gui: str = '', module: str = '', items: int = 0,
+              delay: int = 0, duration: float = DEFAULT_DURATION) -> dict:
+    """constructs one gui, runs its event loop for duration seconds and returns the measurement(s)"""
+    _result = {'gui': gui, 'qt': int(os.getenv('QT_VERSION', -1)), 'module': module, 'items': items, 'delay': delay}
+
+    # construction
+    gc.collect()
+    _rss = rss_bytes()
+    _t0 = time.perf_counter()
+    _g = klass(items=items, delay=delay, module=module)
+    _result['construct_s'] = time.perf_counter() - _t0
+    _result['streams'] = _g.indi_nelms
+    _result['delay'] = _g.delay
+    if _g.indi_nelms == 0:
+        _result['skipped'] = True
+        _g.deleteLater()
+        return _result
+    _result['rss_per_stream_bytes'] = (rss_bytes() - _rss) / _g.indi_nelms
+
+    # throughput, with the gui's own timer driving alarm()
+    _before = totals(_g.pipeline.snapshot())
+    _t0 = time.perf_counter()
+    timer.singleShot(int(duration * 1000), app.quit)
+    app.exec()
+    _elapsed = time.perf_counter() - _t0
+    _after = totals(_g.pipeline.snapshot())
+    _g.shutdown()
+    _g.deleteLater()
+    app.processEvents()
+
+    _ticks = _after['maps_ticks_total'] - _before['maps_ticks_total']
+    _result['elapsed_s'] = _elapsed
+    _result['ticks_per_s'] = _ticks / _elapsed
+    _result['updates_per_s'] = (_after['maps_updates_total'] - _before['maps_updates_total']) / _elapsed
+    _result['repaints_per_s'] = (_after['maps_repaints_total'] - _before['maps_repaints_total']) / _elapsed
+    _result['tick_mean_ms'] = (_after['maps_tick_seconds_total'] - _before['maps_tick_seconds_total']) * 1000.0 / _ticks \
+        if _ticks > 0 else 0.0
+    _result['rss_bytes'] = _after['process_resident_memory_bytes']
+    return _result
+
+
+# +
+# function: run_worker()
+# -
+def run_worker(guis: list = None, modules: list = None, items: list = None, delays: list = None,
+               duration: float = DEFAULT_DURATION, output: str = DEFAULT_OUTPUT, synthetic: list = None) -> None:
+    """runs every combination under the QT_VERSION this process was started with"""
+
+    # the gui(s) select their Qt binding at import time
+    import maps_control_gui
+    import maps_status_gui
+    _klasses = {'status': maps_status_gui.MapsStatusGui, 'control': maps_control_gui.MapsControlGui}
+    app = maps_status_gui.QApplication([])
+    modules = list(modules) + [register_synthetic(nelms=_n) for _n in (synthetic or [])]
+
+    # every run starts from the registry as it was before any gui touched it
+    _pristine = copy.deepcopy(TAB_DATA)
+    _results = []
+    for _gui in guis:
+        for _module in modules:
+            for _items in items:
+                for _delay in delays:
+                    reset_registry(_pristine)
+                    _results.append(bench_one(app=app, timer=maps_status_gui.QTimer, klass=_klasses[_gui],
+                                              gui=_gui, module=_module, items=_items, delay=_delay,
+                                              duration=duration))
+    with open(output, 'w') as _fd:
+        json.dump(_results, _fd)
+
+
+# +
+# function: execute()
+# -
+def execute(_qt: list = None, _guis: list = None, _modules: list = None, _items: list = None,
+            _delays: list = None, _duration: float = DEFAULT_DURATION, _output: str = DEFAULT_OUTPUT,
+            _synthetic: list = None) -> None:
+    """runs one offscreen worker process per Qt version and writes all the result(s) to one JSON file"""
+    _report = {'meta': {'date': datetime.now().isoformat(), 'python': platform.python_version(),
+                        'platform': platform.platform(), 'duration': _duration},
+               'results': [], 'errors': []}
+    for _v in _qt:
+        with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as _tmp:
+            _path = _tmp.name
+        _cmd = [sys.executable, os.path.abspath(__file__), '--worker', f'--guis={",".join(_guis)}',
+                f'--modules={",".join(_modules)}', f'--items={",".join(map(str, _items))}',
+                f'--delays={",".join(map(str, _delays))}', f'--duration={_duration}', f'--output={_path}',
+                f'--synthetic={",".join(map(str, _synthetic or []))}']
+        _env = dict(os.environ, QT_VERSION=f"{_v}", QT_QPA_PLATFORM='offscreen')
+        _proc = subprocess.run(_cmd, env=_env, capture_output=True, text=True)
+        try:
+            with open(_path, 'r') as _fd:
+                _report['results'].extend(json.load(_fd))
+        except Exception as _:
+            _report['errors'].append({'qt': _v, 'returncode': _proc.returncode, 'error': f"{_}",
+                                      'stderr': _proc.stderr[-2000:]})
+        finally:
+            if os.path.exists(_path):
+                os.remove(_path)
+
+    with open(_output, 'w') as _fd:
+        json.dump(_report, _fd, indent=2)
+
+    print(f"{'gui':8s} {'qt':>2s} {'module':20s} {'items':>5s} {'delay':>5s} {'streams':>7s} {'build s':>8s} "
+          f"{'B/stream':>9s} {'ticks/s':>8s} {'updates/s':>10s} {'tick ms':>8s}")
+    for _r in _report['results']:
+        if _r.get('skipped', False):
+            continue
+        print(f"{_r['gui']:8s} {_r['qt']:2d} {_r['module']:20s} {_r['items']:5d} {_r['delay']:5d} {_r['streams']:7d} "
+              f"{_r['construct_s']:8.3f} {_r['rss_per_stream_bytes']:9.0f} {_r['ticks_per_s']:8.1f} "
+              f"{_r['updates_per_s']:10.1f} {_r['tick_mean_ms']:8.3f}")
+    for _e in _report['errors']:
+        print(f"ERROR: Qt{_e['qt']} worker failed ({_e['returncode']}): {_e['error']}")
+    print(f"Wrote {_output}")
+
+
+# +
+# main()
+# -
+if __name__ == '__main__':
+
+    # get command line argument(s)
+    _p = argparse.ArgumentParser(description='maps gui benchmark', formatter_class=argparse.RawTextHelpFormatter)
+    _p.add_argument('--qt', default=DEFAULT_QT, help=f"""Qt version(s) [%(default)s]""")
+    _p.add_argument('--guis', default=','.join(BENCHMARK_GUIS), help=f"""GUI(s) [%(default)s]""")
+    _p.add_argument('--modules', default=','.join(MODULES), help=f"""Module(s) [%(default)s]""")
+    _p.add_argument('--items', default=DEFAULT_ITEMS, help=f"""Items / Tab [%(default)s]""")
+    _p.add_argument('--delays', default=DEFAULT_DELAYS, help=f"""Delay Period(s) (ms) [%(default)s]""")
+    _p.add_argument('--duration', default=DEFAULT_DURATION, help=f"""Seconds per run [%(default)s]""")
+    _p.add_argument('--output', default=DEFAULT_OUTPUT, help=f"""JSON output file [%(default)s]""")
+    _p.add_argument('--synthetic', default='', help=f"""Synthetic module size(s) [%(default)s], eg. 4170,41700""")
+    _p.add_argument('--worker', default=False, action='store_true', help=argparse.SUPPRESS)
+    _a = _p.parse_args()
+
+    _args = {'guis': split_csv(_a.guis), 'modules': split_csv(_a.modules), 'items': split_csv(_a.items, int),
+             'delays': split_csv(_a.delays, int), 'duration': float(_a.duration),
+             'synthetic': split_csv(_a.synthetic, int)}
+    if _a.worker:
+        run_worker(output=_a.output, **_args)
+    else:
+        execute(_qt=split_csv(_a.qt, int), _guis=_args['guis'], _modules=_args['modules'], _items=_args['items'],
+                _delays=_args['delays'], _duration=_args['duration'], _output=_a.output.strip(),
+                _synthetic=_args['synthetic'])
@@ -0,0 +1,506 @@
+#!/usr/bin/env python3
+
+
+# +
+# import(s)
+# -
+from pnd import CustomException
+from pnd import DEFAULT_HOST
+from pnd import DEFAULT_PORT
+from maps_ingest import DEFAULT_INGEST_SIZE
+from maps_ingest import INGEST_POLICIES
+from maps_ingest import IngestQueue
+from maps_latency import wire_time
+
+import logging
+import queue
+import threading
+import time
+
+
+# +
+# constant(s)
+# -
+BACKOFF_FACTOR = 2.0
+BACKOFF_MAX = 60.0
+BACKOFF_MIN = 1.0
+CONNECTION_STATES = ['disconnected', 'connecting', 'connected', 'stopped']
+POLL_TIMEOUT = 0.5
+ROUTE_SEPARATOR = ','
+
+
+# +
+# function: parse_routes()
+# use: parse_routes('Time=localhost:7624,tcs=tcs-host:7625') -> {'Time': ('localhost', 7624), 'tcs': ('tcs-host', 7625)}
+# -
+def parse_routes(routes: str = '', host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> dict:
+    """returns a device to (host, port) routing table, a missing host or port takes the default"""
+    _table = {}
+    for _elem in [_.strip() for _ in routes.split(ROUTE_SEPARATOR) if _.strip() != '']:
+        if '=' not in _elem:
+            raise CustomException(errnum=-2, extra=f"route '{_elem}' is not of the form device=host:port")
+        _dev, _srv = [_.strip() for _ in _elem.split('=', 1)]
+        _host, _, _port = _srv.partition(':')
+        _table[_dev] = (_host.strip() or host, int(_port) if _port.strip() != '' else port)
+    return _table
+
+
+# +
+# class: IndiConnection()
+# use: con = IndiConnection(host='localhost', port=7624, streams=['Time.Now', 'Time.Site'], log=log)
+#      con.start()
+#      _batch = con.drain()
+#      con.stop()
+# -
+# noinspection PyBroadException,PyUnresolvedReferences
+class IndiConnection(object):
+    """owns a pyindi2 client in a background thread, reconnecting with exponential backoff"""
+
+    # +
+    # (hidden) method: __init__()
+    # -
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 streams: list = None, log: logging.Logger = None,
+                 backoff_min: float = BACKOFF_MIN, backoff_max: float = BACKOFF_MAX,
+                 backoff_factor: float = BACKOFF_FACTOR, feed: IngestQueue = None) -> None:
+
+        # get argument(s)
+        self.host = host
+        self.port = port
+        self.streams = streams
+        self.log = log
+        self.backoff_min = backoff_min
+        self.backoff_max = backoff_max
+        self.backoff_factor = backoff_factor
+
+        # initialize variable(s)
+        self.__attempts = 0
+        self.__generation = 0
+        self.__lock = threading.Lock()
+        self.__message = ''
+        self.__pi = None
+        self.__queue = feed if feed is not None else IngestQueue(log=log)
+        self.__sets = queue.Queue()
+        self.__state = CONNECTION_STATES[0]
+        self.__stop = threading.Event()
+        self.__thread = None
+
+    # +
+    # decorator(s)
+    # -
+    @property
+    def host(self) -> str:
+        return f"{self.__host}"
+
+    @host.setter
+    def host(self, host: str = DEFAULT_HOST) -> None:
+        self.__host = host if host.strip() != '' else DEFAULT_HOST
+
+    @property
+    def port(self) -> int:
+        return int(self.__port)
+
+    @port.setter
+    def port(self, port: int = DEFAULT_PORT) -> None:
+        self.__port = port if port > 0 else DEFAULT_PORT
+
+    @property
+    def server(self) -> tuple:
+        return self.__host, self.__port
+
+    @property
+    def streams(self) -> list:
+        return self.__streams
+
+    @streams.setter
+    def streams(self, streams: list = None) -> None:
+        self.__streams = sorted(set(streams)) if isinstance(streams, (list, tuple, set)) else []
+
+    @property
+    def log(self) -> logging.Logger:
+        return self.__log
+
+    @log.setter
+    def log(self, log: logging.Logger = None) -> None:
+        self.__log = log
+
+    @property
+    def backoff_min(self) -> float:
+        return float(self.__backoff_min)
+
+    @backoff_min.setter
+    def backoff_min(self, backoff_min: float = BACKOFF_MIN) -> None:
+        self.__backoff_min = backoff_min if backoff_min > 0.0 else BACKOFF_MIN
+
+    @property
+    def backoff_max(self) -> float:
+        return float(self.__backoff_max)
+
+    @backoff_max.setter
+    def backoff_max(self, backoff_max: float = BACKOFF_MAX) -> None:
+        self.__backoff_max = backoff_max if backoff_max >= self.__backoff_min else BACKOFF_MAX
+
+    @property
+    def backoff_factor(self) -> float:
+        return float(self.__backoff_factor)
+
+    @backoff_factor.setter
+    def backoff_factor(self, backoff_factor: float = BACKOFF_FACTOR) -> None:
+        self.__backoff_factor = backoff_factor if backoff_factor >= 1.0 else BACKOFF_FACTOR
+
+    # +
+    # variable getter(s)
+    # -
+    @property
+    def attempts(self) -> int:
+        return int(self.__attempts)
+
+    @property
+    def connected(self) -> bool:
+        return self.__state == 'connected'
+
+    @property
+    def generation(self) -> int:
+        return int(self.__generation)
+
+    @property
+    def message(self) -> str:
+        return f"{self.__message}"
+
+    @property
+    def pending(self) -> int:
+        return self.__sets.qsize()
+
+    @property
+    def running(self) -> bool:
+        return self.__thread is not None and self.__thread.is_alive()
+
+    @property
+    def stale(self) -> bool:
+        return self.__state != 'connected'
+
+    @property
+    def state(self) -> str:
+        return f"{self.__state}"
+
+    # +
+    # (hidden) method: __set_state__()
+    # -
+    def __set_state__(self, state: str = CONNECTION_STATES[0], msg: str = '') -> None:
+        with self.__lock:
+            if state != self.__state:
+                self.__generation += 1
+            self.__state = state if state in CONNECTION_STATES else CONNECTION_STATES[0]
+            self.__message = msg
+
+    # +
+    # (hidden) method: __subscribe__()
+    # -
+    def __subscribe__(self) -> None:
+        """subscribes to every stream in one pass, any failure fails the whole batch"""
+        for _elem in self.__streams:
+            _dev, _nam = _elem.split('.')
+            self.__pi.sub(device=_dev, name=_nam)
+        if self.__log:
+            self.__log.info(f"subscribed to {len(self.__streams)} streams at {self.__host}:{self.__port} OK")
+
+    # +
+    # (hidden) method: __alive__()
+    # -
+    def __alive__(self) -> bool:
+        """best-effort liveness check on the client"""
+        try:
+            _flag = getattr(self.__pi, 'connected', True)
+            return bool(_flag() if callable(_flag) else _flag)
+        except:
+            return False
+
+    # +
+    # (hidden) method: __drop__()
+    # -
+    def __drop__(self, msg: str = '') -> None:
+        if self.__log:
+            self.__log.error(msg)
+        self.__pi = None
+        self.__discard__()
+        self.__set_state__('disconnected', msg)
+
+    # +
+    # (hidden) method: __discard__()
+    # -
+    def __discard__(self) -> None:
+        """drops queued set(s) rather than send them to a server we may reconnect to much later"""
+        _titles = []
+        while True:
+            try:
+                _titles.append(self.__sets.get_nowait()[0])
+            except queue.Empty:
+                break
+        if self.__log and _titles:
+            self.__log.warning(f"discarded {len(_titles)} set(s) for indi at {self.__host}:{self.__port}: {_titles}")
+
+    # +
+    # (hidden) method: __send__()
+    # -
+    def __send__(self) -> None:
+        """sends queued set(s) from this thread, which owns the client"""
+        while not self.__stop.is_set():
+            try:
+                _title, _value, _timeout = self.__sets.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                self.__pi.setINDI(_title, _value, timeout=_timeout)
+            except Exception as _e:
+                if self.__log:
+                    self.__log.error(f"failed to set '{_title}' to {_value} at {self.__host}:{self.__port}, error='{_e}'")
+
+    # +
+    # (hidden) method: __release__()
+    # -
+    def __release__(self) -> None:
+        """unsubscribes and drops the client from this thread, which owns it"""
+        if self.__pi is not None:
+            try:
+                for _elem in self.__streams:
+                    _dev, _nam = _elem.split('.')
+                    self.__pi.unsub(device=_dev, name=_nam)
+            except Exception as _:
+                if self.__log:
+                    self.__log.error(f"failed to unsubscribe from indi streams, error='{_}'")
+        self.__pi = None
+        self.__discard__()
+        self.__set_state__('stopped', f"disconnected from indi at {self.__host}:{self.__port}")
+
+    # +
+    # (hidden) method: __run__()
+    # -
+    def __run__(self) -> None:
+        """pumps until stopped, then releases the client and exits unless start() was called meanwhile"""
+        while True:
+            self.__pump__()
+            self.__release__()
+            with self.__lock:
+                if self.__stop.is_set():
+                    self.__thread = None
+                    return
+
+    # +
+    # (hidden) method: __pump__()
+    # -
+    def __pump__(self) -> None:
+        _delay = self.__backoff_min
+        while not self.__stop.is_set():
+
+            # (re)connect and resubscribe
+            if self.__pi is None:
+                self.__attempts += 1
+                self.__set_state__('connecting', f"connecting to indi at {self.__host}:{self.__port}, attempt {self.__attempts}")
+                try:
+                    from pyindi2.pyindi2 import PyINDI2
+                    self.__pi = PyINDI2(host=self.__host, port=self.__port, verbose=False)
+                    self.__subscribe__()
+                except Exception as _e0:
+                    self.__drop__(f"failed to connect to indi at {self.__host}:{self.__port}, retrying in {_delay:.1f}s, error='{_e0}'")
+                    self.__stop.wait(_delay)
+                    _delay = min(_delay * self.__backoff_factor, self.__backoff_max)
+                    continue
+                _delay = self.__backoff_min
+                self.__set_state__('connected', f"connected to indi at {self.__host}:{self.__port}, subscribed to {len(self.__streams)} streams OK")
+                if self.__log:
+                    self.__log.info(self.__message)
+
+            # send queued set(s), then pump updates off the client queue
+            self.__send__()
+            try:
+                _ret = self.__pi.Q.get(block=True, timeout=POLL_TIMEOUT)
+            except queue.Empty:
+                if not self.__alive__():
+                    self.__drop__(f"lost connection to indi at {self.__host}:{self.__port}")
+                continue
+            except Exception as _e1:
+                self.__drop__(f"lost connection to indi at {self.__host}:{self.__port}, error='{_e1}'")
+                continue
+            if isinstance(_ret, dict) and _ret:
+                _received = time.time()
+                _wire = wire_time(_ret)
+                while not self.__queue.put((_received, _wire, _ret), timeout=POLL_TIMEOUT):
+                    if self.__stop.is_set():
+                        break
+
+    # +
+    # method: start()
+    # -
+    def start(self) -> None:
+        """starts the connection thread, or keeps a stopping one running, so there is never more than one"""
+        with self.__lock:
+            self.__stop.clear()
+            if self.__thread is not None:
+                return
+            self.__thread = threading.Thread(target=self.__run__, name=f'IndiConnection-{self.__host}:{self.__port}', daemon=True)
+            self.__thread.start()
+
+    # +
+    # method: stop()
+    # -
+    def stop(self) -> None:
+        """asks the connection thread to unsubscribe and exit, within POLL_TIMEOUT second(s), without waiting for it"""
+        with self.__lock:
+            self.__stop.set()
+            _thread = self.__thread
+        if _thread is None:
+            self.__discard__()
+            self.__set_state__('stopped', f"disconnected from indi at {self.__host}:{self.__port}")
+
+    # +
+    # method: join()
+    # -
+    def join(self, timeout: float = POLL_TIMEOUT * 4) -> bool:
+        """waits for a stopped connection thread to exit, for callers off the gui thread, and returns True if it has"""
+        _thread = self.__thread
+        if _thread is not None:
+            _thread.join(timeout=timeout)
+        return not self.running
+
+    # +
+    # method: drain()
+    # -
+    def drain(self, limit: int = 0, stamps: dict = None) -> dict:
+        return self.__queue.drain(limit=limit, stamps=stamps)
+
+    # +
+    # method: set_indi()
+    # -
+    def set_indi(self, title: str = '', value=None, timeout: float = POLL_TIMEOUT) -> None:
+        """queues the set for the connection thread, within POLL_TIMEOUT second(s), so the caller never blocks"""
+        if self.__pi is None or not self.connected:
+            raise CustomException(errnum=-1, extra=f"not connected to indi, cannot set '{title}'")
+        self.__sets.put((title, value, timeout))
+
+
+# +
+# class: IndiConnectionPool()
+# use: pool = IndiConnectionPool(streams=['Time.Now', 'tcs.mount_mini_alt'], routes={'tcs': ('tcs-host', 7625)}, log=log)
+#      pool.start()
+#      _batch = pool.drain()
+#      pool.stop()
+# -
+# noinspection PyBroadException
+class IndiConnectionPool(object):
+    """one IndiConnection per (host, port), routed by device and merged into a single feed"""
+
+    # +
+    # (hidden) method: __init__()
+    # -
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 streams: list = None, routes: dict = None, log: logging.Logger = None,
+                 maxsize: int = DEFAULT_INGEST_SIZE, policy: str = INGEST_POLICIES[0]) -> None:
+
+        # get argument(s)
+        self.__host = host if host.strip() != '' else DEFAULT_HOST
+        self.__port = port if port > 0 else DEFAULT_PORT
+        self.__routes = routes if isinstance(routes, dict) else {}
+        self.__log = log
+
+        # initialize variable(s)
+        self.__feed = IngestQueue(maxsize=maxsize, policy=policy, log=log)
+        self.__pool = {}
+
+        # group streams by the server that owns their device
+        _streams = streams if isinstance(streams, (list, tuple, set)) else []
+        _servers = {}
+        for _elem in _streams:
+            _servers.setdefault(self.route(_elem.split('.')[0]), []).append(_elem)
+        for (_host, _port), _elems in _servers.items():
+            self.__pool[(_host, _port)] = IndiConnection(host=_host, port=_port, streams=_elems, log=log, feed=self.__feed)
+
+        if self.__log:
+            self.__log.info(f"connection pool servers={[f'{_h}:{_p}' for _h, _p in self.__pool]}")
+
+    # +
+    # variable getter(s)
+    # -
+    @property
+    def connections(self) -> dict:
+        return self.__pool
+
+    @property
+    def connected(self) -> bool:
+        return len(self.__pool) > 0 and all(_c.connected for _c in self.__pool.values())
+
+    @property
+    def depth(self) -> int:
+        return self.__feed.qsize()
+
+    @property
+    def feed(self) -> IngestQueue:
+        return self.__feed
+
+    @property
+    def generation(self) -> int:
+        return sum(_c.generation for _c in self.__pool.values())
+
+    @property
+    def message(self) -> str:
+        return '; '.join(_c.message for _c in self.__pool.values() if _c.message != '')
+
+    @property
+    def routes(self) -> dict:
+        return self.__routes
+
+    @property
+    def stale(self) -> bool:
+        return any(_c.stale for _c in self.__pool.values())
+
+    @property
+    def stale_devices(self) -> set:
+        return set(_s.split('.')[0] for _c in self.__pool.values() if _c.stale for _s in _c.streams)
+
+    @property
+    def state(self) -> str:
+        _states = set(_c.state for _c in self.__pool.values())
+        return _states.pop() if len(_states) == 1 else f"{sorted(_states)}"
+
+    # +
+    # method: route()
+    # -
+    def route(self, device: str = '') -> tuple:
+        """returns the (host, port) that serves the device"""
+        return self.__routes.get(device, (self.__host, self.__port))
+
+    # +
+    # method: start()
+    # -
+    def start(self) -> None:
+        for _c in self.__pool.values():
+            _c.start()
+
+    # +
+    # method: stop()
+    # -
+    def stop(self) -> None:
+        for _c in self.__pool.values():
+            _c.stop()
+
+    # +
+    # method: join()
+    # -
+    def join(self, timeout: float = POLL_TIMEOUT * 4) -> bool:
+        _end = time.monotonic() + timeout
+        return all([_c.join(timeout=max(_end - time.monotonic(), 0.0)) for _c in self.__pool.values()])
+
+    # +
+    # method: drain()
+    # -
+    def drain(self, limit: int = 0, stamps: dict = None) -> dict:
+        """returns all pending updates from every server merged into one dictionary without blocking"""
+        return self.__feed.drain(limit=limit, stamps=stamps)
+
+    # +
+    # method: set_indi()
+    # -
+    def set_indi(self, title: str = '', value=None, timeout: float = POLL_TIMEOUT) -> None:
+        _con = self.__pool.get(self.route(title.split('.')[0]), None)
+        if _con is None:
+            raise CustomException(errnum=-2, extra=f"no indiserver routed for '{title}'")
+        _con.set_indi(title, value, timeout=timeout)
@@ -4,41 +4,40 @@
 # +
 # import(s)
 # -
-from colors import *
-from pnd import *
-from maps_indi import *
-
-# noinspection PyBroadException
-try:
-    # noinspection PyUnresolvedReferences
-    from pyindi2.pyindi2 import *
-except:
-    pass
+from colors import ALARMORANGE
+from colors import ALARMRED
+from colors import CNAMES_R
+from colors import DEFAULT_BG
+from colors import DEFAULT_FG
+from colors import LIGHTGREEN
+from colors import PALEGREEN
+from colors import YELLOW
+from pnd import astropy_offline
+from pnd import get_logger
+from maps_annunciator import AnnunciatorDock
+from maps_connection import parse_routes
+from maps_indi import BLUE
+from maps_indi import RED
+from maps_indi import TAB_DATA
+from maps_indi import TAB_NAMES
+from maps_pipeline import PipelineOptions
+from maps_pipeline import TickPipeline
+from maps_pipeline import add_pipeline_arguments
+from maps_pipeline import pipeline_options
+from maps_qt import QAction, QApplication, QFont, QGridLayout, QGroupBox, QHBoxLayout, QIcon, QKeySequence, \
+    QLabel, QLCDNumber, QLineEdit, QMainWindow, QMenuBar, QMessageBox, QPixmap, QRadioButton, QSlider, QTabWidget, \
+    QTimer, QWidget, Qt, qVersion
+from maps_registry import DEFAULT_SWEEP
+
+from typing import Any
 
 import argparse
+import logging
+import math
 import platform
-import queue
+import random
 import sys
 
-QT_VERSION = int(os.getenv("QT_VERSION",  -1))
-if QT_VERSION == 5:
-    # noinspection PyPackageRequirements,PyUnresolvedReferences
-    from PyQt5.QtCore import *
-    # noinspection PyPackageRequirements,PyUnresolvedReferences
-    from PyQt5.QtWidgets import *
-    # noinspection PyPackageRequirements,PyUnresolvedReferences
-    from PyQt5.QtGui import *
-elif QT_VERSION == 6:
-    # noinspection PyPackageRequirements,PyUnresolvedReferences
-    from PyQt6.QtCore import *
-    # noinspection PyPackageRequirements,PyUnresolvedReferences
-    from PyQt6.QtWidgets import *
-    # noinspection PyPackageRequirements,PyUnresolvedReferences
-    from PyQt6.QtGui import *
-else:
-    color_print(msg='ERROR: Qt version not supported', color='red', height=2)
-    sys.exit(0)
-
 
 # +
 # constant(s)
@@ -75,7 +74,8 @@ class MapsControlGui(QMainWindow):
     def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, 
                  items: int = DEFAULT_ITEMS, delay: int = DEFAULT_DELAY,
                  fg: str = DEFAULT_FG, bg: str = DEFAULT_BG,
-                 module: str = DEFAULT_MODULE, log: logging.Logger = None) -> None:
+                 module: str = DEFAULT_MODULE, log: logging.Logger = None, routes: dict = None,
+                 options: PipelineOptions = None) -> None:
 
         # get argument(s)
         self.host = host
@@ -86,6 +86,8 @@ class MapsControlGui(QMainWindow):
         self.bg = bg
         self.module = module
         self.log = log
+        self.routes = routes
+        self.__options = options if isinstance(options, PipelineOptions) else PipelineOptions()
 
         # initialize the super class
         super().__init__(parent=None)
@@ -99,9 +101,15 @@ class MapsControlGui(QMainWindow):
         self.__connected = False
         self.__filemenu = None
         self.__simmenu = None
-        self.__pi = None
+        self.__viewmenu = None
+        self.__annunciator = None
+        self.__pages = {}
+        self.__pipeline = None
         self.__simulate = True
-        self.__step = 0
+        self.__action_profile = None
+        self.__action_dump = None
+        self.__action_latency = None
+        self.__debugmenu = None
 
         self.__lcds = {}
         self.__slds = {}
@@ -110,7 +118,9 @@ class MapsControlGui(QMainWindow):
         # initialize (some) widget(s)
         self.__connected_icon = QLabel()
         self.__connected_label = QLabel()
+        self.__profile_label = QLabel()
         self.__menubar = QMenuBar()
+        self.__stale_timer = QTimer()
         self.__timer = QTimer()
         self.__tabs = QTabWidget()
 
@@ -134,17 +144,25 @@ class MapsControlGui(QMainWindow):
                 self.__log.warning(f"No (writeable) controls selected")
             return
 
+        # the data path: drain, coerce, alarm, format and widget each tick, over the writable stream(s) only
+        self.__pipeline = TickPipeline(name=NAME, module=self.__module, data=dict(_streams),
+                                       streams=self.__indi_streams, host=self.__host, port=self.__port,
+                                       routes=self.__routes, delay=self.__delay, fg=self.__fg, bg=self.__bg,
+                                       options=self.__options, widget=self.__widget__,
+                                       annunciate=self.__annunciate__, log=self.__log, parent=self)
+
         # create user interface
         self.create_user_interface()
 
-        # if we are not in simulation mode, connect to the indiserver
-        if not self.__simulate:
-            # noinspection PyUnresolvedReferences
-            self.__pi = PyINDI2(verbose=False)
+        # if we are not in simulation mode (or are stress testing or sharing), connect to a source
+        if not self.__simulate or self.__options.firehose > 0.0 or self.__options.shared:
+            self.connect_to_indi()
 
         self.__dump__('pars')
         self.__dump__('vars')
         self.__timer.start(self.__delay)
+        self.__stale_timer.start(DEFAULT_SWEEP)
+        self.__pipeline.start()
 
     # +
     # decorator(s)
@@ -187,7 +205,7 @@ class MapsControlGui(QMainWindow):
 
     @module.setter
     def module(self, module: str = DEFAULT_MODULE) -> None:
-        self.__module = module if module in MODULES else DEFAULT_MODULE
+        self.__module = module if module in TAB_DATA else DEFAULT_MODULE
 
     @property
     def fg(self) -> str:
@@ -215,6 +233,14 @@ class MapsControlGui(QMainWindow):
     def log(self, log: logging.Logger = None) -> None:
         self.__log = log
 
+    @property
+    def routes(self) -> dict:
+        return self.__routes
+
+    @routes.setter
+    def routes(self, routes: dict = None) -> None:
+        self.__routes = routes if isinstance(routes, dict) else {}
+
     # +
     # variable getter(s)
     # -
@@ -223,8 +249,8 @@ class MapsControlGui(QMainWindow):
         return self.__connected
 
     @property
-    def pi(self) -> str:
-        return f"{self.__pi}"
+    def indi(self) -> str:
+        return f"{self.__pipeline.source if self.__pipeline is not None else None}"
 
     @property
     def simulate(self) -> bool:
@@ -232,7 +258,11 @@ class MapsControlGui(QMainWindow):
 
     @property
     def step(self) -> int:
-        return self.__step
+        return self.__pipeline.step if self.__pipeline is not None else 0
+
+    @property
+    def pipeline(self) -> TickPipeline:
+        return self.__pipeline
 
     @property
     def indi_nelms(self) -> int:
@@ -267,16 +297,16 @@ class MapsControlGui(QMainWindow):
                 self.__log.debug(f"self='{self}', host='{self.__host}', port={self.__port}, "
                                  f"items={self.__items}, delay={self.__delay}, "
                                  f"fg={self.__fg}, bg={self.__bg}, "
-                                 f"module='{self.__module}', log={self.__log}")
+                                 f"module='{self.__module}', log={self.__log}, routes={self.__routes}, "
+                                 f"options={self.__options}")
         elif which.lower().strip() == "vars":
             if self.__log:
                 self.__log.debug(f"self.__indi_streams={self.__indi_streams}, "
                                  f"self.__indi_nelms={self.__indi_nelms}, "
                                  f"self.__indi_pages={self.__indi_pages}, "
                                  f"self.__connected={self.__connected}, "
-                                 f"self.__pi={self.__pi}, "
                                  f"self.__simulate={self.__simulate}, "
-                                 f"self.__step={self.__step}")
+                                 f"self.__pipeline={self.__pipeline.report() if self.__pipeline is not None else None}")
 
     # +
     # (hidden) method: __create_menu__()
@@ -316,6 +346,21 @@ class MapsControlGui(QMainWindow):
         self.__simmenu = self.__menubar.addMenu('Simulate')
         self.__simmenu.addAction(self.__action_simulate)
 
+        self.__action_profile = QAction('&Profile', self, checkable=True)
+        self.__action_profile.setChecked(self.__pipeline.profiler.enabled)
+        self.__action_profile.triggered.connect(self.set_profile)
+
+        self.__action_dump = QAction('&Dump Profile', self)
+        self.__action_dump.triggered.connect(self.dump_profile)
+
+        self.__debugmenu = self.__menubar.addMenu('Debug')
+        self.__debugmenu.addAction(self.__action_profile)
+        self.__debugmenu.addAction(self.__action_dump)
+
+        self.__action_latency = QAction('Dump &Latency', self)
+        self.__action_latency.triggered.connect(self.dump_latency)
+        self.__debugmenu.addAction(self.__action_latency)
+
     # +
     # (hidden) method: __create_tabbed__()
     # -
@@ -396,6 +441,7 @@ class MapsControlGui(QMainWindow):
                         _data[_k]['label'].setToolTip(f"{_data[_k]['tooltip']}")
 
                         self.__vals = {**self.__vals, **{_k: QLabel(f"{_data[_k]['actval']}")}}
+                        self.__pages[_k] = _ip
 
                         # float or int tuple
                         _n1 = None
@@ -505,28 +551,28 @@ class MapsControlGui(QMainWindow):
             if 'float' in datatype:
                 if self.__log:
                     self.__log.info(f"calling setINDI('{title}', float({value}), timeout=DEFAULT_TIMEOUT)")
-                if not self.__simulate and hasattr('setINDI', self.__pi):
-                    self.__pi.setINDI(title, float(value), timeout=DEFAULT_TIMEOUT)
+                if not self.__simulate and self.__pipeline.source is not None:
+                    self.__pipeline.source.set_indi(title, float(value), timeout=DEFAULT_TIMEOUT)
             elif 'int' in datatype:
                 if self.__log:
                     self.__log.info(f"calling setINDI('{title}', int({value}), timeout=DEFAULT_TIMEOUT)")
-                if not self.__simulate and hasattr('setINDI', self.__pi):
-                    self.__pi.setINDI(title, int(value), timeout=DEFAULT_TIMEOUT)
+                if not self.__simulate and self.__pipeline.source is not None:
+                    self.__pipeline.source.set_indi(title, int(value), timeout=DEFAULT_TIMEOUT)
             elif 'bool' in datatype:
                 if self.__log:
                     self.__log.info(f"calling setINDI('{title}', bool({value}), timeout=DEFAULT_TIMEOUT)")
-                if not self.__simulate and hasattr('setINDI', self.__pi):
-                    self.__pi.setINDI(title, bool(value), timeout=DEFAULT_TIMEOUT)
+                if not self.__simulate and self.__pipeline.source is not None:
+                    self.__pipeline.source.set_indi(title, bool(value), timeout=DEFAULT_TIMEOUT)
             elif 'binary' in datatype:
                 if self.__log:
                     self.__log.info(f"calling setINDI('{title}', f'{value.encode('utf-8')}', timeout=DEFAULT_TIMEOUT)")
-                if not self.__simulate and hasattr('setINDI', self.__pi):
-                    self.__pi.setINDI(title, f"{value.encode('utf-8')}", timeout=DEFAULT_TIMEOUT)
+                if not self.__simulate and self.__pipeline.source is not None:
+                    self.__pipeline.source.set_indi(title, f"{value.encode('utf-8')}", timeout=DEFAULT_TIMEOUT)
             else:
                 if self.__log:
                     self.__log.info(f"calling setINDI('{title}', f'{value}', timeout=DEFAULT_TIMEOUT)")
-                if not self.__simulate and hasattr('setINDI', self.__pi):
-                    self.__pi.setINDI(title, f"{value}", timeout=DEFAULT_TIMEOUT)
+                if not self.__simulate and self.__pipeline.source is not None:
+                    self.__pipeline.source.set_indi(title, f"{value}", timeout=DEFAULT_TIMEOUT)
 
         except Exception as _:
             if self.__log:
@@ -546,28 +592,28 @@ class MapsControlGui(QMainWindow):
             if 'float' in datatype:
                 if self.__log:
                     self.__log.info(f"calling setINDI('{title}', float({value}), timeout=DEFAULT_TIMEOUT)")
-                if not self.__simulate and hasattr('setINDI', self.__pi):
-                    self.__pi.setINDI(title, float(value), timeout=DEFAULT_TIMEOUT)
+                if not self.__simulate and self.__pipeline.source is not None:
+                    self.__pipeline.source.set_indi(title, float(value), timeout=DEFAULT_TIMEOUT)
             elif 'int' in datatype:
                 if self.__log:
                     self.__log.info(f"calling setINDI('{title}', int({value}), timeout=DEFAULT_TIMEOUT)")
-                if not self.__simulate and hasattr('setINDI', self.__pi):
-                    self.__pi.setINDI(title, int(value), timeout=DEFAULT_TIMEOUT)
+                if not self.__simulate and self.__pipeline.source is not None:
+                    self.__pipeline.source.set_indi(title, int(value), timeout=DEFAULT_TIMEOUT)
             elif 'bool' in datatype:
                 if self.__log:
                     self.__log.info(f"calling setINDI('{title}', bool({value}), timeout=DEFAULT_TIMEOUT)")
-                if not self.__simulate and hasattr('setINDI', self.__pi):
-                    self.__pi.setINDI(title, bool(value), timeout=DEFAULT_TIMEOUT)
+                if not self.__simulate and self.__pipeline.source is not None:
+                    self.__pipeline.source.set_indi(title, bool(value), timeout=DEFAULT_TIMEOUT)
             elif 'binary' in datatype:
                 if self.__log:
                     self.__log.info(f"calling setINDI('{title}', f'{value.encode('utf-8')}', timeout=DEFAULT_TIMEOUT)")
-                if not self.__simulate and hasattr('setINDI', self.__pi):
-                    self.__pi.setINDI(title, f"{value.encode('utf-8')}", timeout=DEFAULT_TIMEOUT)
+                if not self.__simulate and self.__pipeline.source is not None:
+                    self.__pipeline.source.set_indi(title, f"{value.encode('utf-8')}", timeout=DEFAULT_TIMEOUT)
             else:
                 if self.__log:
                     self.__log.info(f"calling setINDI('{title}', f'{value}', timeout=DEFAULT_TIMEOUT)")
-                if not self.__simulate and hasattr('setINDI', self.__pi):
-                    self.__pi.setINDI(title, f"{value}", timeout=DEFAULT_TIMEOUT)
+                if not self.__simulate and self.__pipeline.source is not None:
+                    self.__pipeline.source.set_indi(title, f"{value}", timeout=DEFAULT_TIMEOUT)
 
         except Exception as _:
             if self.__log:
@@ -587,28 +633,28 @@ class MapsControlGui(QMainWindow):
             if 'float' in datatype:
                 if self.__log:
                     self.__log.info(f"calling setINDI('{title}', float({value}), timeout=DEFAULT_TIMEOUT)")
-                if not self.__simulate and hasattr('setINDI', self.__pi):
-                    self.__pi.setINDI(title, float(value), timeout=DEFAULT_TIMEOUT)
+                if not self.__simulate and self.__pipeline.source is not None:
+                    self.__pipeline.source.set_indi(title, float(value), timeout=DEFAULT_TIMEOUT)
             elif 'int' in datatype:
                 if self.__log:
                     self.__log.info(f"calling setINDI('{title}', int({value}), timeout=DEFAULT_TIMEOUT)")
-                if not self.__simulate and hasattr('setINDI', self.__pi):
-                    self.__pi.setINDI(title, int(value), timeout=DEFAULT_TIMEOUT)
+                if not self.__simulate and self.__pipeline.source is not None:
+                    self.__pipeline.source.set_indi(title, int(value), timeout=DEFAULT_TIMEOUT)
             elif 'bool' in datatype:
                 if self.__log:
                     self.__log.info(f"calling setINDI('{title}', bool({value}), timeout=DEFAULT_TIMEOUT)")
-                if not self.__simulate and hasattr('setINDI', self.__pi):
-                    self.__pi.setINDI(title, bool(value), timeout=DEFAULT_TIMEOUT)
+                if not self.__simulate and self.__pipeline.source is not None:
+                    self.__pipeline.source.set_indi(title, bool(value), timeout=DEFAULT_TIMEOUT)
             elif 'binary' in datatype:
                 if self.__log:
                     self.__log.info(f"calling setINDI('{title}', f'{value.encode('utf-8')}', timeout=DEFAULT_TIMEOUT)")
-                if not self.__simulate and hasattr('setINDI', self.__pi):
-                    self.__pi.setINDI(title, f"{value.encode('utf-8')}", timeout=DEFAULT_TIMEOUT)
+                if not self.__simulate and self.__pipeline.source is not None:
+                    self.__pipeline.source.set_indi(title, f"{value.encode('utf-8')}", timeout=DEFAULT_TIMEOUT)
             else:
                 if self.__log:
                     self.__log.info(f"calling setINDI('{title}', f'{value}', timeout=DEFAULT_TIMEOUT)")
-                if not self.__simulate and hasattr('setINDI', self.__pi):
-                    self.__pi.setINDI(title, f"{value}", timeout=DEFAULT_TIMEOUT)
+                if not self.__simulate and self.__pipeline.source is not None:
+                    self.__pipeline.source.set_indi(title, f"{value}", timeout=DEFAULT_TIMEOUT)
 
         except Exception as _:
             if self.__log:
@@ -658,11 +704,17 @@ class MapsControlGui(QMainWindow):
     # +
     # (hidden) method: __update_label__()
     # -
-    def __update_label__(self, flag: bool = False, msg: str = ''):
-        self.__connected = flag
+    def __update_label__(self, flag: bool = False, msg: str = '', stale: bool = False):
+        self.__connected = flag and not stale
         self.__connected_label.clear()
         self.__connected_label.setText(f"{msg:75s}")
-        if flag:
+        if flag and stale:
+            self.__connected_icon.setPixmap(QPixmap('plug-disconnect.png'))
+            self.__connected_label.setStyleSheet(f"background-color: '{ALARMORANGE}'; color: '{BLUE}';")
+            self.__action_simulate.setChecked(False)
+            self.__simulate = False
+            self.__menubar.setStyleSheet(f"background-color: '{ALARMORANGE}'; color: '{BLUE}'; border: solid 2px;")
+        elif flag:
             self.__connected_icon.setPixmap(QPixmap('plug-connect.png'))
             self.__connected_label.setStyleSheet(f"background-color: '{LIGHTGREEN}'; color: '{BLUE}';")
             self.__action_simulate.setChecked(False)
@@ -675,6 +727,40 @@ class MapsControlGui(QMainWindow):
             self.__simulate = True
             self.__menubar.setStyleSheet(f"background-color: '{ALARMRED}'; color: '{ALARMORANGE}'; border: solid 2px;")
 
+    # +
+    # (hidden) method: __check_connection__()
+    # -
+    def __check_connection__(self) -> None:
+        _state = self.__pipeline.check()
+        if _state is not None:
+            self.__update_label__(True, _state[0], stale=_state[1])
+
+    # +
+    # (hidden) method: __widget__()
+    # -
+    def __widget__(self, key: str = '') -> Any:
+        """returns the widget showing the stream's value"""
+        return self.__vals.get(key, None)
+
+    # +
+    # (hidden) method: __annunciate__()
+    # -
+    def __annunciate__(self, events: list = None) -> None:
+        """lists alarm state change(s) in the annunciator"""
+        if self.__annunciator is not None:
+            self.__annunciator.apply(events)
+
+    # +
+    # (hidden) method: __locate__()
+    # -
+    def __locate__(self, key: str = '') -> None:
+        """shows the tab holding the stream"""
+        _name = f"{TAB_NAMES.get(self.__module)} {self.__pages.get(key, 0)}"
+        for _i in range(self.__tabs.count()):
+            if self.__tabs.tabText(_i) == _name:
+                self.__tabs.setCurrentIndex(_i)
+                break
+
     # +
     # method: create_user_interface()
     # -
@@ -684,11 +770,22 @@ class MapsControlGui(QMainWindow):
         self.__create_menu__()
         self.__create_tabbed__()
 
+        # alarm annunciator for every page of the module
+        self.__annunciator = AnnunciatorDock(module=TAB_NAMES.get(self.__module), pages=self.__pages,
+                                             locate=self.__locate__, parent=self)
+        self.addDockWidget(Qt.DockWidgetArea.BottomDockWidgetArea, self.__annunciator)
+        self.__viewmenu = self.__menubar.addMenu('View')
+        self.__viewmenu.addAction(self.__annunciator.toggleViewAction())
+
         self.__timer.timeout.connect(self.alarm)
+        self.__stale_timer.timeout.connect(self.sweep)
 
         # show frame
         self.setMenuBar(self.__menubar)
         self.__menubar.setNativeMenuBar(False)
+        self.statusBar().addWidget(self.__connected_icon)
+        self.statusBar().addWidget(self.__connected_label)
+        self.statusBar().addPermanentWidget(self.__profile_label)
         self.setCentralWidget(self.__tabs)
         self.setGeometry(300, 300, 1000, 500)
         self.setWindowTitle(f"{NAME}")
@@ -696,64 +793,18 @@ class MapsControlGui(QMainWindow):
     # +
     # method: connect_to_indi()
     # -
-    # noinspection PyBroadException
     def connect_to_indi(self):
-
-        # clear widget(s)
-        for _k, _v in TAB_DATA[self.__module].items():
-            _widget = _v['widget']
-            _value = _v['widget'].text() if hasattr(_widget, 'text') else None
-            if hasattr(_v['widget'], 'setText'):
-                _v['widget'].setText("")
-
-        # connect to indi
-        try:
-            if self.__pi is None:
-                # noinspection PyUnresolvedReferences
-                self.__pi = PyINDI2(verbose=False)
-        except Exception as _e0:
-            if self.__log:
-                self.__log.error(f"failed to connect to indi, error='{_e0}'")
-            self.__update_label__(False, f"failed to connect to indi, error='{_e0}'")
-            self.__pi = None
-        else:
-            if self.__log:
-                self.__log.info(f"connected to indi OK")
-
-            # subscribe to streams
-            self.__update_label__(True, f"connected to indi OK")
-            _dev, _nam = None, None
-            try:
-                for _idx, _elem in enumerate(self.__indi_streams):
-                    _dev, _nam = _elem.split('.')
-                    if self.__log:
-                        self.__log.debug(f"subscribing to streams, device='{_dev}', name='{_nam}'")
-                    self.__pi.sub(device=_dev, name=_nam)
-            except Exception as _e1:
-                if self.__log:
-                    self.__log.error(f"failed subscribing to streams, device='{_dev}', name='{_nam}', error='{_e1}'")
-                self.__update_label__(False, f"failed to subscribe to streams, error='{_e1}'")
-            else:
-                if self.__log:
-                    self.__log.debug(f"subscribed to {self.__pi.subs} OK")
-                self.__update_label__(True, "subscribed to streams OK")
-                self.__timer.start(self.__delay)
+        self.__pipeline.connect()
+        self.__update_label__(True, f"connecting to indi", stale=True)
+        self.__timer.start(self.__delay)
 
     # +
     # method: disconnect_from_indi()
     # -
     def disconnect_from_indi(self):
-        try:
-            for _idx, _elem in enumerate(self.__indi_streams):
-                _dev, _nam = _elem.split('.')
-                if self.__log:
-                    self.__log.error(f"unsubscribing from device='{_dev}', name='{_nam}'")
-                self.__pi.unsub(device=_dev, name=_nam)
-        except Exception as _:
-            self.__update_label__(False, f"Failed to disconnect from indi streams, error='{_}'")
-        else:
-            self.__update_label__(False, "Disconnected from INDI")
-            self.__timer.stop()
+        self.__pipeline.disconnect()
+        self.__update_label__(False, "Disconnected from INDI")
+        self.__timer.stop()
 
     # +
     # method: set_simulate()
@@ -766,6 +817,26 @@ class MapsControlGui(QMainWindow):
             self.__menubar.setStyleSheet(f"background-color: '{PALEGREEN}'E2FDDB; color: '{BLUE}'; border: solid 2px;")
             self.__simulate = False
 
+    # +
+    # method: set_profile()
+    # -
+    def set_profile(self, state):
+        self.__pipeline.set_profile(state)
+        if not state:
+            self.__profile_label.clear()
+
+    # +
+    # method: dump_profile()
+    # -
+    def dump_profile(self):
+        self.__pipeline.dump_profile()
+
+    # +
+    # method: dump_latency()
+    # -
+    def dump_latency(self):
+        self.__pipeline.dump_latency()
+
     # +
     # method: show_about()
     # -
@@ -788,123 +859,37 @@ class MapsControlGui(QMainWindow):
         reply = QMessageBox.question(self, "Quit Confirmation", "Are you sure you want to quit?", 
                                      QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, QMessageBox.StandardButton.No)
         if reply == QMessageBox.StandardButton.Yes:
+            self.shutdown()
             event.accept()
         else:
             event.ignore()
 
+    # +
+    # method: shutdown()
+    # -
+    def shutdown(self):
+        self.__timer.stop()
+        self.__stale_timer.stop()
+        if self.__pipeline is not None:
+            self.__pipeline.stop()
+
     # +
     # method:alarm()
     # -
     def alarm(self):
-        self.__step += 1
-        _actval, _widget, _type, _value = None, None, None, None
-        if self.__simulate:
-            TAB_DATA[self.__module] = update_dictionary(_dict=TAB_DATA[self.__module])
-            for _k, _v in TAB_DATA[self.__module].items():
-                _actval = _v['actval']
-                _type = _v['datatype'].strip().lower()
-                _widget = self.__vals[_k] if _k in self.__vals else None
-                _value = _widget.text() if hasattr(_widget, 'text') else None
-                if hasattr(_widget, 'setText'):
-                    if 'float' in _type and float(_value) != float(_actval):
-                        _widget.setText(f"{float(_actval)}")
-                    elif 'int' in _type and int(_value) != int(_actval):
-                        _widget.setText(f"{int(_actval)}")
-                    elif 'bool' in _type:
-                        _widget.setText(f"{bool(_actval)}")
-                    elif 'binary' in _type:
-                        _widget.setText(f"{_actval('utf-8')}")
-                    else:
-                        _widget.setText(f"{_actval}")
-                    _min, _max = _v['datarange'] if len(_v['datarange']) == 2 else (-math.nan, math.nan)
-
-                    # change label if running hot, cold, or normal
-                    if isinstance(_v['datarange'], tuple) and len(_v['datarange']) == 2:
-                        _min, _max = _v['datarange']
-                        # cold
-                        if float(_actval) < _min: 
-                            if self.__log:
-                                self.__log.warning(f"{_k} value too cold! {_actval} < {_min}")
-                            _widget.setStyleSheet(f"background-color: '{BLUE}'; color: '{YELLOW}';")
-                        # hot
-                        elif float(_actval) > _max: 
-                            if self.__log:
-                                self.__log.warning(f"{_k} value too hot! {_actval} > {_max}")
-                            _widget.setStyleSheet(f"background-color: '{RED}'; color: '{YELLOW}';")
-                        # normal
-                        else:
-                            _widget.setStyleSheet(f"background-color: '{self.__bg}'; color: '{self.__fg}';")
-                    elif isinstance(_v['datarange'], list):
-                        # invalid
-                        if _actval not in _v['datarange']:
-                            _widget.setStyleSheet(f"background-color: '{YELLOW}'; color: '{BLUE}';")
-                        # normal
-                        else:
-                            _widget.setStyleSheet(f"background-color: '{self.__bg}'; color: '{self.__fg}';")
+        self.__check_connection__()
+        self.__pipeline.tick(simulate=self.__simulate)
 
-        else:
-            try:
-                _ret = self.__pi.Q.get(block=True, timeout=DEFAULT_TIMEOUT)
-            except queue.Empty:
-                pass
-            except Exception as _:
-                if self.__log:
-                    self.__log.error(f"{_}")
-                    if not self.__connected:
-                        self.__log.error(f"You are not connected to the IndiServer!")
-            else:
-                if self.__log:
-                    self.__log.debug(f"_ret={_ret}, type={type(_ret)}")
-                self.__log.debug(f"TAB_DATA[self.__module]={TAB_DATA[self.__module]}")
-                for _k, _v in _ret.items():
-                    if self.__log:
-                        self.__log.debug(f"_k='{_k}', _v={_v}")
-                    _actval = _v
-                    if _k in TAB_DATA[self.__module]:
-                        _type = TAB_DATA[_k]['datatype']
-                        _widget = self.__vals[_k]
-                        if hasattr(_widget, 'setText'):
-                            if 'float' in _type:
-                                TAB_DATA[self.__module][_k]['actval'] = float(_v)
-                                _widget.setText(f"{float(_v)}")
-                            elif 'int' in _type:
-                                TAB_DATA[self.__module][_k]['actval'] = int(_v)
-                                _widget.setText(f"{int(_v)}")
-                            elif 'bool' in _type:
-                                TAB_DATA[self.__module][_k]['actval'] = bool(_v)
-                                _widget.setText(f"{bool(_v)}")
-                            elif 'binary' in _type:
-                                TAB_DATA[self.__module][_k]['actval'] = f"{_v.encode('utf-8')}"
-                                _widget.setText(f"{_v.encode('utf-8')}")
-                            else:
-                                TAB_DATA[self.__module][_k]['actval'] = f"{_v}"
-                                _widget.setText(f"{_v}")
-
-                        # change label if running hot, cold, or normal
-                        # _actval, _widget = None, None
-                        if isinstance(TAB_DATA[self.__module][_k]['datarange'], tuple) and len(TAB_DATA[self.__module][_k]['datarange']) == 2:
-                            _min, _max = TAB_DATA[self.__module][_k]['datarange']
-                            # cold
-                            # noinspection PyTypeChecker
-                            if float(_actval) < _min:
-                                if self.__log:
-                                    self.__log.warning(f"{_k} value too cold! {_actval} < {_min}")
-                                _widget.setStyleSheet(f"background-color: '{BLUE}'; color: '{YELLOW}';")
-                            # hot
-                            elif float(_actval) > _max:
-                                if self.__log:
-                                    self.__log.warning(f"{_k} value too hot! {_actval} > {_max}")
-                                _widget.setStyleSheet(f"background-color: '{RED}'; color: '{YELLOW}';")
-                            # normal
-                            else:
-                                _widget.setStyleSheet(f"background-color: '{self.__bg}'; color: '{self.__fg}';")
-                        elif isinstance(TAB_DATA[self.__module][_k]['datarange'], list):
-                            # invalid
-                            if _actval not in TAB_DATA[self.__module][_k]['datarange']:
-                                _widget.setStyleSheet(f"background-color: '{YELLOW}'; color: '{BLUE}';")
-                            # normal
-                            else:
-                                _widget.setStyleSheet(f"background-color: '{self.__bg}'; color: '{self.__fg}';")
+    # +
+    # method: sweep()
+    # -
+    def sweep(self) -> None:
+        """restyles only the streams whose stale state changed since the last sweep and ends expired shelve(s)"""
+        self.__pipeline.sweep()
+        if self.__annunciator is not None:
+            self.__annunciator.sweep()
+        if self.__pipeline.profiler.enabled:
+            self.__profile_label.setText(self.__pipeline.profiler.report())
 
     # +
     # function: split_list()
@@ -933,9 +918,11 @@ class MapsControlGui(QMainWindow):
 def execute(_host: str = DEFAULT_HOST, _port: int = DEFAULT_PORT,
             _items: int = DEFAULT_ITEMS, _delay: int = DEFAULT_DELAY,
             _fg: str = DEFAULT_FG, _bg: str = DEFAULT_BG,
-            _module: str = DEFAULT_MODULE, _log: logging.Logger = None) -> None:
+            _module: str = DEFAULT_MODULE, _log: logging.Logger = None, _routes: dict = None,
+            _options: PipelineOptions = None) -> None:
     app = QApplication([])
-    _ = MapsControlGui(host=_host, port=_port, items=_items, delay=_delay, fg=_fg, bg=_bg, module=_module, log=_log)
+    _ = MapsControlGui(host=_host, port=_port, items=_items, delay=_delay, fg=_fg, bg=_bg, module=_module, log=_log,
+                       routes=_routes, options=_options)
     if _.indi_nelms != 0:
         _.show()
         sys.exit(app.exec())
@@ -955,13 +942,27 @@ if __name__ == '__main__':
     _p.add_argument('--items', default=DEFAULT_ITEMS, help=f"""Items / Tab [%(default)s]""")
     _p.add_argument('--fg', default=DEFAULT_FG, help=f"""Foreground color [%(default)s]""")
     _p.add_argument('--bg', default=DEFAULT_BG, help=f"""Background color [%(default)s]""")
+    _p.add_argument('--routes', default='', help=f"""Device routes [%(default)s], e.g. Time=host1:7624,tcs=host2:7625""")
+    _p.add_argument('--synthetic', default=0, help=f"""Use a synthetic module of this many stream(s), 0 disables [%(default)s]""")
+    _p.add_argument('--offline', default=False, action='store_true', help=f"""Pin astropy to local IERS table(s) and prewarm them [%(default)s]""")
+    add_pipeline_arguments(_p)
     _a = _p.parse_args()
 
     # noinspection PyBroadException
     try:
+        random.seed(int(_a.seed))
+        _log = get_logger(name='maps_control_gui', level='DEBUG', structured=bool(_a.log_json))
+        if bool(_a.offline):
+            astropy_offline(prewarm=True, log=_log)
+        _module = _a.module.strip()
+        if int(_a.synthetic) > 0:
+            from maps_synthetic import register_synthetic
+            _module = register_synthetic(nelms=int(_a.synthetic))
         execute(_host=_a.host.strip(), _port=int(_a.port),
                 _items=int(_a.items), _delay=int(_a.delay),
-                _fg=_a.fg.strip(), _bg=_a.bg.strip(), _module=_a.module.strip(),
-                _log=UtilLogger(name='maps_control_gui', level='DEBUG').logger)
+                _fg=_a.fg.strip(), _bg=_a.bg.strip(), _module=_module,
+                _log=_log,
+                _routes=parse_routes(_a.routes, host=_a.host.strip(), port=int(_a.port)),
+                _options=pipeline_options(_a))
     except Exception as _:
         print(f"{_}\nUse: {__doc__}")
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+
+
+# +
+# import(s)
+# -
+from maps_ingest import DEFAULT_INGEST_SIZE
+from maps_ingest import INGEST_POLICIES
+from maps_ingest import IngestQueue
+from maps_registry import CompiledRegistry
+from maps_registry import NO_INDICES
+
+import logging
+import math
+import threading
+import time
+
+import numpy as np
+
+
+# +
+# constant(s)
+# -
+BACKPRESSURE_SECONDS = 1.0
+BURST_FACTOR = 10.0
+BURST_PERIOD = 1.0
+FIREHOSE_BATCH = 8
+FIREHOSE_DISTRIBUTIONS = ['uniform', 'hotset', 'bursty']
+FIREHOSE_REPORT = 5.0
+FIREHOSE_TICK = 0.01
+HOT_FRACTION = 0.1
+HOT_SHARE = 0.9
+RAMP_PERIOD = 5.0
+RAMP_START = 1000.0
+
+
+# +
+# class: Firehose()
+# use: fh = Firehose(registry=reg, rate=50000.0, distribution='hotset', log=log)
+#      fh.start()
+#      _batch = fh.drain()
+#      print(fh.report())
+#      fh.stop()
+# -
+class Firehose(object):
+    """injects synthetic updates at an aggregate rate into an ingest queue, standing in for a connection pool"""
+
+    # +
+    # (hidden) method: __init__()
+    # -
+    def __init__(self, registry: CompiledRegistry = None, rate: float = RAMP_START,
+                 distribution: str = FIREHOSE_DISTRIBUTIONS[0], batch: int = FIREHOSE_BATCH,
+                 ramp: bool = False, seed: int = 0, log: logging.Logger = None,
+                 maxsize: int = DEFAULT_INGEST_SIZE, policy: str = INGEST_POLICIES[0]) -> None:
+
+        # get argument(s)
+        self.__registry = registry if registry is not None else CompiledRegistry()
+        self.__rate = rate if rate > 0.0 else RAMP_START
+        self.__distribution = distribution if distribution in FIREHOSE_DISTRIBUTIONS else FIREHOSE_DISTRIBUTIONS[0]
+        self.__batch = batch if batch > 0 else FIREHOSE_BATCH
+        self.__ramp = ramp
+        self.__log = log
+
+        # key selection
+        self.__rng = np.random.default_rng(seed)
+        self.__nhot = max(int(self.__registry.nelms * HOT_FRACTION), 1)
+        self.__hot = self.__rng.permutation(self.__registry.nelms)[:self.__nhot]
+
+        # counter(s), all in update(s)
+        self.__produced = 0
+        self.__knee = math.nan
+        self.__offered = 0.0
+        self.__window = (time.perf_counter(), 0, 0)
+        self.__rates = (0.0, 0.0)
+        self.__dropped = 0
+
+        # the ingest queue and producer thread
+        self.__feed = IngestQueue(maxsize=maxsize, policy=policy, log=log)
+        self.__generation = 0
+        self.__message = ''
+        self.__stop = threading.Event()
+        self.__thread = None
+
+    # +
+    # variable getter(s)
+    # -
+    @property
+    def connected(self) -> bool:
+        return self.running
+
+    @property
+    def connections(self) -> dict:
+        return {}
+
+    @property
+    def consumed(self) -> int:
+        return self.__feed.delivered
+
+    @property
+    def depth(self) -> int:
+        return self.__feed.qsize()
+
+    @property
+    def feed(self) -> IngestQueue:
+        return self.__feed
+
+    @property
+    def generation(self) -> int:
+        return int(self.__generation)
+
+    @property
+    def knee(self) -> float:
+        """the offered rate at which backpressure first kicked in, NaN if it has not"""
+        return float(self.__knee)
+
+    @property
+    def message(self) -> str:
+        return f"{self.__message}"
+
+    @property
+    def produced(self) -> int:
+        return int(self.__produced)
+
+    @property
+    def running(self) -> bool:
+        return self.__thread is not None and self.__thread.is_alive()
+
+    @property
+    def stale(self) -> bool:
+        return False
+
+    @property
+    def stale_devices(self) -> set:
+        return set()
+
+    @property
+    def state(self) -> str:
+        return 'connected' if self.running else 'stopped'
+
+    # +
+    # (hidden) method: __instant__()
+    # -
+    def __instant__(self, elapsed: float = 0.0) -> float:
+        """sets the offered (average) rate, ramping if asked, and returns the instantaneous rate"""
+        self.__offered = min(RAMP_START * 2.0 ** int(elapsed / RAMP_PERIOD), self.__rate) if self.__ramp else self.__rate
+        if self.__distribution == 'bursty':
+            _burst = (elapsed % BURST_PERIOD) < (BURST_PERIOD / BURST_FACTOR)
+            return self.__offered * BURST_FACTOR if _burst else 0.0
+        return self.__offered
+
+    # +
+    # (hidden) method: __pick__()
+    # -
+    def __pick__(self, n: int = 0) -> np.ndarray:
+        if self.__distribution == 'hotset':
+            _hot = self.__rng.random(n) < HOT_SHARE
+            return np.where(_hot, self.__hot[self.__rng.integers(0, self.__nhot, n)],
+                            self.__rng.integers(0, self.__registry.nelms, n))
+        return self.__rng.integers(0, self.__registry.nelms, n)
+
+    # +
+    # (hidden) method: __values__()
+    # -
+    def __values__(self, indices: np.ndarray = NO_INDICES) -> list:
+        _reg = self.__registry
+        _u = self.__rng.random(indices.size)
+        _ranged = _reg.lo[indices] + (_reg.hi[indices] - _reg.lo[indices]) * _u
+        _values = []
+        for _j, _i in enumerate(indices.tolist()):
+            if _reg.ranged[_i]:
+                _values.append(int(_ranged[_j]) if 'int' in _reg.datatypes[_i] else float(_ranged[_j]))
+            elif _i in _reg.choices:
+                _values.append(_reg.choices[_i][int(_u[_j] * len(_reg.choices[_i]))])
+            else:
+                _values.append(f"firehose-{self.__produced + _j}")
+        return _values
+
+    # +
+    # (hidden) method: __report__()
+    # -
+    def __report__(self) -> None:
+        _now, _produced, _consumed = time.perf_counter(), self.__produced, self.__feed.delivered
+        _elapsed = max(_now - self.__window[0], 1.0e-6)
+        self.__rates = ((_produced - self.__window[1]) / _elapsed, (_consumed - self.__window[2]) / _elapsed)
+        self.__window = (_now, _produced, _consumed)
+        _backlog = _produced - _consumed - self.__feed.dropped - self.__feed.coalesced
+        _pressed = _backlog > self.__rates[0] * BACKPRESSURE_SECONDS or self.__feed.dropped > self.__dropped or \
+            self.__feed.blocked > 0
+        self.__dropped = self.__feed.dropped
+        if _pressed and self.__rates[0] > 0.0 and math.isnan(self.__knee):
+            self.__knee = self.__offered
+            if self.__log:
+                self.__log.warning(f"firehose backpressure at {self.__offered:.0f} updates/s offered, "
+                                   f"gui sustained {self.__rates[1]:.0f} updates/s")
+        self.__message = self.report()
+        self.__generation += 1
+        if self.__log:
+            self.__log.info(self.__message)
+
+    # +
+    # (hidden) method: __run__()
+    # -
+    def __run__(self) -> None:
+        _keys = self.__registry.keys
+        _start = _next = _last = time.perf_counter()
+        _carry = 0.0
+        while not self.__stop.is_set():
+            _carry += self.__instant__(_next - _start) * FIREHOSE_TICK
+            _n, _carry = int(_carry), _carry - int(_carry)
+            if _n > 0:
+                _idx = self.__pick__(_n)
+                _values = self.__values__(_idx)
+                _now = time.time()
+                _idx = _idx.tolist()
+                for _j in range(0, _n, self.__batch):
+                    _msg = {_keys[_i]: _v for _i, _v in zip(_idx[_j:_j + self.__batch], _values[_j:_j + self.__batch])}
+                    while not self.__feed.put((_now, math.nan, _msg), timeout=FIREHOSE_TICK):
+                        if self.__stop.is_set():
+                            break
+                    self.__produced += len(_msg)
+
+            # keep to schedule, or note that the source itself cannot keep up
+            _next += FIREHOSE_TICK
+            _wait = _next - time.perf_counter()
+            if _wait > 0.0:
+                self.__stop.wait(_wait)
+            elif _wait < -1.0:
+                _next = time.perf_counter()
+            if time.perf_counter() - _last >= FIREHOSE_REPORT:
+                _last = time.perf_counter()
+                self.__report__()
+
+    # +
+    # method: start()
+    # -
+    def start(self) -> None:
+        if self.running or self.__registry.nelms == 0:
+            return
+        self.__stop.clear()
+        self.__window = (time.perf_counter(), self.__produced, self.__feed.delivered)
+        self.__thread = threading.Thread(target=self.__run__, name='Firehose', daemon=True)
+        self.__thread.start()
+        self.__message = f"firehose at {self.__rate:.0f} updates/s ({self.__distribution}{', ramp' if self.__ramp else ''})"
+        self.__generation += 1
+
+    # +
+    # method: stop()
+    # -
+    def stop(self) -> None:
+        self.__stop.set()
+        if self.__thread is not None:
+            self.__thread.join(timeout=1.0)
+        self.__thread = None
+        self.__message = f"firehose stopped, {self.report()}"
+        self.__generation += 1
+
+    # +
+    # method: drain()
+    # -
+    def drain(self, limit: int = 0, stamps: dict = None) -> dict:
+        return self.__feed.drain(limit=limit, stamps=stamps)
+
+    # +
+    # method: set_indi()
+    # -
+    def set_indi(self, title: str = '', value=None, timeout: float = 0.0) -> None:
+        if self.__log:
+            self.__log.info(f"firehose ignores set_indi('{title}', {value})")
+
+    # +
+    # method: report()
+    # -
+    def report(self) -> str:
+        _knee = f", backpressure at {self.__knee:.0f}/s" if not math.isnan(self.__knee) else ''
+        _limited = ' (source limited)' if 0.0 < self.__rates[0] < 0.9 * self.__offered else ''
+        return f"firehose: offered {self.__offered:.0f}/s, produced {self.__rates[0]:.0f}/s{_limited}, " \
+               f"gui sustained {self.__rates[1]:.0f}/s, {self.__feed.report()}{_knee}"
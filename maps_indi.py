@@ -8,6 +8,7 @@ from datetime import datetime
 from datetime import timedelta
 from datetime import timezone
 from typing import Any
+from typing import Callable
 
 import hashlib
 import math
@@ -18,7 +19,7 @@ import random
 # +
 # initialize
 # -
-random.seed(os.getpid())
+random.seed(int(os.getenv('MAPS_SEED', os.getpid())))
 
 
 # +
@@ -28,6 +29,7 @@ BLUE = "#0000FF"
 DEGREE = u"\u00b0"
 FILETYPES = (".acf", ".asf", ".ats", ".dat", ".ff", ".ffb", ".mg", ".ms", ".log", ".ncp", ".pid", ".rec", ".slm")
 HEADERS = ("actval", "datarange", "datatype", "label", "permission", "simval", "tooltip", "unit", "widget")
+OPTIONAL_HEADERS = ("deadband", "hysteresis", "rate")
 GREEN = "#00FF00"
 MICRON = u"\u03bc"
 MMT_ELEVATION_FEET = 8585.0
@@ -84,6 +86,7 @@ def flatten_dictionary(_dict: Any = None, _sep: str = ".", _pre: str = "") -> di
 # -
 # noinspection PyBroadException
 def update_dictionary(_dict: dict = None) -> dict:
+    SIM_CLOCK.tick()
     for _k in _dict.keys():
 
         # callable so value can be generated on-the-fly
@@ -120,13 +123,13 @@ def update_dictionary(_dict: dict = None) -> dict:
                 else: 
                     _dict[_k]['actval'] = f"{_value}"
 
-            # get_hash which requires 0 argument(s)
+            # get_hash or sim_clock which require 0 argument(s)
             elif isinstance(_dict[_k]['datarange'], str):
                 _choice = _dict[_k]['datarange']
                 if _choice in FILETYPES:
                     _dict[_k]['actval'] = f"{_dict[_k]['simval']()[:10]}{_choice}"
                 else:
-                    _dict[_k]['actval'] = f"{_dict[_k]['simval']}"
+                    _dict[_k]['actval'] = f"{_dict[_k]['simval']()}"
 
         # not callable so just copy the value as a string
         elif isinstance(_dict[_k]['simval'], str):
@@ -146,6 +149,65 @@ def get_hash() -> str:
         return f""
 
 
+# +
+# class: SimClock()
+# use: SIM_CLOCK.tick()
+#      _utc = SIM_CLOCK.provider(part='time')()
+# -
+class SimClock(object):
+    """one 'now' per simulation tick, read lazily and shared by every time-based simval"""
+
+    # +
+    # (hidden) method: __init__()
+    # -
+    def __init__(self) -> None:
+        self.__now = None
+        self.__texts = {}
+        self.__providers = {}
+
+    # +
+    # method: tick()
+    # -
+    def tick(self, now: datetime = None) -> None:
+        """starts a new tick, at the given (utc) time or the wall clock when it is first read"""
+        self.__now = now
+        self.__texts = {}
+
+    # +
+    # method: now()
+    # -
+    def now(self) -> datetime:
+        if self.__now is None:
+            self.__now = datetime.now(timezone.utc)
+        return self.__now
+
+    # +
+    # method: provider()
+    # -
+    def provider(self, offset: float = 0.0, part: str = '', local: bool = False) -> Callable[[], str]:
+        """returns a (shared) callable giving now + offset days as isoformat, or its 'date' or 'time' part"""
+        _key = (float(offset), part, local)
+        if _key not in self.__providers:
+            def _provider() -> str:
+                if _key not in self.__texts:
+                    _now = self.now() + timedelta(_key[0])
+                    _text = (_now.astimezone().replace(tzinfo=None) if local else _now).isoformat()
+                    self.__texts[_key] = _text.split('T')[0 if part == 'date' else 1] if part else _text
+                return self.__texts[_key]
+            self.__providers[_key] = _provider
+        return self.__providers[_key]
+
+
+# +
+# function: sim_clock()
+# -
+SIM_CLOCK = SimClock()
+
+
+def sim_clock(offset: float = 0.0, part: str = '', local: bool = False) -> Callable[[], str]:
+    return SIM_CLOCK.provider(offset=offset, part=part, local=local)
+
+
 # +
 # structure(s)
 # -
@@ -4331,7 +4393,7 @@ TIME = {
     "datatype": "str", 
     "label": f"Astronomical Dawn: time when rising Sun reaches -18.0{DEGREE}", 
     "permission": "ro",
-    "simval": (datetime.now(timezone.utc)-timedelta(0.5)).isoformat(),
+    "simval": sim_clock(offset=-0.5),
     "tooltip": "Time.Events.Dawn",
     "unit": "UTC",
     "widget": None, 
@@ -4342,7 +4404,7 @@ TIME = {
     "datatype": "str", 
     "label": f"Astronomical Dusk: time when setting Sun reaches -18.0{DEGREE}", 
     "permission": "ro",
-    "simval": (datetime.now(timezone.utc)+timedelta(0.5)).isoformat(),
+    "simval": sim_clock(offset=0.5),
     "tooltip": "Time.Events.Dusk",
     "unit": "UTC",
     "widget": None, 
@@ -4353,7 +4415,7 @@ TIME = {
     "datatype": "str", 
     "label": f"Moonrise: time when rising Moon reaches 0{DEGREE}", 
     "permission": "ro",
-    "simval": (datetime.now(timezone.utc)-timedelta(0.25)).isoformat(),
+    "simval": sim_clock(offset=-0.25),
     "tooltip": "Time.Events.Moonrise",
     "unit": "UTC",
     "widget": None, 
@@ -4364,7 +4426,7 @@ TIME = {
     "datatype": "str", 
     "label": f"Moonset: time when setting Moon reaches 0{DEGREE}", 
     "permission": "ro",
-    "simval": (datetime.now(timezone.utc)+timedelta(0.25)).isoformat(),
+    "simval": sim_clock(offset=0.25),
     "tooltip": "Time.Events.Moonset",
     "unit": "UTC",
     "widget": None, 
@@ -4375,7 +4437,7 @@ TIME = {
     "datatype": "str", 
     "label": f"Sunrise: time when rising Sun reaches 0{DEGREE}", 
     "permission": "ro",
-    "simval": (datetime.now(timezone.utc)-timedelta(0.45)).isoformat(),
+    "simval": sim_clock(offset=-0.45),
     "tooltip": "Time.Events.Sunrise",
     "unit": "UTC",
     "widget": None, 
@@ -4386,7 +4448,7 @@ TIME = {
     "datatype": "str", 
     "label": f"Sunset: time when rising Sun reaches 0{DEGREE}", 
     "permission": "ro",
-    "simval": (datetime.now(timezone.utc)+timedelta(0.45)).isoformat(),
+    "simval": sim_clock(offset=0.45),
     "tooltip": "Time.Events.Sunset",
     "unit": "UTC",
     "widget": None, 
@@ -4441,6 +4503,7 @@ TIME = {
     "datatype": "float", 
     "label": "Julian Date", 
     "permission": "ro",
+    "rate": 1.0,
     "simval": random.uniform,
     "tooltip": "time.Now.JD",
     "unit": f"days",
@@ -4452,7 +4515,8 @@ TIME = {
     "datatype": "str", 
     "label": "Local Sideral Time", 
     "permission": "ro",
-    "simval": datetime.now(timezone.utc).isoformat().split('T')[1],
+    "rate": 1.0,
+    "simval": sim_clock(part='time'),
     "tooltip": "Time.Now.LST",
     "unit": "hh:mm:ss.ss",
     "widget": None, 
@@ -4463,7 +4527,8 @@ TIME = {
     "datatype": "str", 
     "label": "Local Time", 
     "permission": "ro",
-    "simval": datetime.now().isoformat(),
+    "rate": 1.0,
+    "simval": sim_clock(local=True),
     "tooltip": "Time.Now.LT",
     "unit": f"MST",
     "widget": None, 
@@ -4474,6 +4539,7 @@ TIME = {
     "datatype": "float", 
     "label": "Lunar Altitude", 
     "permission": "ro",
+    "rate": 1.0,
     "simval": random.uniform,
     "tooltip": "Time.Now.MoonAlt",
     "unit": f"{DEGREE}",
@@ -4485,6 +4551,7 @@ TIME = {
     "datatype": "float", 
     "label": "Lunar Azimuth", 
     "permission": "ro",
+    "rate": 1.0,
     "simval": random.uniform,
     "tooltip": "Time.Now.MoonAz",
     "unit": f"{DEGREE}EoN",
@@ -4496,6 +4563,7 @@ TIME = {
     "datatype": "float", 
     "label": "Lunar Elongation", 
     "permission": "ro",
+    "rate": 1.0,
     "simval": random.uniform,
     "tooltip": "Time.Now.MoonElong",
     "unit": f"{DEGREE}EofSun",
@@ -4507,6 +4575,7 @@ TIME = {
     "datatype": "float", 
     "label": "Moon Illumination", 
     "permission": "ro",
+    "rate": 1.0,
     "simval": random.uniform,
     "tooltip": "Time.Now.MoonLit",
     "unit": "%",
@@ -4518,6 +4587,7 @@ TIME = {
     "datatype": "float", 
     "label": "Solar Altitude", 
     "permission": "ro",
+    "rate": 1.0,
     "simval": random.uniform,
     "tooltip": "Time.Now.SunAlt",
     "unit": f"{DEGREE}",
@@ -4529,6 +4599,7 @@ TIME = {
     "datatype": "float", 
     "label": "Solar Azimuth", 
     "permission": "ro",
+    "rate": 1.0,
     "simval": random.uniform,
     "tooltip": "Time.Now.SunAz",
     "unit": f"{DEGREE}EoN",
@@ -4540,6 +4611,7 @@ TIME = {
     "datatype": "float", 
     "label": "Unix Time: Seconds Since 1970-01-01 UTC",
     "permission": "ro",
+    "rate": 1.0,
     "simval": random.uniform,
     "tooltip": "Time.Now.UNIX",
     "unit": "s",
@@ -4551,7 +4623,8 @@ TIME = {
     "datatype": "str", 
     "label": "Universal Coordinated Time",
     "permission": "ro",
-    "simval": datetime.now(timezone.utc).isoformat(),
+    "rate": 1.0,
+    "simval": sim_clock(),
     "tooltip": "Time.Now.UTCDate",
     "unit": "UTC",
     "widget": None, 
@@ -4631,7 +4704,7 @@ TCS = {
     "datatype": "str",
     "label": "Right Ascension",
     "permission": "ro",
-    "simval": datetime.now(timezone.utc).isoformat().split('T')[1],
+    "simval": sim_clock(part='time'),
     "tooltip": "Right Ascension",
     "unit": "hh:mm:ss.ss",
     "widget": None,
@@ -4642,7 +4715,7 @@ TCS = {
     "datatype": "str",
     "label": "Declination",
     "permission": "ro",
-    "simval": datetime.now(timezone.utc).isoformat().split('T')[1],
+    "simval": sim_clock(part='time'),
     "tooltip": "Declination",
     "unit": "dd:mm:ss.ss",
     "widget": None,
@@ -4675,7 +4748,7 @@ TCS = {
     "datatype": "str",
     "label": "Local Sidereal Time",
     "permission": "ro",
-    "simval": datetime.now(timezone.utc).isoformat().split('T')[1],
+    "simval": sim_clock(part='time'),
     "tooltip": "Local Sidereal Time",
     "unit": "hh:mm:ss.ss",
     "widget": None,
@@ -4686,7 +4759,7 @@ TCS = {
     "datatype": "str",
     "label": "UTC Time",
     "permission": "ro",
-    "simval": datetime.now(timezone.utc).isoformat().split('T')[1],
+    "simval": sim_clock(part='time'),
     "tooltip": "UTC Time",
     "unit": "hh:mm:ss.ss",
     "widget": None,
@@ -4697,7 +4770,7 @@ TCS = {
     "datatype": "str",
     "label": "UTC",
     "permission": "ro",
-    "simval": datetime.now(timezone.utc).isoformat().split('T')[0],
+    "simval": sim_clock(part='date'),
     "tooltip": "UTC",
     "unit": "YYYY-MM-DD",
     "widget": None,
@@ -4772,22 +4845,9 @@ TCS = {
 
 
 # +
-# sanity check
+# all stream(s)
 # -
 ALL_STREAMS = {**{}, **AO_DM_ACTUATOR, **AO_DM_ADMIN, **AO_DM_HOUSEKEEPER, **AO_OPERATE, **AO_LOGGER, **CHAI2, **CYBER_POWER, **TIME, **TCS}
-ALL_STREAMS_FLAT = flatten_dictionary(_dict=ALL_STREAMS, _sep=".", _pre="")
-
-expected_number_of_headers = len(HEADERS)
-_nk = len(ALL_STREAMS.keys())
-_nv = int(round(len(list(ALL_STREAMS_FLAT))/float(expected_number_of_headers)))
-nelms = []
-for _elem in HEADERS:
-    nelms.append(len([ALL_STREAMS_FLAT[_k] for _k in ALL_STREAMS_FLAT.keys() if _elem in _k]))
-
-if all(_n == _nv for _n in nelms) and all(len(ALL_STREAMS[_]) == expected_number_of_headers for _ in ALL_STREAMS):
-    color_print(msg=f"OK: Data is valid ({_nk} items)", color="green")
-else:
-    color_print(msg="ERROR: Data is invalid!", color="red")
 
 
 # +
@@ -4884,3 +4944,25 @@ TAB_DATA = {
     "Amali": AMALI_GUI,
     "New": NEW_GUI,
 }
+
+
+# +
+# sanity check: python3 maps_indi.py (not run on import)
+# -
+if __name__ == '__main__':
+    ALL_STREAMS_FLAT = flatten_dictionary(_dict=ALL_STREAMS, _sep=".", _pre="")
+
+    expected_number_of_headers = len(HEADERS)
+    _nk = len(ALL_STREAMS.keys())
+    _nv = _nk
+    nelms = []
+    for _elem in HEADERS:
+        nelms.append(len([ALL_STREAMS_FLAT[_k] for _k in ALL_STREAMS_FLAT.keys() if _k.endswith(f".{_elem}")]))
+
+    # every entry must have all the headers and may have some optional ones
+    if all(_n == _nv for _n in nelms) and \
+            all(set(ALL_STREAMS[_]).issubset(HEADERS + OPTIONAL_HEADERS) for _ in ALL_STREAMS) and \
+            all(len(ALL_STREAMS[_]) >= expected_number_of_headers for _ in ALL_STREAMS):
+        color_print(msg=f"OK: Data is valid ({_nk} items)", color="green")
+    else:
+        color_print(msg="ERROR: Data is invalid!", color="red")
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+
+
+# +
+# import(s)
+# -
+import collections
+import logging
+import queue
+import threading
+import time
+
+
+# +
+# constant(s)
+# -
+DEFAULT_INGEST_SIZE = 10000
+INGEST_POLICIES = ['drop-oldest', 'latest-per-key', 'block']
+
+
+# +
+# class: IngestQueue()
+# use: iq = IngestQueue(maxsize=10000, policy='latest-per-key')
+#      iq.put((time.time(), math.nan, {'Time.Now.JD': 2460000.5}))
+#      _batch = iq.drain(stamps=_stamps)
+# -
+class IngestQueue(object):
+    """a bounded queue of (received, wire, {key: value}) messages with an explicit policy for when it is full"""
+
+    # +
+    # (hidden) method: __init__()
+    # -
+    def __init__(self, maxsize: int = DEFAULT_INGEST_SIZE, policy: str = INGEST_POLICIES[0],
+                 log: logging.Logger = None) -> None:
+
+        # get argument(s)
+        self.__maxsize = maxsize if maxsize > 0 else DEFAULT_INGEST_SIZE
+        self.__policy = policy if policy in INGEST_POLICIES else INGEST_POLICIES[0]
+        self.__log = log
+
+        # message(s) or, for latest-per-key, {key: (received, wire, value)} in arrival order
+        self.__messages = collections.deque()
+        self.__latest = {}
+        self.__lock = threading.Lock()
+        self.__not_full = threading.Condition(self.__lock)
+
+        # counter(s), in update(s) except blocked which counts waits
+        self.__blocked = 0
+        self.__coalesced = 0
+        self.__delivered = 0
+        self.__dropped = 0
+        self.__received = 0
+        self.__warned = False
+
+    # +
+    # variable getter(s)
+    # -
+    @property
+    def blocked(self) -> int:
+        return int(self.__blocked)
+
+    @property
+    def coalesced(self) -> int:
+        return int(self.__coalesced)
+
+    @property
+    def delivered(self) -> int:
+        return int(self.__delivered)
+
+    @property
+    def dropped(self) -> int:
+        return int(self.__dropped)
+
+    @property
+    def maxsize(self) -> int:
+        return int(self.__maxsize)
+
+    @property
+    def policy(self) -> str:
+        return f"{self.__policy}"
+
+    @property
+    def received(self) -> int:
+        return int(self.__received)
+
+    # +
+    # (hidden) method: __full__()
+    # -
+    def __full__(self) -> None:
+        if self.__log and not self.__warned:
+            self.__warned = True
+            self.__log.warning(f"ingest queue full ({self.__maxsize}), policy '{self.__policy}' is now in effect")
+
+    # +
+    # method: qsize()
+    # -
+    def qsize(self) -> int:
+        """returns the pending message(s), or key(s) for latest-per-key"""
+        return len(self.__latest) if self.__policy == 'latest-per-key' else len(self.__messages)
+
+    # +
+    # method: put()
+    # -
+    def put(self, item: tuple = None, timeout: float = None) -> bool:
+        """queues one (received, wire, message), returns False if a blocked producer timed out"""
+        _received, _wire, _message = item
+        with self.__lock:
+            self.__received += len(_message)
+
+            # keep only the latest value per key, bounded by the number of key(s)
+            if self.__policy == 'latest-per-key':
+                for _k, _v in _message.items():
+                    if _k in self.__latest:
+                        self.__coalesced += 1
+                        del self.__latest[_k]
+                    elif len(self.__latest) >= self.__maxsize:
+                        self.__full__()
+                        del self.__latest[next(iter(self.__latest))]
+                        self.__dropped += 1
+                    self.__latest[_k] = (_received, _wire, _v)
+                return True
+
+            # make room by dropping the oldest message(s)
+            if self.__policy == 'drop-oldest':
+                while len(self.__messages) >= self.__maxsize:
+                    self.__full__()
+                    self.__dropped += len(self.__messages.popleft()[2])
+
+            # or make the producer wait for the consumer
+            elif len(self.__messages) >= self.__maxsize:
+                self.__full__()
+                self.__blocked += 1
+                _end = None if timeout is None else time.monotonic() + timeout
+                while len(self.__messages) >= self.__maxsize:
+                    _left = None if _end is None else _end - time.monotonic()
+                    if _left is not None and _left <= 0.0:
+                        self.__received -= len(_message)
+                        return False
+                    self.__not_full.wait(_left)
+
+            self.__messages.append(item)
+            return True
+
+    # +
+    # method: get_nowait()
+    # -
+    def get_nowait(self) -> tuple:
+        with self.__lock:
+            if self.__policy == 'latest-per-key':
+                if not self.__latest:
+                    raise queue.Empty
+                _k = next(iter(self.__latest))
+                _received, _wire, _v = self.__latest.pop(_k)
+                _item = (_received, _wire, {_k: _v})
+            else:
+                if not self.__messages:
+                    raise queue.Empty
+                _item = self.__messages.popleft()
+                self.__not_full.notify()
+            self.__delivered += len(_item[2])
+            return _item
+
+    # +
+    # method: drain()
+    # -
+    def drain(self, limit: int = 0, stamps: dict = None) -> dict:
+        """returns pending update(s) merged into one dictionary (latest value wins) without blocking,
+           and fills stamps with the latest {key: (received, wire)} time(s) if given"""
+        _batch = {}
+        with self.__lock:
+            if self.__policy == 'latest-per-key':
+                _n = len(self.__latest) if limit <= 0 else min(limit, len(self.__latest))
+                _keys = list(self.__latest)[:_n]
+                for _k in _keys:
+                    _received, _wire, _batch[_k] = self.__latest.pop(_k)
+                    if stamps is not None:
+                        stamps[_k] = (_received, _wire)
+                self.__delivered += len(_keys)
+                return _batch
+            _n = len(self.__messages) if limit <= 0 else min(limit, len(self.__messages))
+            for _ in range(_n):
+                _received, _wire, _message = self.__messages.popleft()
+                _batch.update(_message)
+                self.__delivered += len(_message)
+                if stamps is not None:
+                    for _k in _message:
+                        stamps[_k] = (_received, _wire)
+            self.__not_full.notify_all()
+        return _batch
+
+    # +
+    # method: report()
+    # -
+    def report(self) -> str:
+        return f"ingest queue ({self.__policy}, {self.qsize()}/{self.__maxsize}): received={self.__received}, " \
+               f"delivered={self.__delivered}, dropped={self.__dropped}, coalesced={self.__coalesced}, " \
+               f"blocked={self.__blocked}"
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+
+
+# +
+# import(s)
+# -
+from datetime import datetime
+from datetime import timezone
+from typing import Any
+
+import math
+
+import numpy as np
+
+
+# +
+# constant(s)
+# -
+DEFAULT_WINDOW = 1000
+LATENCY_KINDS = ['wire', 'queue', 'gui']
+TIMESTAMP_KEYS = ('timestamp', '_timestamp')
+
+
+# +
+# function: as_epoch()
+# -
+# noinspection PyBroadException
+def as_epoch(value: Any = None) -> float:
+    """returns a unix time from a unix time or an (INDI, UTC) ISO8601 string, or NaN"""
+    try:
+        if isinstance(value, (int, float)):
+            return float(value)
+        _dt = datetime.fromisoformat(f"{value}".strip().replace('Z', '+00:00'))
+        return (_dt if _dt.tzinfo is not None else _dt.replace(tzinfo=timezone.utc)).timestamp()
+    except:
+        return math.nan
+
+
+# +
+# function: wire_time()
+# -
+def wire_time(message: dict = None) -> float:
+    """pops the sender timestamp, if any, out of an update message and returns it as a unix time or NaN"""
+    for _k in TIMESTAMP_KEYS:
+        if _k in message:
+            return as_epoch(message.pop(_k))
+    return math.nan
+
+
+# +
+# class: LatencyTracer()
+# use: lt = LatencyTracer()
+#      lt.record(devices=['Time', 'tcs'], received=[t0, t1], wire=[nan, t2], drained=t3, painted=t4)
+#      print(lt.report())
+# -
+class LatencyTracer(object):
+    """keeps rolling per-device windows of wire, queue and gui latency"""
+
+    # +
+    # (hidden) method: __init__()
+    # -
+    def __init__(self, window: int = DEFAULT_WINDOW) -> None:
+
+        # get argument(s)
+        self.__window = window if window > 0 else DEFAULT_WINDOW
+
+        # {(device, kind): [samples, filled, next]} in seconds
+        self.__rings = {}
+        self.__count = 0
+
+    # +
+    # variable getter(s)
+    # -
+    @property
+    def count(self) -> int:
+        return int(self.__count)
+
+    @property
+    def devices(self) -> list:
+        return sorted(set(_d for _d, _ in self.__rings))
+
+    # +
+    # (hidden) method: __append__()
+    # -
+    def __append__(self, key: tuple = ('', ''), values: np.ndarray = None) -> None:
+        if values.size == 0:
+            return
+        _ring = self.__rings.setdefault(key, [np.zeros(self.__window), 0, 0])
+        _values = values[-self.__window:]
+        _at = (_ring[2] + np.arange(_values.size)) % self.__window
+        _ring[0][_at] = _values
+        _ring[1] = min(_ring[1] + _values.size, self.__window)
+        _ring[2] = (_ring[2] + _values.size) % self.__window
+
+    # +
+    # method: record()
+    # -
+    def record(self, devices: Any = None, received: Any = None, wire: Any = None,
+               drained: float = math.nan, painted: float = math.nan) -> None:
+        """records one tick: receipt and sender time(s) per update, and when the batch was drained and painted"""
+        _devices = np.asarray(devices, dtype=object)
+        if _devices.size == 0:
+            return
+        _received = np.asarray(received, dtype=float)
+        _wire = np.asarray(wire, dtype=float)
+        _latency = {'wire': _received - _wire, 'queue': drained - _received, 'gui': painted - _received}
+        for _d in set(_devices.tolist()):
+            _mask = _devices == _d
+            for _kind in LATENCY_KINDS:
+                _values = _latency[_kind][_mask]
+                self.__append__((_d, _kind), _values[~np.isnan(_values)])
+        self.__count += _devices.size
+
+    # +
+    # method: reset()
+    # -
+    def reset(self) -> None:
+        self.__rings.clear()
+        self.__count = 0
+
+    # +
+    # method: summary()
+    # -
+    def summary(self) -> dict:
+        """returns {device: {kind: (p50 ms, p99 ms, samples)}}"""
+        _summary = {}
+        for (_d, _kind), (_samples, _filled, _) in sorted(self.__rings.items()):
+            if _filled > 0:
+                _p50, _p99 = np.percentile(_samples[:_filled], [50.0, 99.0]) * 1000.0
+                _summary.setdefault(_d, {})[_kind] = (float(_p50), float(_p99), int(_filled))
+        return _summary
+
+    # +
+    # method: report()
+    # -
+    def report(self) -> str:
+        """returns one line per device of p50/p99 latency in ms"""
+        _lines = [f"data latency: {self.__count} update(s) traced"]
+        for _d, _kinds in self.summary().items():
+            _lines.append(f"  {_d}: " + ', '.join(f"{_k} {_kinds[_k][0]:.1f}/{_kinds[_k][1]:.1f}"
+                                                   for _k in LATENCY_KINDS if _k in _kinds))
+        return '\n'.join(_lines)
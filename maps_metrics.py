@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+
+
+# +
+# import(s)
+# -
+from pnd import CustomException
+
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from typing import Any
+
+import collections
+import logging
+import os
+import resource
+import socketserver
+import stat
+import threading
+
+
+# +
+# constant(s)
+# -
+METRICS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+METRICS_HOST = '127.0.0.1'
+METRICS_PATH = '/metrics'
+
+
+# +
+# class: Metric()
+# use: Metric('maps_ticks_total', 'counter', 'GUI ticks', [({}, 42)])
+# -
+Metric = collections.namedtuple('Metric', ['name', 'kind', 'help', 'samples'])
+
+
+# +
+# function: rss_bytes()
+# -
+# noinspection PyBroadException
+def rss_bytes() -> int:
+    """returns the resident set size of this process (or its peak where /proc is not available)"""
+    try:
+        with open('/proc/self/statm', 'r') as _fd:
+            return int(_fd.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except:
+        _peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return int(_peak) if os.uname().sysname == 'Darwin' else int(_peak) * 1024
+
+
+# +
+# function: remove_socket()
+# -
+def remove_socket(path: str = '') -> None:
+    """removes the unix socket at path, if any, and raises rather than remove anything that is not a socket"""
+    try:
+        _mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(_mode):
+        raise CustomException(errnum=-1, extra=f"'{path}' exists and is not a socket, not removing it")
+    os.remove(path)
+
+
+# +
+# function: _escape()
+# -
+def _escape(value: Any = '') -> str:
+    return f"{value}".replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+# +
+# function: format_metrics()
+# -
+def format_metrics(metrics: list = None) -> str:
+    """returns the metric(s) in the prometheus text exposition format"""
+    _lines = []
+    for _m in (metrics or []):
+        _lines.append(f"# HELP {_m.name} {_m.help}")
+        _lines.append(f"# TYPE {_m.name} {_m.kind}")
+        for _labels, _value in _m.samples:
+            _l = ','.join(f'{_k}="{_escape(_v)}"' for _k, _v in _labels.items())
+            _lines.append(f"{_m.name}{{{_l}}} {_value}" if _l else f"{_m.name} {_value}")
+    return '\n'.join(_lines) + '\n'
+
+
+# +
+# class: _MetricsHandler()
+# -
+# noinspection PyPep8Naming
+class _MetricsHandler(BaseHTTPRequestHandler):
+
+    # noinspection PyBroadException
+    def do_GET(self) -> None:
+        if self.path.split('?')[0] not in (METRICS_PATH, '/'):
+            self.send_error(404)
+            return
+        try:
+            _body = format_metrics(self.server.collect()).encode('utf-8')
+        except Exception as _:
+            self.send_error(500, f"{_}")
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', METRICS_CONTENT_TYPE)
+        self.send_header('Content-Length', f"{len(_body)}")
+        self.end_headers()
+        self.wfile.write(_body)
+
+    def address_string(self) -> str:
+        return f"{self.client_address[0] if self.client_address else 'unix'}"
+
+    def log_message(self, fmt: str = '', *args) -> None:
+        pass
+
+
+# +
+# class: _UnixHTTPServer()
+# -
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+# +
+# class: MetricsServer()
+# use: ms = MetricsServer(collect=gui.metrics, port=9100, log=log)
+#      ms.start()
+#      $ curl http://127.0.0.1:9100/metrics
+# -
+# noinspection PyBroadException
+class MetricsServer(object):
+    """serves the metric(s) returned by collect() over tcp on localhost or a unix socket"""
+
+    # +
+    # (hidden) method: __init__()
+    # -
+    def __init__(self, collect: Any = None, port: int = 0, path: str = '',
+                 host: str = METRICS_HOST, log: logging.Logger = None) -> None:
+
+        # get argument(s)
+        self.__collect = collect if callable(collect) else (lambda: [])
+        self.__port = port if port > 0 else 0
+        self.__path = path.strip()
+        self.__host = host if host.strip() != '' else METRICS_HOST
+        self.__log = log
+
+        # initialize variable(s)
+        self.__server = None
+        self.__thread = None
+
+    # +
+    # variable getter(s)
+    # -
+    @property
+    def address(self) -> str:
+        return f"unix:{self.__path}" if self.__path != '' else f"http://{self.__host}:{self.__port}{METRICS_PATH}"
+
+    @property
+    def enabled(self) -> bool:
+        return self.__port > 0 or self.__path != ''
+
+    @property
+    def running(self) -> bool:
+        return self.__thread is not None and self.__thread.is_alive()
+
+    # +
+    # method: start()
+    # -
+    def start(self) -> None:
+        if not self.enabled or self.running:
+            return
+        try:
+            if self.__path != '':
+                remove_socket(self.__path)
+                self.__server = _UnixHTTPServer(self.__path, _MetricsHandler)
+            else:
+                self.__server = ThreadingHTTPServer((self.__host, self.__port), _MetricsHandler)
+                self.__server.daemon_threads = True
+        except Exception as _:
+            self.__server = None
+            if self.__log:
+                self.__log.error(f"failed to serve metrics at {self.address}, error='{_}'")
+            return
+        self.__server.collect = self.__collect
+        self.__thread = threading.Thread(target=self.__server.serve_forever, name='MetricsServer', daemon=True)
+        self.__thread.start()
+        if self.__log:
+            self.__log.info(f"serving metrics at {self.address}")
+
+    # +
+    # method: stop()
+    # -
+    def stop(self) -> None:
+        if self.__server is not None:
+            self.__server.shutdown()
+            self.__server.server_close()
+            self.__server = None
+        if self.__thread is not None:
+            self.__thread.join(timeout=1.0)
+            self.__thread = None
+        if self.__path != '':
+            try:
+                remove_socket(self.__path)
+            except Exception as _:
+                if self.__log:
+                    self.__log.error(f"failed to remove metrics socket, error='{_}'")
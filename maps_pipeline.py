@@ -0,0 +1,522 @@
+#!/usr/bin/env python3
+
+
+# +
+# import(s)
+# -
+from colors import STALEGRAY
+from colors import YELLOW
+from maps_alarm import ALARM_COLD
+from maps_alarm import ALARM_HOT
+from maps_alarm import ALARM_INVALID
+from maps_alarm import ALARM_NORMAL
+from maps_alarm import AlarmEngine
+from maps_alarm import DEFAULT_DEADBAND
+from maps_alarm import DEFAULT_HYSTERESIS
+from maps_connection import CONNECTION_STATES
+from maps_connection import IndiConnectionPool
+from maps_indi import BLUE
+from maps_indi import RED
+from maps_indi import TAB_DATA
+from maps_indi import update_dictionary
+from maps_ingest import DEFAULT_INGEST_SIZE
+from maps_ingest import INGEST_POLICIES
+from maps_latency import LatencyTracer
+from maps_profiler import TickProfiler
+from maps_registry import DEFAULT_SWEEP
+from maps_registry import CompiledRegistry
+from maps_registry import StaleTracker
+from maps_registry import coerce_value
+from maps_registry import format_value
+from maps_watchdog import DEFAULT_THRESHOLD
+from maps_watchdog import StallWatchdog
+
+from typing import Any
+from typing import Callable
+
+import argparse
+import collections
+import logging
+import math
+import os
+import threading
+import time
+
+import numpy as np
+
+
+# +
+# constant(s)
+# -
+DEFAULT_DISTRIBUTION = 'uniform'
+DEFAULT_SEED = 0
+
+
+# +
+# named tuple(s): the data path option(s) both gui(s) take
+# -
+PipelineOptions = collections.namedtuple(
+    'PipelineOptions',
+    ['deadband', 'hysteresis', 'profile', 'stall', 'metrics_port', 'metrics_socket', 'firehose', 'distribution',
+     'ramp', 'queue_size', 'queue_policy', 'scenario', 'seed', 'log_updates', 'shared'],
+    defaults=[DEFAULT_DEADBAND, DEFAULT_HYSTERESIS, False, DEFAULT_THRESHOLD, 0, '', 0.0, DEFAULT_DISTRIBUTION,
+              False, DEFAULT_INGEST_SIZE, INGEST_POLICIES[0], '', DEFAULT_SEED, False, False])
+
+
+# +
+# function: add_pipeline_arguments()
+# -
+def add_pipeline_arguments(parser: argparse.ArgumentParser = None) -> None:
+    """adds the command line argument(s) of PipelineOptions to a gui's parser"""
+    parser.add_argument('--deadband', default=DEFAULT_DEADBAND, help=f"""Alarm deadband (fraction of range) [%(default)s]""")
+    parser.add_argument('--hysteresis', default=DEFAULT_HYSTERESIS, help=f"""Alarm hysteresis (fraction of range) [%(default)s]""")
+    parser.add_argument('--profile', default=False, action='store_true', help=f"""Profile tick stage(s) [%(default)s]""")
+    parser.add_argument('--stall', default=DEFAULT_THRESHOLD, help=f"""Event loop stall threshold (ms) [%(default)s]""")
+    parser.add_argument('--metrics-port', default=0, help=f"""Serve metrics on localhost:<port>, 0 disables [%(default)s]""")
+    parser.add_argument('--metrics-socket', default='', help=f"""Serve metrics on a unix socket [%(default)s]""")
+    parser.add_argument('--firehose', default=0.0, help=f"""Stress test with this many update(s)/s, 0 disables [%(default)s]""")
+    parser.add_argument('--firehose-keys', default=DEFAULT_DISTRIBUTION, help=f"""Firehose key distribution [%(default)s], see FIREHOSE_DISTRIBUTIONS in maps_firehose.py""")
+    parser.add_argument('--firehose-ramp', default=False, action='store_true', help=f"""Ramp the firehose up to its rate [%(default)s]""")
+    parser.add_argument('--queue-size', default=DEFAULT_INGEST_SIZE, help=f"""Ingest queue bound [%(default)s]""")
+    parser.add_argument('--queue-policy', default=INGEST_POLICIES[0], help=f"""Ingest queue policy when full [%(default)s], choice of {INGEST_POLICIES}""")
+    parser.add_argument('--scenario', default='', help=f"""Simulation scenario [%(default)s], see SCENARIOS in maps_scenario.py, or a JSON file""")
+    parser.add_argument('--seed', default=DEFAULT_SEED, help=f"""Random seed for simulation [%(default)s]""")
+    parser.add_argument('--log-json', default=False, action='store_true', help=f"""Log JSON lines, with each live update's key, value and latency [%(default)s]""")
+    parser.add_argument('--shared', default=False, action='store_true', help=f"""Read stream(s) from a running maps_shared.py collector [%(default)s]""")
+
+
+# +
+# function: pipeline_options()
+# -
+def pipeline_options(args: argparse.Namespace = None) -> PipelineOptions:
+    """returns the PipelineOptions of parsed command line argument(s)"""
+    return PipelineOptions(deadband=float(args.deadband), hysteresis=float(args.hysteresis), profile=bool(args.profile),
+                           stall=int(args.stall), metrics_port=int(args.metrics_port),
+                           metrics_socket=args.metrics_socket.strip(), firehose=float(args.firehose),
+                           distribution=args.firehose_keys.strip(), ramp=bool(args.firehose_ramp),
+                           queue_size=int(args.queue_size), queue_policy=args.queue_policy.strip(),
+                           scenario=args.scenario.strip(), seed=int(args.seed), log_updates=bool(args.log_json),
+                           shared=bool(args.shared))
+
+
+# +
+# class: TickPipeline()
+# use: tp = TickPipeline(name='MAPS Status GUI', module='Time', data=TAB_DATA['Time'], widget=lambda _k: ...)
+#      tp.start() ... tp.connect() ... tp.check() ... tp.tick(simulate=False) ... tp.sweep() ... tp.stop()
+# -
+class TickPipeline(object):
+    """the data path of a gui: drains its source, then coerces, alarms, formats, repaints and traces each tick"""
+
+    # +
+    # (hidden) method: __init__()
+    # -
+    def __init__(self, name: str = '', module: str = '', data: dict = None, streams: list = None,
+                 host: str = '', port: int = 0, routes: dict = None, delay: int = 1000,
+                 fg: str = '', bg: str = '', options: PipelineOptions = None,
+                 widget: Callable[[str], Any] = None, annunciate: Callable[[list], None] = None,
+                 log: logging.Logger = None, parent: Any = None) -> None:
+
+        # get argument(s)
+        self.__name = name
+        self.__module = module
+        self.__streams = list(streams) if isinstance(streams, (list, tuple)) else []
+        self.__host = host
+        self.__port = port
+        self.__routes = routes if isinstance(routes, dict) else {}
+        self.__delay = delay
+        self.__fg = fg
+        self.__bg = bg
+        self.__options = options if isinstance(options, PipelineOptions) else PipelineOptions()
+        self.__widget = widget if callable(widget) else (lambda _k: None)
+        self.__annunciate = annunciate
+        self.__log = log
+
+        # compile the registry and track per-stream update time(s)
+        self.__registry = CompiledRegistry(data=data)
+        self.__stale = StaleTracker(registry=self.__registry)
+        self.__updates = np.zeros(self.__registry.nelms, dtype=np.int64)
+        self.__device_names, self.__device_codes = np.unique(self.__registry.devices.astype(str), return_inverse=True)
+
+        # per-tick state
+        self.__generation = -1
+        self.__repaints = 0
+        self.__simulate = True
+        self.__source = None
+        self.__step = 0
+        self.__styles = {}
+        self.__texts = {}
+        self.__tick_last = 0.0
+        self.__tick_seconds = 0.0
+
+        # profile, trace and watch the event loop
+        self.__profiler = TickProfiler(enabled=self.__options.profile)
+        self.__tracer = LatencyTracer()
+        self.__watchdog = StallWatchdog(threshold=self.__options.stall, log=self.__log, parent=parent)
+
+        # the metrics server is only loaded when asked for, and only reads the snapshot published by each sweep,
+        # or by the next tick when a scrape asks for a fresher one
+        self.__metrics = None
+        self.__scrape = False
+        self.__snapshot = ()
+        self.__snapshot_cond = threading.Condition()
+        self.__snapshot_count = 0
+        if self.__options.metrics_port > 0 or self.__options.metrics_socket != '':
+            from maps_metrics import MetricsServer
+            self.__metrics = MetricsServer(collect=self.metrics, port=self.__options.metrics_port,
+                                           path=self.__options.metrics_socket, log=self.__log)
+
+        # a seeded scenario replaces uniform noise when simulating
+        self.__scenario = None
+        if self.__options.scenario != '':
+            from maps_scenario import ScenarioEngine
+            self.__scenario = ScenarioEngine(registry=self.__registry, seed=self.__options.seed,
+                                             scenario=self.__options.scenario, dt=self.__delay / 1000.0, log=self.__log)
+            if self.__log:
+                self.__log.info(self.__scenario.report())
+
+        # alarm(s) are evaluated over the registry and only state changes are styled and logged
+        self.__alarms = AlarmEngine(registry=self.__registry, deadband=self.__options.deadband,
+                                    hysteresis=self.__options.hysteresis, log=self.__log)
+        self.__alarm_styles = {
+            ALARM_NORMAL: f"background-color: '{self.__bg}'; color: '{self.__fg}';",
+            ALARM_COLD: f"background-color: '{BLUE}'; color: '{YELLOW}';",
+            ALARM_HOT: f"background-color: '{RED}'; color: '{YELLOW}';",
+            ALARM_INVALID: f"background-color: '{YELLOW}'; color: '{BLUE}';"
+        }
+
+    # +
+    # variable getter(s)
+    # -
+    @property
+    def alarms(self) -> AlarmEngine:
+        return self.__alarms
+
+    @property
+    def options(self) -> PipelineOptions:
+        return self.__options
+
+    @property
+    def profiler(self) -> TickProfiler:
+        return self.__profiler
+
+    @property
+    def registry(self) -> CompiledRegistry:
+        return self.__registry
+
+    @property
+    def source(self) -> Any:
+        return self.__source
+
+    @property
+    def step(self) -> int:
+        return self.__step
+
+    @property
+    def watchdog(self) -> StallWatchdog:
+        return self.__watchdog
+
+    # +
+    # method: start()
+    # -
+    def start(self) -> None:
+        self.__watchdog.start()
+        if self.__metrics is not None:
+            self.__publish__()
+            self.__metrics.start()
+
+    # +
+    # method: stop()
+    # -
+    def stop(self) -> None:
+        if self.__source is not None:
+            self.__source.stop()
+        self.__watchdog.stop()
+        if self.__metrics is not None:
+            self.__metrics.stop()
+
+    # +
+    # method: connect()
+    # -
+    def connect(self) -> None:
+        """starts the source, which (re)connects and (re)subscribes in the background so we never block here"""
+        if self.__source is None and self.__options.firehose > 0.0:
+            from maps_firehose import Firehose
+            self.__source = Firehose(registry=self.__registry, rate=self.__options.firehose,
+                                     distribution=self.__options.distribution, ramp=self.__options.ramp,
+                                     seed=self.__options.seed, log=self.__log, maxsize=self.__options.queue_size,
+                                     policy=self.__options.queue_policy)
+        elif self.__source is None and self.__options.shared:
+            from maps_shared import SharedFeed
+            from maps_shared import shared_name
+            # the collector lays its table out over the whole module, which may hold more than we display
+            self.__source = SharedFeed(registry=CompiledRegistry(data=TAB_DATA.get(self.__module)),
+                                       name=shared_name(self.__module), log=self.__log)
+            self.__generation = -1
+        elif self.__source is None:
+            self.__source = IndiConnectionPool(host=self.__host, port=self.__port, streams=self.__streams,
+                                               routes=self.__routes, log=self.__log,
+                                               maxsize=self.__options.queue_size, policy=self.__options.queue_policy)
+            self.__generation = -1
+        self.__source.start()
+
+    # +
+    # method: disconnect()
+    # -
+    def disconnect(self) -> None:
+        """stops the source and greys out every stream, since its last value is no longer being updated"""
+        if self.__source is not None:
+            self.__source.stop()
+        self.__source = None
+        self.__generation = -1
+        self.__stale.expire(np.ones(self.__registry.nelms, dtype=bool))
+        self.sweep()
+
+    # +
+    # method: check()
+    # -
+    def check(self) -> tuple:
+        """returns (message, stale) when the source's connection state changed since the last call, else None,
+           and greys out the streams of devices whose indiserver is down straight away"""
+        if self.__source is None or self.__source.generation == self.__generation:
+            return None
+        self.__generation = self.__source.generation
+        self.expire(self.__source.stale_devices)
+        return self.__source.message, self.__source.stale
+
+    # +
+    # method: expire()
+    # -
+    def expire(self, devices: set = None) -> None:
+        """expires the streams of the device(s) so they are greyed out straight away"""
+        self.__stale.expire(self.__registry.device_mask(devices))
+        self.sweep()
+
+    # +
+    # method: tick()
+    # -
+    def tick(self, simulate: bool = True) -> int:
+        """runs one tick and returns the number of stream(s) updated"""
+        self.__step += 1
+        self.__simulate = simulate
+        self.__profiler.begin()
+        _t0 = time.perf_counter()
+
+        # drain: refresh simulated values or take whatever the source sent since the last tick
+        _data = self.__registry.data
+        _stamps, _drained, _ret = {}, math.nan, None
+        if simulate and self.__scenario is not None:
+            _ret = self.__scenario.tick()
+            _keys = list(_ret)
+            _idx = self.__registry.indices(_keys)
+            self.__stale.touch(_idx)
+            self.__updates[_idx] += 1
+        elif simulate:
+            update_dictionary(_dict=_data)
+            self.__stale.touch_all()
+            self.__updates += 1
+            _keys = self.__registry.keys
+        else:
+            if self.__source is None:
+                if self.__log:
+                    self.__log.error(f"You are not connected to the IndiServer!")
+                return 0
+            _ret = self.__source.drain(stamps=_stamps)
+            _drained = time.time()
+            if self.__log and _ret:
+                self.__log.debug("drained %d update(s)", len(_ret))
+            _keys = [_k for _k in _ret if _k in self.__registry.index]
+            _idx = self.__registry.indices(_keys)
+            self.__stale.touch(_idx)
+            self.__updates[_idx] += 1
+        self.__profiler.mark('drain')
+
+        # coerce: store incoming value(s) as their datatype (simulated values already are)
+        if _ret is not None:
+            for _k in _keys:
+                _data[_k]['actval'] = coerce_value(_ret[_k], _data[_k]['datatype'])
+        self.__profiler.mark('coerce')
+
+        # alarm: evaluate and restyle only the stream(s) that changed state
+        self.evaluate(_keys)
+        self.__profiler.mark('alarm')
+
+        # format: only keep text that differs from what is on screen
+        _texts = {}
+        for _k in _keys:
+            _text = format_value(_data[_k]['actval'], _data[_k]['datatype'])
+            if _text != self.__texts.get(_k, None):
+                _texts[_k] = _text
+        self.__profiler.mark('format')
+
+        # widget: repaint changed text
+        for _k, _text in _texts.items():
+            _widget = self.__widget(_k)
+            if hasattr(_widget, 'setText'):
+                _widget.setText(_text)
+        self.__texts.update(_texts)
+        self.__profiler.mark('widget')
+        self.__trace__(_keys, _stamps, _drained)
+        self.__repaints += len(_texts)
+        self.__tick_last = time.perf_counter() - _t0
+        self.__tick_seconds += self.__tick_last
+        self.__profiler.end(updates=len(_keys), repaints=len(_texts))
+        if self.__scrape:
+            self.__publish__()
+        return len(_keys)
+
+    # +
+    # method: evaluate()
+    # -
+    def evaluate(self, keys: Any = None) -> None:
+        """runs the alarm engine over the current values and restyles only the streams that changed state"""
+        _data = self.__registry.data
+        _keys = [_k for _k in keys if _k in self.__registry.index]
+        _events = self.__alarms.evaluate(self.__registry.indices(_keys), [_data[_k]['actval'] for _k in _keys])
+        for _event in _events:
+            _widget = self.__widget(_event.key)
+            if hasattr(_widget, 'setStyleSheet'):
+                self.__styles[_event.key] = self.__alarm_styles[_event.new]
+                _widget.setStyleSheet(self.__alarm_styles[_event.new])
+        if _events and self.__annunciate is not None:
+            self.__annunciate(_events)
+
+    # +
+    # method: sweep()
+    # -
+    def sweep(self) -> None:
+        """restyles only the streams whose stale state changed since the last sweep"""
+        _stale, _fresh = self.__stale.sweep()
+        for _i in _stale:
+            _widget = self.__widget(self.__registry.keys[_i])
+            if hasattr(_widget, 'setStyleSheet'):
+                _widget.setStyleSheet(f"background-color: '{self.__bg}'; color: '{STALEGRAY}';")
+        for _i in _fresh:
+            _k = self.__registry.keys[_i]
+            _widget = self.__widget(_k)
+            if hasattr(_widget, 'setStyleSheet'):
+                _widget.setStyleSheet(self.__styles.get(_k, f"background-color: '{self.__bg}'; color: '{self.__fg}';"))
+        if self.__log and _stale.size > 0:
+            self.__log.warning(f"{_stale.size} stream(s) went stale: {[self.__registry.keys[_i] for _i in _stale]}")
+        if self.__log and _fresh.size > 0:
+            self.__log.info(f"{_fresh.size} stream(s) are fresh again")
+        self.__publish__()
+
+    # +
+    # method: set_profile()
+    # -
+    def set_profile(self, state: bool = False) -> None:
+        self.__profiler.enabled = state
+        if state:
+            self.__profiler.reset()
+
+    # +
+    # method: dump_profile()
+    # -
+    def dump_profile(self) -> None:
+        if self.__log:
+            self.__log.info(f"{self.__profiler.report()}")
+            self.__log.info(f"{self.__profiler.summary()}")
+
+    # +
+    # method: dump_latency()
+    # -
+    def dump_latency(self) -> None:
+        if self.__log:
+            self.__log.info(f"{self.__watchdog.report()}")
+            self.__log.info(f"{self.__tracer.report()}")
+            if self.__source is not None:
+                self.__log.info(f"{self.__source.feed.report() if self.__source.feed is not None else self.__source.report()}")
+            if self.__scenario is not None:
+                self.__log.info(f"{self.__scenario.report()}")
+            for _stall in self.__watchdog.stalls[-5:]:
+                self.__log.info(f"stall of {_stall.duration:.0f} ms at {_stall.time}:\n{''.join(_stall.stack or [])}")
+
+    # +
+    # method: metrics()
+    # -
+    def metrics(self) -> tuple:
+        """returns the latest published metric(s), called from the metrics server thread, after asking the gui thread
+           for a fresh snapshot and waiting for it for up to one sweep"""
+        with self.__snapshot_cond:
+            _count = self.__snapshot_count
+            self.__scrape = True
+            self.__snapshot_cond.wait_for(lambda: self.__snapshot_count != _count, timeout=DEFAULT_SWEEP / 1000.0)
+            return self.__snapshot
+
+    # +
+    # method: snapshot()
+    # -
+    def snapshot(self) -> tuple:
+        """returns the gui's metric(s) as an immutable tuple, called from the gui thread"""
+        from maps_metrics import Metric
+        from maps_metrics import rss_bytes
+        _updates = np.bincount(self.__device_codes, weights=self.__updates, minlength=self.__device_names.size)
+        _pool = self.__source
+        _connections = list(_pool.connections.items()) if _pool is not None else []
+        _feeds = [_pool.feed] if _pool is not None and _pool.feed is not None else []
+        return (
+            Metric('maps_gui_info', 'gauge', 'GUI process information',
+                   (({'gui': self.__name, 'module': self.__module, 'pid': os.getpid()}, 1),)),
+            Metric('maps_updates_total', 'counter', 'Stream updates received per device',
+                   tuple(({'device': _d}, int(_n)) for _d, _n in zip(self.__device_names.tolist(), _updates))),
+            Metric('maps_queue_depth', 'gauge', 'Messages waiting in the ingest queue',
+                   (({}, _pool.depth if _pool is not None else 0),)),
+            Metric('maps_queue_dropped_total', 'counter', 'Updates dropped by the ingest queue',
+                   tuple(({'policy': _feed.policy}, _feed.dropped) for _feed in _feeds)),
+            Metric('maps_queue_coalesced_total', 'counter', 'Updates replaced by a newer value in the ingest queue',
+                   tuple(({'policy': _feed.policy}, _feed.coalesced) for _feed in _feeds)),
+            Metric('maps_queue_blocked_total', 'counter', 'Times a producer waited on a full ingest queue',
+                   tuple(({'policy': _feed.policy}, _feed.blocked) for _feed in _feeds)),
+            Metric('maps_ticks_total', 'counter', 'GUI ticks', (({}, self.__step),)),
+            Metric('maps_tick_seconds_total', 'counter', 'Time spent in GUI ticks', (({}, self.__tick_seconds),)),
+            Metric('maps_tick_last_seconds', 'gauge', 'Duration of the last GUI tick', (({}, self.__tick_last),)),
+            Metric('maps_repaints_total', 'counter', 'Widget text updates', (({}, self.__repaints),)),
+            Metric('maps_active_alarms', 'gauge', 'Streams in alarm', (({}, self.__alarms.nactive),)),
+            Metric('maps_stale_streams', 'gauge', 'Streams without a recent update', (({}, self.__stale.nstale),)),
+            Metric('maps_simulate', 'gauge', 'Simulation mode', (({}, int(self.__simulate)),)),
+            Metric('maps_connection_state', 'gauge', 'Connection state per indiserver',
+                   tuple(({'server': f"{_h}:{_p}", 'state': _s}, int(_c.state == _s))
+                         for (_h, _p), _c in _connections for _s in CONNECTION_STATES)),
+            Metric('process_resident_memory_bytes', 'gauge', 'Resident memory size in bytes', (({}, rss_bytes()),))
+        )
+
+    # +
+    # (hidden) method: __publish__()
+    # -
+    def __publish__(self) -> None:
+        """swaps in a fresh snapshot for the metrics server, if there is one"""
+        if self.__metrics is None:
+            return
+        _snapshot = self.snapshot()
+        with self.__snapshot_cond:
+            self.__snapshot = _snapshot
+            self.__snapshot_count += 1
+            self.__scrape = False
+            self.__snapshot_cond.notify_all()
+
+    # +
+    # method: report()
+    # -
+    def report(self) -> str:
+        """returns the option(s) and state of the pipeline suitable for a log"""
+        return f"options={self.__options}, metrics='{self.__metrics.address if self.__metrics is not None else ''}', " \
+               f"scenario={self.__scenario.seed if self.__scenario is not None else None}, " \
+               f"source={self.__source}, step={self.__step}"
+
+    # +
+    # (hidden) method: __trace__()
+    # -
+    def __trace__(self, keys: list = None, stamps: dict = None, drained: float = math.nan) -> None:
+        """records the latency of each live update from receipt (and sender time) to its widget update"""
+        _keys = [_k for _k in keys if _k in stamps] if stamps else []
+        if not _keys:
+            return
+        _times = np.array([stamps[_k] for _k in _keys], dtype=float)
+        _painted = time.time()
+        self.__tracer.record(devices=self.__registry.devices[self.__registry.indices(_keys)],
+                             received=_times[:, 0], wire=_times[:, 1], drained=drained, painted=_painted)
+        if self.__log and self.__options.log_updates:
+            _data = self.__registry.data
+            for _k, _received in zip(_keys, _times[:, 0].tolist()):
+                self.__log.debug("update %s=%s", _k, _data[_k]['actval'],
+                                 extra={'key': _k, 'value': _data[_k]['actval'], 'latency': _painted - _received})
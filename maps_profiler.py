@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+
+
+# +
+# import(s)
+# -
+import argparse
+import os
+import shlex
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+
+# +
+# constant(s)
+# -
+DEFAULT_COMMAND = 'maps_status_gui.py --help'
+DEFAULT_WINDOW = 1000
+IMPORT_TOP = 12
+PROFILE_STAGES = ['drain', 'coerce', 'alarm', 'format', 'widget']
+
+
+# +
+# class: TickProfiler()
+# use: tp = TickProfiler(enabled=True)
+#      tp.begin()
+#      ... tp.mark('drain') ... tp.mark('coerce') ...
+#      tp.end(updates=10, repaints=4)
+#      print(tp.report())
+# -
+class TickProfiler(object):
+    """times the stages of each tick into rolling windows, a single flag check when disabled"""
+
+    # +
+    # (hidden) method: __init__()
+    # -
+    def __init__(self, stages: list = None, window: int = DEFAULT_WINDOW, enabled: bool = False) -> None:
+
+        # get argument(s)
+        self.__stages = list(stages) if isinstance(stages, (list, tuple)) and len(stages) > 0 else list(PROFILE_STAGES)
+        self.__window = window if window > 0 else DEFAULT_WINDOW
+        self.enabled = enabled
+
+        # rolling window(s) of stage and total duration(s) in seconds, the last row is the total
+        self.__column = {_s: _i for _i, _s in enumerate(self.__stages)}
+        self.__samples = np.zeros((len(self.__stages) + 1, self.__window))
+        self.__current = np.zeros(len(self.__stages) + 1)
+        self.__filled = 0
+        self.__next = 0
+        self.__start = 0.0
+        self.__last = 0.0
+
+        # counter(s)
+        self.__ticks = 0
+        self.__updates = 0
+        self.__repaints = 0
+        self.__since = time.time()
+
+    # +
+    # decorator(s)
+    # -
+    @property
+    def enabled(self) -> bool:
+        return self.__enabled
+
+    @enabled.setter
+    def enabled(self, enabled: bool = False) -> None:
+        self.__enabled = bool(enabled)
+
+    # +
+    # variable getter(s)
+    # -
+    @property
+    def repaints(self) -> int:
+        return int(self.__repaints)
+
+    @property
+    def stages(self) -> list:
+        return self.__stages
+
+    @property
+    def ticks(self) -> int:
+        return int(self.__ticks)
+
+    @property
+    def updates(self) -> int:
+        return int(self.__updates)
+
+    # +
+    # method: begin()
+    # -
+    def begin(self) -> None:
+        if not self.__enabled:
+            return
+        self.__current.fill(0.0)
+        self.__start = self.__last = time.perf_counter()
+
+    # +
+    # method: mark()
+    # -
+    def mark(self, stage: str = '') -> None:
+        """charges the time since the previous mark to the stage"""
+        if not self.__enabled:
+            return
+        _now = time.perf_counter()
+        self.__current[self.__column[stage]] += _now - self.__last
+        self.__last = _now
+
+    # +
+    # method: end()
+    # -
+    def end(self, updates: int = 0, repaints: int = 0) -> None:
+        if not self.__enabled:
+            return
+        self.__current[-1] = time.perf_counter() - self.__start
+        self.__samples[:, self.__next] = self.__current
+        self.__next = (self.__next + 1) % self.__window
+        self.__filled = min(self.__filled + 1, self.__window)
+        self.__ticks += 1
+        self.__updates += updates
+        self.__repaints += repaints
+
+    # +
+    # method: reset()
+    # -
+    def reset(self) -> None:
+        self.__samples.fill(0.0)
+        self.__filled, self.__next = 0, 0
+        self.__ticks, self.__updates, self.__repaints = 0, 0, 0
+        self.__since = time.time()
+
+    # +
+    # method: summary()
+    # -
+    def summary(self) -> dict:
+        """returns {stage: (p50 ms, p99 ms)} including 'tick' for the whole tick, plus counter(s)"""
+        _summary = {'ticks': self.__ticks, 'updates': self.__updates, 'repaints': self.__repaints,
+                    'elapsed': time.time() - self.__since}
+        if self.__filled == 0:
+            return _summary
+        _p50, _p99 = np.percentile(self.__samples[:, :self.__filled], [50.0, 99.0], axis=1) * 1000.0
+        for _i, _s in enumerate(self.__stages + ['tick']):
+            _summary[_s] = (float(_p50[_i]), float(_p99[_i]))
+        return _summary
+
+    # +
+    # method: report()
+    # -
+    def report(self) -> str:
+        """returns a one-line summary suitable for a status bar or log"""
+        _s = self.summary()
+        if 'tick' not in _s:
+            return f"profile: no ticks recorded"
+        _elapsed = _s['elapsed'] if _s['elapsed'] > 0.0 else 1.0
+        _stages = ', '.join(f"{_k} {_s[_k][0]:.2f}/{_s[_k][1]:.2f}" for _k in self.__stages)
+        return f"tick p50/p99 {_s['tick'][0]:.2f}/{_s['tick'][1]:.2f} ms [{_stages}] " \
+               f"ticks={_s['ticks']}, updates={_s['updates']} ({_s['updates'] / _elapsed:.1f}/s), repaints={_s['repaints']}"
+
+
+# +
+# function: import_times()
+# -
+def import_times(argv: list = None) -> list:
+    """returns [(name, self us, cumulative us)] for a command line run under `python -X importtime`"""
+    _argv = list(argv) if isinstance(argv, (list, tuple)) and len(argv) > 0 else shlex.split(DEFAULT_COMMAND)
+    _proc = subprocess.run([sys.executable, '-X', 'importtime', *_argv], capture_output=True, text=True)
+    _times = []
+    for _line in _proc.stderr.splitlines():
+        if not _line.startswith('import time:') or '[us]' in _line:
+            continue
+        _self, _cumulative, _name = _line[len('import time:'):].split('|')
+        _times.append((_name.strip(), int(_self), int(_cumulative)))
+    return _times
+
+
+# +
+# function: startup_report()
+# -
+def startup_report(argv: list = None, top: int = IMPORT_TOP) -> str:
+    """returns the import time of a command line and of the top-level package(s) that cost the most"""
+    _argv = list(argv) if isinstance(argv, (list, tuple)) and len(argv) > 0 else shlex.split(DEFAULT_COMMAND)
+    _command = ' '.join([os.path.basename(_argv[0])] + _argv[1:])
+    _times = import_times(_argv)
+    if not _times:
+        return f"failed to time the import(s) of {_command}"
+    _total = sum(_s for _, _s, _ in _times)
+    _packages = {}
+    for _name, _self, _ in _times:
+        _packages[_name.split('.')[0]] = _packages.get(_name.split('.')[0], 0) + _self
+    _lines = [f"{_command} imports in {_total / 1.0e6:.3f}s ({len(_times)} modules), top package(s) by self time:"]
+    for _package, _self in sorted(_packages.items(), key=lambda _: -_[1])[:top]:
+        _lines.append(f"  {_package:24s} {_self / 1.0e3:9.1f} ms {100.0 * _self / max(_total, 1):5.1f}%")
+    return '\n'.join(_lines)
+
+
+# +
+# main()
+# -
+if __name__ == '__main__':
+
+    # get command line argument(s)
+    _p = argparse.ArgumentParser(description='maps startup profiler', formatter_class=argparse.RawTextHelpFormatter)
+    _p.add_argument('--command', default=DEFAULT_COMMAND, help=f"""Command line to time [%(default)s]""")
+    _p.add_argument('--top', default=IMPORT_TOP, help=f"""Top package(s) to list [%(default)s]""")
+    _a = _p.parse_args()
+
+    print(startup_report(argv=shlex.split(_a.command), top=int(_a.top)))
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+
+
+# +
+# import(s)
+# -
+from pnd import color_print
+
+import os
+import sys
+
+
+# +
+# constant(s)
+# -
+QT_VERSION = int(os.getenv("QT_VERSION",  -1))
+
+
+# +
+# Qt name(s): only those the gui(s) use, so importing this module does not bind thousands of PyQt symbol(s).
+# Scoped enum(s) (eg Qt.TimerType.PreciseTimer) and exec() work in both; QAction moved to QtGui in Qt6.
+# -
+if QT_VERSION == 5:
+    # noinspection PyPackageRequirements,PyUnresolvedReferences
+    from PyQt5.QtCore import QAbstractListModel, QModelIndex, QObject, Qt, QTimer, qVersion
+    # noinspection PyPackageRequirements,PyUnresolvedReferences
+    from PyQt5.QtWidgets import QAbstractItemView, QAction, QApplication, QDockWidget, QGridLayout, QGroupBox, \
+        QHBoxLayout, QLabel, QLCDNumber, QLineEdit, QListView, QMainWindow, QMenuBar, QMessageBox, QPushButton, \
+        QRadioButton, QSlider, QTabWidget, QToolTip, QVBoxLayout, QWidget
+    # noinspection PyPackageRequirements,PyUnresolvedReferences
+    from PyQt5.QtGui import QBrush, QColor, QFont, QIcon, QKeySequence, QPixmap
+elif QT_VERSION == 6:
+    # noinspection PyPackageRequirements,PyUnresolvedReferences
+    from PyQt6.QtCore import QAbstractListModel, QModelIndex, QObject, Qt, QTimer, qVersion
+    # noinspection PyPackageRequirements,PyUnresolvedReferences
+    from PyQt6.QtWidgets import QAbstractItemView, QApplication, QDockWidget, QGridLayout, QGroupBox, \
+        QHBoxLayout, QLabel, QLCDNumber, QLineEdit, QListView, QMainWindow, QMenuBar, QMessageBox, QPushButton, \
+        QRadioButton, QSlider, QTabWidget, QToolTip, QVBoxLayout, QWidget
+    # noinspection PyPackageRequirements,PyUnresolvedReferences
+    from PyQt6.QtGui import QAction, QBrush, QColor, QFont, QIcon, QKeySequence, QPixmap
+else:
+    color_print(msg='ERROR: Qt version not supported', color='red', height=2)
+    sys.exit(0)
+QT_API = f"PyQt{QT_VERSION}"
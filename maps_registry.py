@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+
+
+# +
+# import(s)
+# -
+from typing import Any
+
+import math
+import time
+
+import numpy as np
+
+
+# +
+# constant(s)
+# -
+DEFAULT_STALE_TIMEOUT = 30.0
+DEFAULT_SWEEP = 1000
+NO_INDICES = np.empty(0, dtype=np.intp)
+STALE_FACTOR = 5.0
+
+
+# +
+# function: coerce_value()
+# -
+# noinspection PyBroadException
+def coerce_value(value: Any = None, datatype: str = '') -> Any:
+    """returns the value as its registry datatype or as a string if it cannot be converted"""
+    try:
+        if 'float' in datatype:
+            return float(value)
+        elif 'int' in datatype:
+            return int(value)
+        elif 'bool' in datatype:
+            return bool(value)
+        elif 'binary' in datatype and isinstance(value, str):
+            return f"{value.encode('utf-8')}"
+        return f"{value}"
+    except:
+        return f"{value}"
+
+
+# +
+# function: format_value()
+# -
+# noinspection PyBroadException
+def format_value(value: Any = None, datatype: str = '') -> str:
+    """returns the display text of a (coerced) value"""
+    try:
+        if 'float' in datatype:
+            return f"{float(value)}"
+        elif 'int' in datatype:
+            return f"{int(value)}"
+        elif 'bool' in datatype:
+            return f"{bool(value)}"
+        return f"{value}"
+    except:
+        return f"{value}"
+
+
+# +
+# class: CompiledRegistry()
+# use: reg = CompiledRegistry(data=TAB_DATA['Time'])
+#      _i = reg.index['Time.Now.JD']
+# -
+class CompiledRegistry(object):
+    """compiles a maps_indi dictionary into index-addressed arrays"""
+
+    # +
+    # (hidden) method: __init__()
+    # -
+    def __init__(self, data: dict = None) -> None:
+
+        # get argument(s)
+        self.__data = data if isinstance(data, dict) else {}
+
+        # stream key(s) in dictionary order and their index
+        self.__keys = [_k for _k in self.__data]
+        self.__index = {_k: _i for _i, _k in enumerate(self.__keys)}
+        self.__nelms = len(self.__keys)
+        self.__devices = np.array([_k.split('.')[0] for _k in self.__keys], dtype=object)
+        self.__datatypes = [f"{self.__data[_k].get('datatype', '')}".strip().lower() for _k in self.__keys]
+
+        # range(s), choice(s), expected rate(s) and alarm band(s)
+        self.__lo = np.full(self.__nelms, math.nan)
+        self.__hi = np.full(self.__nelms, math.nan)
+        self.__ranged = np.zeros(self.__nelms, dtype=bool)
+        self.__choices = {}
+        self.__rate = np.full(self.__nelms, math.nan)
+        self.__deadband = np.full(self.__nelms, math.nan)
+        self.__hysteresis = np.full(self.__nelms, math.nan)
+        for _i, _k in enumerate(self.__keys):
+            _range = self.__data[_k].get('datarange', '')
+            if isinstance(_range, tuple) and len(_range) == 2:
+                self.__lo[_i], self.__hi[_i] = float(_range[0]), float(_range[1])
+                self.__ranged[_i] = True
+            elif isinstance(_range, list):
+                self.__choices[_i] = _range
+            _rate = self.__data[_k].get('rate', math.nan)
+            if isinstance(_rate, (int, float)) and _rate > 0.0:
+                self.__rate[_i] = float(_rate)
+            for _name, _array in (('deadband', self.__deadband), ('hysteresis', self.__hysteresis)):
+                _band = self.__data[_k].get(_name, math.nan)
+                if isinstance(_band, (int, float)) and _band >= 0.0:
+                    _array[_i] = float(_band)
+
+    # +
+    # variable getter(s)
+    # -
+    @property
+    def choices(self) -> dict:
+        return self.__choices
+
+    @property
+    def data(self) -> dict:
+        return self.__data
+
+    @property
+    def datatypes(self) -> list:
+        return self.__datatypes
+
+    @property
+    def deadband(self) -> np.ndarray:
+        return self.__deadband
+
+    @property
+    def devices(self) -> np.ndarray:
+        return self.__devices
+
+    @property
+    def hi(self) -> np.ndarray:
+        return self.__hi
+
+    @property
+    def hysteresis(self) -> np.ndarray:
+        return self.__hysteresis
+
+    @property
+    def index(self) -> dict:
+        return self.__index
+
+    @property
+    def keys(self) -> list:
+        return self.__keys
+
+    @property
+    def lo(self) -> np.ndarray:
+        return self.__lo
+
+    @property
+    def nelms(self) -> int:
+        return int(self.__nelms)
+
+    @property
+    def ranged(self) -> np.ndarray:
+        return self.__ranged
+
+    @property
+    def rate(self) -> np.ndarray:
+        return self.__rate
+
+    # +
+    # method: indices()
+    # -
+    def indices(self, keys: Any = None) -> np.ndarray:
+        """returns the indices of the known keys, unknown keys are ignored"""
+        return np.fromiter((self.__index[_k] for _k in keys if _k in self.__index), dtype=np.intp)
+
+    # +
+    # method: device_mask()
+    # -
+    def device_mask(self, devices: set = None) -> np.ndarray:
+        """returns a boolean mask of the streams belonging to any of the devices"""
+        if not devices:
+            return np.zeros(self.__nelms, dtype=bool)
+        return np.isin(self.__devices, list(devices))
+
+
+# +
+# class: StaleTracker()
+# use: st = StaleTracker(registry=reg)
+#      st.touch(reg.indices(_batch))
+#      _stale, _fresh = st.sweep()
+# -
+class StaleTracker(object):
+    """records per-stream update times and reports stale/fresh transitions"""
+
+    # +
+    # (hidden) method: __init__()
+    # -
+    def __init__(self, registry: CompiledRegistry = None, timeout: float = DEFAULT_STALE_TIMEOUT,
+                 factor: float = STALE_FACTOR, now: float = math.nan) -> None:
+
+        # get argument(s)
+        self.__registry = registry if registry is not None else CompiledRegistry()
+        self.__timeout = timeout if timeout > 0.0 else DEFAULT_STALE_TIMEOUT
+        self.__factor = factor if factor > 0.0 else STALE_FACTOR
+
+        # a stream is stale when it misses `factor` expected updates or, without a rate, the timeout
+        _now = time.time() if math.isnan(now) else now
+        _rate = self.__registry.rate
+        self.__limits = np.where(_rate > 0.0, self.__factor / np.where(_rate > 0.0, _rate, 1.0), self.__timeout)
+        self.__timestamps = np.full(self.__registry.nelms, _now)
+        self.__stale = np.zeros(self.__registry.nelms, dtype=bool)
+
+    # +
+    # variable getter(s)
+    # -
+    @property
+    def limits(self) -> np.ndarray:
+        return self.__limits
+
+    @property
+    def stale(self) -> np.ndarray:
+        return self.__stale
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self.__timestamps
+
+    @property
+    def nstale(self) -> int:
+        return int(np.count_nonzero(self.__stale))
+
+    # +
+    # method: touch()
+    # -
+    def touch(self, indices: np.ndarray = NO_INDICES, now: float = math.nan) -> None:
+        self.__timestamps[indices] = time.time() if math.isnan(now) else now
+
+    # +
+    # method: touch_all()
+    # -
+    def touch_all(self, now: float = math.nan) -> None:
+        self.__timestamps.fill(time.time() if math.isnan(now) else now)
+
+    # +
+    # method: expire()
+    # -
+    def expire(self, mask: np.ndarray = None) -> None:
+        """forces the masked streams stale on the next sweep (eg. their indiserver went away)"""
+        if mask is not None:
+            self.__timestamps[mask] = -math.inf
+
+    # +
+    # method: sweep()
+    # -
+    def sweep(self, now: float = math.nan) -> tuple:
+        """returns the indices that became stale and those that became fresh since the last sweep"""
+        _now = time.time() if math.isnan(now) else now
+        _stale = (_now - self.__timestamps) > self.__limits
+        _changed = np.flatnonzero(_stale != self.__stale)
+        if _changed.size == 0:
+            return NO_INDICES, NO_INDICES
+        self.__stale = _stale
+        _became = _stale[_changed]
+        return _changed[_became], _changed[~_became]
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+
+
+# +
+# import(s)
+# -
+from maps_indi import FILETYPES
+from maps_indi import SIM_CLOCK
+from maps_registry import CompiledRegistry
+from maps_registry import DEFAULT_STALE_TIMEOUT
+from maps_synthetic import DEFAULT_SEED
+
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from typing import Any
+
+import argparse
+import fnmatch
+import json
+import logging
+import math
+import os
+
+import numpy as np
+
+
+# +
+# constant(s)
+# -
+__doc__ = """python3 maps_scenario.py --help"""
+DEFAULT_SCENARIO = 'faults'
+EXCURSION_VALUE = 'FAULT'
+SCENARIO_BEHAVIORS = ['noise', 'walk', 'sinusoid', 'step', 'excursion', 'stuck', 'dropout']
+SCENARIO_PARAMETERS = ('start', 'duration', 'period', 'amplitude', 'level', 'side')
+SCENARIOS = {
+    'noise': {'noise': 1.0},
+    'walk': {'walk': 1.0},
+    'faults': {'walk': 0.55, 'sinusoid': 0.2, 'step': 0.05, 'excursion': 0.1, 'stuck': 0.05, 'dropout': 0.05},
+}
+WALK_SIGMA = 0.01
+
+
+# +
+# function: load_scenario()
+# -
+def load_scenario(scenario: str = DEFAULT_SCENARIO) -> dict:
+    """returns {'mix': {behavior: weight}, 'streams': {pattern: spec}} for a built-in name or a JSON file"""
+    _name = f"{scenario}".strip()
+    if _name in SCENARIOS:
+        return {'mix': dict(SCENARIOS[_name]), 'streams': {}}
+    if not os.path.isfile(_name):
+        raise Exception(f"unknown scenario '{_name}', choice of {list(SCENARIOS)} or a JSON file")
+    with open(_name, 'r') as _fd:
+        _spec = json.load(_fd)
+    _mix = _spec.get('mix', SCENARIOS['noise'])
+    _mix = dict(SCENARIOS[_mix]) if isinstance(_mix, str) and _mix in SCENARIOS else _mix
+    _streams = {_k: ({'behavior': _v} if isinstance(_v, str) else dict(_v)) for _k, _v in _spec.get('streams', {}).items()}
+    for _s in [_mix] + [{_v.get('behavior', ''): 1.0} for _v in _streams.values()]:
+        for _b in _s:
+            if _b not in SCENARIO_BEHAVIORS:
+                raise Exception(f"unknown behavior '{_b}' in {_name}, choice of {SCENARIO_BEHAVIORS}")
+    return {'mix': _mix, 'streams': _streams}
+
+
+# +
+# class: ScenarioEngine()
+# use: se = ScenarioEngine(registry=reg, seed=42, scenario='faults', dt=2.0)
+#      _batch = se.tick()
+# -
+class ScenarioEngine(object):
+    """generates reproducible per-stream simulated updates, including out-of-range excursions and dropouts"""
+
+    # +
+    # (hidden) method: __init__()
+    # -
+    def __init__(self, registry: CompiledRegistry = None, seed: int = DEFAULT_SEED, scenario: Any = DEFAULT_SCENARIO,
+                 dt: float = 1.0, log: logging.Logger = None) -> None:
+
+        # get argument(s)
+        self.__registry = registry if registry is not None else CompiledRegistry()
+        self.__seed = int(seed)
+        self.__spec = scenario if isinstance(scenario, dict) else load_scenario(scenario)
+        self.__dt = dt if dt > 0.0 else 1.0
+        self.__log = log
+
+        # every draw below comes from this generator, in a fixed order, so a seed replays exactly
+        _n, _reg = self.__registry.nelms, self.__registry
+        self.__rng = np.random.default_rng(self.__seed)
+        _mix = self.__spec['mix']
+        _p = np.array([float(_mix.get(_b, 0.0)) for _b in SCENARIO_BEHAVIORS])
+        self.__behaviors = self.__rng.choice(len(SCENARIO_BEHAVIORS), size=_n, p=_p / _p.sum())
+
+        # per-stream parameter(s), time(s) in scenario seconds and level(s) as a fraction of the range
+        self.__start = self.__rng.uniform(10.0, 120.0, _n)
+        self.__duration = self.__rng.uniform(5.0, 30.0, _n)
+        self.__period = self.__rng.uniform(30.0, 300.0, _n)
+        self.__phase = self.__rng.uniform(0.0, 2.0 * math.pi, _n)
+        self.__amplitude = self.__rng.uniform(0.1, 0.4, _n)
+        self.__level = self.__rng.uniform(0.1, 0.9, _n)
+        self.__side = self.__rng.choice([-1.0, 1.0], _n)
+        self.__excess = self.__rng.uniform(0.05, 0.3, _n)
+        self.__center = self.__rng.uniform(0.3, 0.7, _n)
+        _outage = self.__rng.uniform(2.0, 3.0, _n) * DEFAULT_STALE_TIMEOUT
+        _timed = np.zeros(_n, dtype=bool)
+
+        # scripted stream(s) override the mix, first matching pattern wins
+        for _i, _k in enumerate(_reg.keys):
+            for _pattern, _s in self.__spec['streams'].items():
+                if fnmatch.fnmatchcase(_k, _pattern):
+                    self.__behaviors[_i] = SCENARIO_BEHAVIORS.index(_s.get('behavior', 'noise'))
+                    for _name in SCENARIO_PARAMETERS:
+                        if _name == 'side' and _name in _s:
+                            self.__side[_i] = -1.0 if f"{_s[_name]}".lower() in ('cold', '-1') else 1.0
+                        elif _name in _s:
+                            getattr(self, f"_ScenarioEngine__{_name}")[_i] = float(_s[_name])
+                    _timed[_i] = 'duration' in _s
+                    break
+
+        # a dropout lasts long enough to go stale, unless scripted otherwise, and a sinusoid stays inside its range
+        _dropout = (self.__behaviors == SCENARIO_BEHAVIORS.index('dropout')) & ~_timed
+        self.__duration[_dropout] = _outage[_dropout]
+        self.__amplitude = np.minimum(self.__amplitude, 0.95 * np.minimum(self.__center, 1.0 - self.__center))
+
+        # current value(s), as a fraction of the range for ranged stream(s) or a choice index otherwise
+        self.__value = self.__center.copy()
+        self.__choice = np.zeros(_n, dtype=np.intp)
+        self.__texts = {_i: self.__text__(_i) for _i in range(_n) if not _reg.ranged[_i] and _i not in _reg.choices}
+
+        # clock stream(s) follow scenario time from the moment the scenario starts
+        self.__clocks = {_i: _reg.data[_reg.keys[_i]]['simval'] for _i, _v in self.__texts.items() if _v is None}
+        self.__epoch = datetime.now(timezone.utc)
+        self.__tick = 0
+
+    # +
+    # variable getter(s)
+    # -
+    @property
+    def behaviors(self) -> dict:
+        """returns {behavior: count}"""
+        _counts = np.bincount(self.__behaviors, minlength=len(SCENARIO_BEHAVIORS))
+        return {_b: int(_c) for _b, _c in zip(SCENARIO_BEHAVIORS, _counts) if _c > 0}
+
+    @property
+    def elapsed(self) -> float:
+        return float(self.__tick * self.__dt)
+
+    @property
+    def seed(self) -> int:
+        return int(self.__seed)
+
+    @property
+    def ticks(self) -> int:
+        return int(self.__tick)
+
+    # +
+    # (hidden) method: __text__()
+    # -
+    def __text__(self, index: int = 0) -> Any:
+        _simval = self.__registry.data[self.__registry.keys[index]].get('simval', '')
+        _range = self.__registry.data[self.__registry.keys[index]].get('datarange', '')
+        if isinstance(_simval, str):
+            return _simval
+        elif callable(_simval) and _range not in FILETYPES:
+            return None
+        _hex = ''.join(f"{_:x}" for _ in self.__rng.integers(0, 16, 10))
+        return f"{_hex}{_range}" if _range in FILETYPES else _hex
+
+    # +
+    # method: behavior()
+    # -
+    def behavior(self, key: str = '') -> str:
+        _i = self.__registry.index.get(key, -1)
+        return SCENARIO_BEHAVIORS[self.__behaviors[_i]] if _i >= 0 else ''
+
+    # +
+    # method: tick()
+    # -
+    def tick(self) -> dict:
+        """advances scenario time by dt and returns {key: value} for every stream that updates"""
+        _reg, _b, _rng = self.__registry, self.__behaviors, self.__rng
+        _t = self.__tick * self.__dt
+        self.__tick += 1
+        _is = {_name: _b == _j for _j, _name in enumerate(SCENARIO_BEHAVIORS)}
+        _after = _t >= self.__start
+        _during = _after & (_t < self.__start + self.__duration)
+
+        # range fraction(s): a reflected random walk underlies walk, excursion and dropout
+        _noise = _rng.random(_reg.nelms)
+        _step = _rng.normal(0.0, WALK_SIGMA * math.sqrt(self.__dt), _reg.nelms)
+        _walk = np.abs(self.__value + _step)
+        _walk = np.where(_walk > 1.0, 2.0 - _walk, _walk).clip(0.0, 1.0)
+        _sine = self.__center + self.__amplitude * np.sin(2.0 * math.pi * _t / self.__period + self.__phase)
+        _value = np.select(
+            [_is['noise'], _is['walk'] | _is['dropout'], _is['sinusoid'], _is['step'], _is['excursion'], _is['stuck']],
+            [_noise, _walk, _sine, np.where(_after, self.__level, self.__center), _walk,
+             np.where(_after, self.__value, _walk)])
+        self.__value = _value
+        _value = np.where(_is['excursion'] & _during,
+                          np.where(self.__side > 0.0, 1.0 + self.__excess, -self.__excess), _value)
+        _scaled = _reg.lo + (_reg.hi - _reg.lo) * _value
+
+        # choice(s) only switch at random or step once, excursion(s) send a value outside the list
+        _draw = _rng.integers(0, np.iinfo(np.int32).max, _reg.nelms)
+        _stay = (_is['stuck'] & _after) | (_is['step'] & ~_after)
+        self.__choice = np.where(_stay, self.__choice, _draw)
+
+        # dropout(s) are simply absent from the batch
+        _send = ~(_is['dropout'] & _during)
+        SIM_CLOCK.tick(now=self.__epoch + timedelta(seconds=_t))
+        _batch = {}
+        for _i in np.flatnonzero(_send).tolist():
+            _k = _reg.keys[_i]
+            if _reg.ranged[_i]:
+                _batch[_k] = int(_scaled[_i]) if 'int' in _reg.datatypes[_i] else float(_scaled[_i])
+            elif _i in _reg.choices:
+                _choices = _reg.choices[_i]
+                _excursion = _is['excursion'][_i] and _during[_i]
+                _batch[_k] = EXCURSION_VALUE if _excursion else _choices[self.__choice[_i] % len(_choices)]
+            elif _i in self.__clocks:
+                _batch[_k] = self.__clocks[_i]()
+            else:
+                _batch[_k] = self.__texts[_i]
+        return _batch
+
+    # +
+    # method: report()
+    # -
+    def report(self) -> str:
+        return f"scenario (seed={self.__seed}, t={self.elapsed:.1f}s, {self.__tick} ticks): {self.behaviors}"
+
+
+# +
+# main()
+# -
+if __name__ == '__main__':
+
+    from maps_indi import TAB_DATA
+
+    # get command line argument(s)
+    _p = argparse.ArgumentParser(description='maps simulation scenario', formatter_class=argparse.RawTextHelpFormatter)
+    _p.add_argument('--module', default='Time', help=f"""Module [%(default)s], choice of {list(TAB_DATA)}""")
+    _p.add_argument('--scenario', default=DEFAULT_SCENARIO, help=f"""Scenario [%(default)s], choice of {list(SCENARIOS)} or a JSON file""")
+    _p.add_argument('--seed', default=DEFAULT_SEED, help=f"""Random seed [%(default)s]""")
+    _p.add_argument('--dt', default=1.0, help=f"""Seconds per tick [%(default)s]""")
+    _p.add_argument('--ticks', default=10, help=f"""Number of tick(s) to print [%(default)s]""")
+    _a = _p.parse_args()
+
+    _se = ScenarioEngine(registry=CompiledRegistry(data=TAB_DATA[_a.module.strip()]), seed=int(_a.seed),
+                         scenario=_a.scenario.strip(), dt=float(_a.dt))
+    for _ in range(int(_a.ticks)):
+        _batch = _se.tick()
+        print(f"t={_se.elapsed:8.1f}s {len(_batch):5d} update(s) {json.dumps(_batch)[:120]}")
+    print(_se.report())
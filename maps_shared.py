@@ -0,0 +1,706 @@
+#!/usr/bin/env python3
+
+
+# +
+# import(s)
+# -
+from pnd import CustomException
+from pnd import DEFAULT_HOST
+from pnd import DEFAULT_PORT
+from pnd import get_logger
+from maps_connection import IndiConnectionPool
+from maps_connection import POLL_TIMEOUT
+from maps_connection import parse_routes
+from maps_ingest import DEFAULT_INGEST_SIZE
+from maps_ingest import INGEST_POLICIES
+from maps_registry import CompiledRegistry
+from maps_registry import coerce_value
+from maps_scenario import SCENARIOS
+from maps_scenario import ScenarioEngine
+from maps_synthetic import DEFAULT_SEED
+
+from multiprocessing import resource_tracker
+from multiprocessing import shared_memory
+from typing import Any
+
+import argparse
+import hashlib
+import json
+import logging
+import math
+import os
+import signal
+import threading
+import time
+
+import numpy as np
+
+
+# +
+# constant(s)
+# -
+__doc__ = """python3 maps_shared.py --help"""
+HEAD_MAGIC, HEAD_VERSION, HEAD_NELMS, HEAD_TEXT, HEAD_LAYOUT, HEAD_SEQUENCE, HEAD_STATUS, HEAD_PID = range(8)
+KIND_NONE, KIND_FLOAT, KIND_INT, KIND_BOOL, KIND_TEXT = range(5)
+SHARED_MAGIC = 0x4d415053
+SHARED_POLL = 0.05
+SHARED_RETRY = 2.0
+SHARED_STATUS_BYTES = 4096
+SHARED_TEXT_BYTES = 128
+SHARED_TIMEOUT = 5.0
+SHARED_VERSION = 1
+
+
+# +
+# variable(s): the table(s) this process created, whose resource tracker entry belongs to their writer
+# -
+_CREATED = set()
+
+
+# +
+# function: shared_name()
+# -
+def shared_name(module: str = '') -> str:
+    """returns the default shared memory name for a module's table"""
+    return f"maps_{module.strip()}"
+
+
+# +
+# function: layout_hash()
+# -
+def layout_hash(registry: CompiledRegistry = None) -> int:
+    """returns a signed 64-bit hash of the stream key(s) and datatype(s), so writer and reader agree on slot(s)"""
+    _text = '\n'.join(f"{_k}:{_d}" for _k, _d in zip(registry.keys, registry.datatypes))
+    return int.from_bytes(hashlib.sha1(_text.encode('utf-8')).digest()[:8], 'little', signed=True)
+
+
+# +
+# function: _untrack()
+# -
+def _untrack(shm: shared_memory.SharedMemory = None) -> None:
+    """stops the resource tracker unlinking a table we only attached to, but not one this process created since
+       the tracker keeps one entry per name and the writer's unlink() must still find it"""
+    if shm.name not in _CREATED:
+        # noinspection PyProtectedMember
+        resource_tracker.unregister(shm._name, 'shared_memory')
+
+
+# +
+# class: SharedTable()
+# use: st = SharedTable(registry=reg, name='maps_Time', create=True)
+#      st.publish({'Time.Now.JD': 2460000.5})
+#      ro = SharedTable(registry=reg, name='maps_Time')
+#      _batch = ro.read()
+# -
+class SharedTable(object):
+    """the latest value of every registry stream in a fixed shared memory layout, one writer and many readers"""
+
+    # +
+    # (hidden) method: __init__()
+    # -
+    def __init__(self, registry: CompiledRegistry = None, name: str = '', create: bool = False,
+                 text_bytes: int = SHARED_TEXT_BYTES, log: logging.Logger = None) -> None:
+
+        # get argument(s)
+        self.__registry = registry if registry is not None else CompiledRegistry()
+        self.__name = name.strip() if name.strip() != '' else shared_name('all')
+        self.__create = create
+        self.__text_bytes = text_bytes if text_bytes > 0 else SHARED_TEXT_BYTES
+        self.__log = log
+
+        # create, replacing a table left by a collector that died, or attach
+        _n, _layout = self.__registry.nelms, layout_hash(self.__registry)
+        if self.__create:
+            self.__shm = self.__create__(_n)
+        else:
+            self.__shm = self.__attach__()
+        self.__views__()
+
+        # a new table is stamped with its layout, an attached one must match ours
+        if self.__create:
+            self.__head[:] = [SHARED_MAGIC, SHARED_VERSION, _n, self.__text_bytes, _layout, 0, 0, os.getpid()]
+            self.__beat[:] = time.time()
+        elif self.__head[HEAD_MAGIC] != SHARED_MAGIC or self.__head[HEAD_VERSION] != SHARED_VERSION or \
+                self.__head[HEAD_NELMS] != _n or self.__head[HEAD_LAYOUT] != _layout:
+            self.close()
+            raise CustomException(errnum=-2, extra=f"shared table '{self.__name}' does not match this registry")
+
+        # reader state: the slot sequence(s) already delivered
+        self.__seen = np.zeros(_n, dtype=np.uint64)
+        self.__sequence = -1
+
+    # +
+    # variable getter(s)
+    # -
+    @property
+    def alive(self) -> bool:
+        return self.__shm is not None and time.time() - float(self.__beat[0]) < SHARED_TIMEOUT
+
+    @property
+    def heartbeat(self) -> float:
+        return float(self.__beat[0]) if self.__shm is not None else math.nan
+
+    @property
+    def name(self) -> str:
+        return f"{self.__name}"
+
+    @property
+    def nelms(self) -> int:
+        return int(self.__registry.nelms)
+
+    @property
+    def pending(self) -> int:
+        """returns the number of slot(s) updated since they were last read"""
+        return int(np.count_nonzero(self.__seq != self.__seen)) if self.__shm is not None else 0
+
+    @property
+    def pid(self) -> int:
+        return int(self.__head[HEAD_PID]) if self.__shm is not None else 0
+
+    @property
+    def sequence(self) -> int:
+        return int(self.__head[HEAD_SEQUENCE]) if self.__shm is not None else 0
+
+    @property
+    def size(self) -> int:
+        return int(self.__shm.size) if self.__shm is not None else 0
+
+    # +
+    # (hidden) method: __layout__()
+    # -
+    def __layout__(self, nelms: int = 0) -> tuple:
+        """returns [(name, dtype, count, offset)] and the total size, every block 8-byte aligned"""
+        _blocks, _offset = [], 0
+        for _name, _dtype, _count in [('head', np.int64, 8), ('beat', np.float64, 2),
+                                      ('status', np.uint8, SHARED_STATUS_BYTES), ('seq', np.uint64, nelms),
+                                      ('received', np.float64, nelms), ('wire', np.float64, nelms),
+                                      ('number', np.float64, nelms), ('kind', np.uint8, nelms),
+                                      ('text', np.dtype(f"S{self.__text_bytes}"), nelms)]:
+            _blocks.append((_name, _dtype, _count, _offset))
+            _offset += -(-(np.dtype(_dtype).itemsize * max(_count, 1)) // 8) * 8
+        return _blocks, _offset
+
+    # +
+    # (hidden) method: __views__()
+    # -
+    def __views__(self) -> None:
+        """maps numpy array(s) straight onto the shared buffer, read-only for a reader"""
+        _blocks, _ = self.__layout__(self.__registry.nelms)
+        for _name, _dtype, _count, _offset in _blocks:
+            _view = np.ndarray((_count,), dtype=_dtype, buffer=self.__shm.buf, offset=_offset)
+            if not self.__create:
+                _view.flags.writeable = False
+            setattr(self, f"_SharedTable__{_name}", _view)
+
+    # +
+    # (hidden) method: __attach__()
+    # -
+    def __attach__(self) -> shared_memory.SharedMemory:
+        try:
+            _shm = shared_memory.SharedMemory(name=self.__name, create=False)
+        except FileNotFoundError:
+            raise CustomException(errnum=-1, extra=f"no shared table '{self.__name}', is maps_shared.py running?")
+
+        # a reader must not unlink the table when it exits, which the resource tracker would otherwise do
+        _untrack(_shm)
+        _text = int(np.ndarray((8,), dtype=np.int64, buffer=_shm.buf)[HEAD_TEXT])
+        self.__text_bytes = _text if _text > 0 else SHARED_TEXT_BYTES
+        return _shm
+
+    # +
+    # (hidden) method: __create__()
+    # -
+    def __create__(self, nelms: int = 0) -> shared_memory.SharedMemory:
+        _, _size = self.__layout__(nelms)
+        try:
+            _shm = shared_memory.SharedMemory(name=self.__name, create=True, size=_size)
+            _CREATED.add(_shm.name)
+            return _shm
+        except FileExistsError:
+            pass
+
+        # only replace a table whose collector has stopped beating
+        _old = shared_memory.SharedMemory(name=self.__name, create=False)
+        _beat = float(np.ndarray((2,), dtype=np.float64, buffer=_old.buf, offset=64)[0]) if _old.size >= 80 else 0.0
+        if time.time() - _beat < SHARED_TIMEOUT:
+            _untrack(_old)
+            _old.close()
+            raise CustomException(errnum=-1, extra=f"shared table '{self.__name}' is in use by a running collector")
+        if self.__log:
+            self.__log.warning(f"replacing stale shared table '{self.__name}'")
+        _old.close()
+        _old.unlink()
+        _shm = shared_memory.SharedMemory(name=self.__name, create=True, size=_size)
+        _CREATED.add(_shm.name)
+        return _shm
+
+    # +
+    # (hidden) method: __encode__()
+    # -
+    def __encode__(self, value: Any = None, datatype: str = '') -> tuple:
+        """returns (kind, number, text) for a value, numbers go in the number slot and everything else as text"""
+        _value = coerce_value(value, datatype)
+        if isinstance(_value, bool):
+            return KIND_BOOL, float(_value), b''
+        elif isinstance(_value, int):
+            return KIND_INT, float(_value), b''
+        elif isinstance(_value, float):
+            return KIND_FLOAT, _value, b''
+        return KIND_TEXT, math.nan, f"{_value}".encode('utf-8')[:self.__text_bytes]
+
+    # +
+    # method: publish()
+    # -
+    def publish(self, batch: dict = None, stamps: dict = None) -> int:
+        """writes {key: value} into their slot(s), each guarded by an odd/even sequence, and returns the count"""
+        _keys = [_k for _k in (batch or {}) if _k in self.__registry.index]
+        if not _keys or self.__shm is None:
+            return 0
+        _idx = self.__registry.indices(_keys)
+        _now, _stamps = time.time(), stamps or {}
+        _encoded = [self.__encode__(batch[_k], self.__registry.datatypes[_i]) for _k, _i in zip(_keys, _idx.tolist())]
+        _times = [_stamps.get(_k, (_now, math.nan)) for _k in _keys]
+
+        # odd while writing, even when done: a reader that sees an odd or changed sequence reads the slot again
+        self.__seq[_idx] += 1
+        self.__kind[_idx] = [_e[0] for _e in _encoded]
+        self.__number[_idx] = [_e[1] for _e in _encoded]
+        self.__text[_idx] = [_e[2] for _e in _encoded]
+        self.__received[_idx] = [_t[0] for _t in _times]
+        self.__wire[_idx] = [_t[1] for _t in _times]
+        self.__seq[_idx] += 1
+        self.__head[HEAD_SEQUENCE] += 1
+        return len(_keys)
+
+    # +
+    # method: beat()
+    # -
+    def beat(self, alive: bool = True) -> None:
+        """stamps the heartbeat, or clears it so reader(s) see a stopped writer straight away"""
+        if self.__shm is not None:
+            self.__beat[0] = time.time() if alive else 0.0
+
+    # +
+    # method: set_status()
+    # -
+    def set_status(self, status: dict = None) -> None:
+        """writes the collector's {state, message, stale_devices} as JSON"""
+        _text = json.dumps(status or {}, default=lambda _o: sorted(_o) if isinstance(_o, set) else f"{_o}")
+        _bytes = _text.encode('utf-8')[:SHARED_STATUS_BYTES - 4]
+        self.__head[HEAD_STATUS] += 1
+        self.__status[:4] = np.frombuffer(len(_bytes).to_bytes(4, 'little'), dtype=np.uint8)
+        self.__status[4:4 + len(_bytes)] = np.frombuffer(_bytes, dtype=np.uint8)
+        self.__head[HEAD_STATUS] += 1
+
+    # +
+    # method: get_status()
+    # -
+    # noinspection PyBroadException
+    def get_status(self) -> tuple:
+        """returns (status sequence, {state, message, stale_devices}) or (-1, {}) if it was being written"""
+        _seq = int(self.__head[HEAD_STATUS])
+        if self.__shm is None or _seq % 2 == 1:
+            return -1, {}
+        _len = int.from_bytes(self.__status[:4].tobytes(), 'little')
+        _bytes = self.__status[4:4 + _len].tobytes()
+        if int(self.__head[HEAD_STATUS]) != _seq:
+            return -1, {}
+        try:
+            return _seq, json.loads(_bytes.decode('utf-8')) if _len > 0 else {}
+        except:
+            return -1, {}
+
+    # +
+    # method: read()
+    # -
+    def read(self, limit: int = 0, stamps: dict = None) -> dict:
+        """returns {key: value} for every slot updated since the last read, torn slot(s) wait for the next one"""
+        if self.__shm is None or int(self.__head[HEAD_SEQUENCE]) == self.__sequence:
+            return {}
+        _sequence = int(self.__head[HEAD_SEQUENCE])
+        _seq = self.__seq.copy()
+        _idx = np.flatnonzero((_seq != self.__seen) & (_seq % 2 == 0))
+        if 0 < limit < _idx.size:
+            _idx = _idx[:limit]
+
+        # copy only the changed row(s), then keep those whose sequence did not move while we copied
+        _kind, _number, _text = self.__kind[_idx], self.__number[_idx], self.__text[_idx]
+        _received, _wire = self.__received[_idx], self.__wire[_idx]
+        _ok = self.__seq[_idx] == _seq[_idx]
+        self.__seen[_idx[_ok]] = _seq[_idx[_ok]]
+        if np.count_nonzero(_seq != self.__seen) == 0:
+            self.__sequence = _sequence
+
+        _keys, _batch = self.__registry.keys, {}
+        for _i, _k, _n, _t, _r, _w, _g in zip(_idx.tolist(), _kind.tolist(), _number.tolist(), _text.tolist(),
+                                               _received.tolist(), _wire.tolist(), _ok.tolist()):
+            if not _g or _k == KIND_NONE:
+                continue
+            if _k == KIND_FLOAT:
+                _batch[_keys[_i]] = _n
+            elif _k == KIND_INT:
+                _batch[_keys[_i]] = int(_n)
+            elif _k == KIND_BOOL:
+                _batch[_keys[_i]] = bool(_n)
+            else:
+                _batch[_keys[_i]] = _t.decode('utf-8', errors='ignore')
+            if stamps is not None:
+                stamps[_keys[_i]] = (_r, _w)
+        return _batch
+
+    # +
+    # method: close()
+    # -
+    def close(self) -> None:
+        """drops the view(s) and closes the table, the writer also removes it"""
+        if self.__shm is None:
+            return
+        _blocks, _ = self.__layout__(self.__registry.nelms)
+        for _name, _, _, _ in _blocks:
+            setattr(self, f"_SharedTable__{_name}", None)
+        self.__shm.close()
+        if self.__create:
+            self.__shm.unlink()
+            _CREATED.discard(self.__shm.name)
+        self.__shm = None
+
+    # +
+    # method: report()
+    # -
+    def report(self) -> str:
+        return f"shared table '{self.__name}' ({self.nelms} streams, {self.size} bytes, " \
+               f"{'writer' if self.__create else 'reader'}): sequence={self.sequence}, pending={self.pending}"
+
+
+# +
+# class: SharedCollector()
+# use: sc = SharedCollector(module='Time', host='localhost', port=7624, log=log)
+#      sc.start()
+#      sc.stop()
+# -
+class SharedCollector(object):
+    """owns the indi connection(s), or a simulation scenario, and publishes every update into a SharedTable"""
+
+    # +
+    # (hidden) method: __init__()
+    # -
+    def __init__(self, module: str = 'all', name: str = '', host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 routes: dict = None, scenario: str = '', seed: int = DEFAULT_SEED, delay: float = 1.0,
+                 text_bytes: int = SHARED_TEXT_BYTES, log: logging.Logger = None,
+                 maxsize: int = DEFAULT_INGEST_SIZE, policy: str = INGEST_POLICIES[0]) -> None:
+
+        # get argument(s)
+        from maps_indi import TAB_DATA
+        if module not in TAB_DATA:
+            raise CustomException(errnum=-2, extra=f"unknown module '{module}', choice of {list(TAB_DATA)}")
+        self.__module = module
+        self.__registry = CompiledRegistry(data=TAB_DATA[module])
+        self.__delay = delay if delay > 0.0 else 1.0
+        self.__log = log
+
+        # the one table every gui attaches to
+        self.__table = SharedTable(registry=self.__registry, name=name or shared_name(module), create=True,
+                                   text_bytes=text_bytes, log=log)
+
+        # a scenario stands in for the indiserver(s), otherwise one pool subscribes to every stream once
+        self.__engine, self.__pool = None, None
+        if scenario.strip() != '':
+            self.__engine = ScenarioEngine(registry=self.__registry, seed=seed, scenario=scenario.strip(),
+                                           dt=self.__delay, log=log)
+        else:
+            _streams = sorted(set(f"{_k.split('.')[0]}.{_k.split('.')[1]}" for _k in self.__registry.keys))
+            self.__pool = IndiConnectionPool(host=host, port=port, streams=_streams, routes=routes, log=log,
+                                             maxsize=maxsize, policy=policy)
+
+        # initialize variable(s)
+        self.__generation = -1
+        self.__published = 0
+        self.__stop = threading.Event()
+        self.__thread = None
+
+    # +
+    # variable getter(s)
+    # -
+    @property
+    def published(self) -> int:
+        return int(self.__published)
+
+    @property
+    def running(self) -> bool:
+        return self.__thread is not None and self.__thread.is_alive()
+
+    @property
+    def table(self) -> SharedTable:
+        return self.__table
+
+    # +
+    # (hidden) method: __status__()
+    # -
+    def __status__(self) -> None:
+        """republishes the connection state whenever it changes"""
+        if self.__engine is not None:
+            if self.__generation < 0:
+                self.__generation = 0
+                self.__table.set_status({'state': 'connected', 'stale_devices': [],
+                                         'message': f"collector simulating {self.__engine.report()}"})
+            return
+        if self.__pool.generation != self.__generation:
+            self.__generation = self.__pool.generation
+            self.__table.set_status({'state': self.__pool.state, 'stale_devices': self.__pool.stale_devices,
+                                     'message': f"collector: {self.__pool.message}"})
+
+    # +
+    # (hidden) method: __run__()
+    # -
+    def __run__(self) -> None:
+        _next = time.monotonic()
+        while not self.__stop.is_set():
+            if self.__engine is not None:
+                if time.monotonic() >= _next:
+                    _next += self.__delay
+                    self.__published += self.__table.publish(self.__engine.tick())
+            else:
+                _stamps = {}
+                _batch = self.__pool.drain(stamps=_stamps)
+                if _batch:
+                    self.__published += self.__table.publish(_batch, stamps=_stamps)
+            self.__status__()
+            self.__table.beat()
+            self.__stop.wait(SHARED_POLL)
+
+    # +
+    # method: start()
+    # -
+    def start(self) -> None:
+        if self.running:
+            return
+        if self.__pool is not None:
+            self.__pool.start()
+        self.__stop.clear()
+        self.__thread = threading.Thread(target=self.__run__, name='SharedCollector', daemon=True)
+        self.__thread.start()
+        if self.__log:
+            self.__log.info(f"collector started, {self.__table.report()}")
+
+    # +
+    # method: stop()
+    # -
+    def stop(self) -> None:
+        self.__stop.set()
+        if self.__thread is not None:
+            self.__thread.join(timeout=SHARED_TIMEOUT)
+        self.__thread = None
+        if self.__pool is not None:
+            self.__pool.stop()
+            self.__pool.join(timeout=SHARED_TIMEOUT)
+
+        # tell reader(s) now, rather than leave them to notice the heartbeat has timed out
+        self.__table.set_status({'state': 'stopped', 'stale_devices': sorted(set(self.__registry.devices.tolist())),
+                                 'message': f"collector for '{self.__module}' stopped"})
+        self.__table.beat(alive=False)
+        if self.__log:
+            self.__log.info(f"collector stopped, {self.report()}")
+        self.__table.close()
+
+    # +
+    # method: report()
+    # -
+    def report(self) -> str:
+        return f"collector for '{self.__module}': published={self.__published}, {self.__table.report()}"
+
+
+# +
+# class: SharedFeed()
+# use: sf = SharedFeed(registry=reg, name='maps_Time', log=log)
+#      sf.start()
+#      _batch = sf.drain(stamps=_stamps)
+# -
+# noinspection PyBroadException
+class SharedFeed(object):
+    """attaches read-only to a collector's SharedTable and stands in for an IndiConnectionPool in a gui"""
+
+    # +
+    # (hidden) method: __init__()
+    # -
+    def __init__(self, registry: CompiledRegistry = None, name: str = '', log: logging.Logger = None) -> None:
+
+        # get argument(s)
+        self.__registry = registry if registry is not None else CompiledRegistry()
+        self.__name = name.strip() if name.strip() != '' else shared_name('all')
+        self.__log = log
+
+        # initialize variable(s)
+        self.__table = None
+        self.__attempt = -math.inf
+        self.__status = -1
+        self.__alive = False
+        self.__generation = 0
+        self.__message = ''
+        self.__stale_devices = set()
+        self.__state = 'disconnected'
+
+    # +
+    # variable getter(s)
+    # -
+    @property
+    def connected(self) -> bool:
+        return self.state == 'connected'
+
+    @property
+    def connections(self) -> dict:
+        return {}
+
+    @property
+    def depth(self) -> int:
+        return self.__table.pending if self.__table is not None else 0
+
+    @property
+    def feed(self) -> None:
+        return None
+
+    @property
+    def generation(self) -> int:
+        self.__refresh__()
+        return int(self.__generation)
+
+    @property
+    def message(self) -> str:
+        return f"{self.__message}"
+
+    @property
+    def running(self) -> bool:
+        return self.__table is not None
+
+    @property
+    def stale(self) -> bool:
+        return self.__state != 'connected'
+
+    @property
+    def stale_devices(self) -> set:
+        return set(self.__stale_devices)
+
+    @property
+    def state(self) -> str:
+        return f"{self.__state}"
+
+    # +
+    # (hidden) method: __set__()
+    # -
+    def __set__(self, state: str = '', message: str = '', stale_devices: Any = None) -> None:
+        _stale = set(stale_devices or [])
+        if (state, message, _stale) != (self.__state, self.__message, self.__stale_devices):
+            self.__state, self.__message, self.__stale_devices = state, message, _stale
+            self.__generation += 1
+            if self.__log:
+                self.__log.info(f"shared table '{self.__name}': {message}")
+
+    # +
+    # (hidden) method: __attach__()
+    # -
+    def __attach__(self) -> None:
+        """attaches to the table, at most every SHARED_RETRY second(s)"""
+        if self.__table is not None or time.monotonic() - self.__attempt < SHARED_RETRY:
+            return
+        self.__attempt = time.monotonic()
+        try:
+            self.__table = SharedTable(registry=self.__registry, name=self.__name, log=self.__log)
+            self.__status, self.__alive = -1, False
+        except Exception as _:
+            self.__set__('disconnected', f"{_}", self.__registry.devices.tolist())
+
+    # +
+    # (hidden) method: __refresh__()
+    # -
+    def __refresh__(self) -> None:
+        """follows the collector's status, and detaches from a table whose collector has stopped or stopped beating"""
+        self.__attach__()
+        if self.__table is None:
+            return
+        _alive = self.__table.alive
+        if not _alive:
+            _, _status = self.__table.get_status()
+            self.__table.close()
+            self.__table = None
+            if _status.get('state', '') == 'stopped':
+                self.__set__('stopped', _status.get('message', ''), self.__registry.devices.tolist())
+            else:
+                self.__set__('disconnected', f"collector for '{self.__name}' is not running",
+                             self.__registry.devices.tolist())
+            return
+        _seq, _status = self.__table.get_status()
+        if _seq >= 0 and (_seq != self.__status or not self.__alive):
+            self.__status, self.__alive = _seq, True
+            self.__set__(_status.get('state', 'connected'), _status.get('message', ''),
+                         _status.get('stale_devices', []))
+
+    # +
+    # method: start()
+    # -
+    def start(self) -> None:
+        self.__attempt = -math.inf
+        self.__refresh__()
+
+    # +
+    # method: stop()
+    # -
+    def stop(self) -> None:
+        if self.__table is not None:
+            self.__table.close()
+        self.__table = None
+        self.__set__('stopped', f"detached from shared table '{self.__name}'")
+
+    # +
+    # method: drain()
+    # -
+    def drain(self, limit: int = 0, stamps: dict = None) -> dict:
+        """returns every stream updated since the last drain, read straight from shared memory"""
+        self.__attach__()
+        return self.__table.read(limit=limit, stamps=stamps) if self.__table is not None else {}
+
+    # +
+    # method: set_indi()
+    # -
+    def set_indi(self, title: str = '', value=None, timeout: float = POLL_TIMEOUT) -> None:
+        raise CustomException(errnum=-1, extra=f"shared table '{self.__name}' is read-only, cannot set '{title}'")
+
+    # +
+    # method: report()
+    # -
+    def report(self) -> str:
+        return self.__table.report() if self.__table is not None else f"shared table '{self.__name}' not attached"
+
+
+# +
+# main()
+# -
+if __name__ == '__main__':
+
+    from maps_indi import TAB_DATA
+
+    # get command line argument(s)
+    _p = argparse.ArgumentParser(description='maps shared memory collector', formatter_class=argparse.RawTextHelpFormatter)
+    _p.add_argument('--host', default=DEFAULT_HOST, help="""Host ['%(default)s']""")
+    _p.add_argument('--port', default=DEFAULT_PORT, help="""Port [%(default)s]""")
+    _p.add_argument('--module', default='all', help=f"""Module [%(default)s], choice of {list(TAB_DATA)}""")
+    _p.add_argument('--name', default='', help=f"""Shared memory name [%(default)s], empty for maps_<module>""")
+    _p.add_argument('--routes', default='', help=f"""Device routes [%(default)s], e.g. Time=host1:7624,tcs=host2:7625""")
+    _p.add_argument('--text-bytes', default=SHARED_TEXT_BYTES, help=f"""Bytes per text value [%(default)s]""")
+    _p.add_argument('--scenario', default='', help=f"""Publish a simulation scenario instead [%(default)s], choice of {list(SCENARIOS)} or a JSON file""")
+    _p.add_argument('--seed', default=DEFAULT_SEED, help=f"""Random seed for simulation [%(default)s]""")
+    _p.add_argument('--delay', default=1000, help=f"""Scenario tick (ms) [%(default)s]""")
+    _a = _p.parse_args()
+
+    _log = get_logger(name='maps_shared', level='INFO')
+    _sc = SharedCollector(module=_a.module.strip(), name=_a.name.strip(), host=_a.host.strip(), port=int(_a.port),
+                          routes=parse_routes(_a.routes, host=_a.host.strip(), port=int(_a.port)),
+                          scenario=_a.scenario.strip(), seed=int(_a.seed), delay=int(_a.delay) / 1000.0,
+                          text_bytes=int(_a.text_bytes), log=_log)
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    _sc.start()
+    try:
+        while _sc.running:
+            time.sleep(SHARED_TIMEOUT)
+            _log.info(_sc.report())
+    except KeyboardInterrupt:
+        pass
+    _sc.stop()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+
+
+# +
+# import(s)
+# -
+from maps_indi import DEGREE
+from maps_indi import FILETYPES
+from maps_indi import HEADERS
+from maps_indi import OPTIONAL_HEADERS
+from maps_indi import TAB_DATA
+from maps_indi import TAB_NAMES
+from maps_indi import color_print
+from maps_indi import get_hash
+
+import argparse
+import math
+import random
+
+
+# +
+# constant(s)
+# -
+__doc__ = """python3 maps_synthetic.py --help"""
+DEFAULT_NELMS = 4170
+DEFAULT_SEED = 0
+DM_ACTUATORS = 336
+DM_FIELDS = {'ActuatorPosition': ('float', (-5000.0, 5000.0), 'nm'),
+             'ActuatorCoil': ('float', (-1.0, 1.0), ''),
+             'ActuatorCurrent': ('float', (-2.0, 2.0), 'A'),
+             'ActuatorEnabled': ('bool', [True, False], '')}
+ELEMENTS_PER_PROPERTY = 8
+PROPERTIES_PER_DEVICE = 16
+SYNTHETIC_CHOICES = [['IDLE', 'BUSY', 'ERROR', 'UNKNOWN'], ['ON', 'OFF'], ['OPEN', 'CLOSED', 'MOVING'],
+                     ['NOMINAL', 'NOT_NOMINAL', 'UNKNOWN']]
+SYNTHETIC_MIX = {'float': 0.62, 'str': 0.29, 'int': 0.03, 'bool': 0.02, 'binary': 0.04}
+SYNTHETIC_PERMISSIONS = {'ro': 0.70, 'rw': 0.27, 'wo': 0.03}
+SYNTHETIC_UNITS = ['', '', 'V', 'A', 'C', 'nm', 'Hz', 's', '%', f'{DEGREE}']
+
+
+# +
+# function: synthetic_entry()
+# -
+def synthetic_entry(datatype: str = 'float', rnd: random.Random = None, key: str = '') -> dict:
+    """returns one registry entry of the datatype with a plausible datarange and simval"""
+    _rnd = rnd if rnd is not None else random.Random(DEFAULT_SEED)
+    _permission = _rnd.choices(list(SYNTHETIC_PERMISSIONS), weights=list(SYNTHETIC_PERMISSIONS.values()))[0]
+    _entry = {"actval": math.nan, "datarange": "", "datatype": datatype, "label": None, "permission": _permission,
+              "simval": "", "tooltip": f"Synthetic {datatype}: {key}", "unit": "", "widget": None}
+
+    if datatype == 'float':
+        _span = 10.0 ** _rnd.randint(0, 6)
+        _lo = _rnd.choice([0.0, -_span, -_span / 2.0])
+        _entry.update({"datarange": (_lo, _lo + _span), "simval": random.uniform, "unit": _rnd.choice(SYNTHETIC_UNITS)})
+    elif datatype == 'int':
+        _entry.update({"actval": 0, "datarange": (0, _rnd.choice([10, 100, 1000, 65535])), "simval": random.randint})
+    elif datatype == 'bool':
+        _entry.update({"actval": False, "datarange": [True, False], "simval": random.choice})
+    elif datatype == 'binary':
+        _entry.update({"actval": "", "datarange": _rnd.choice(SYNTHETIC_CHOICES), "simval": random.choice})
+    else:
+        _entry["actval"] = ""
+        _kind = _rnd.random()
+        if _kind < 0.5:
+            _entry.update({"datarange": _rnd.choice(SYNTHETIC_CHOICES), "simval": random.choice})
+        elif _kind < 0.85:
+            _entry.update({"datarange": _rnd.choice(FILETYPES), "simval": get_hash})
+        else:
+            _entry.update({"simval": f"synthetic-{_rnd.randint(0, 9999):04d}"})
+    return _entry
+
+
+# +
+# function: synthetic_registry()
+# -
+def synthetic_registry(nelms: int = DEFAULT_NELMS, seed: int = DEFAULT_SEED, mix: dict = None,
+                       prefix: str = 'synthetic') -> dict:
+    """returns a registry of nelms entries, in the maps_indi schema, spread over device.property.element keys"""
+    _rnd = random.Random(seed)
+    _mix = mix if isinstance(mix, dict) and len(mix) > 0 else SYNTHETIC_MIX
+    _types = _rnd.choices(list(_mix), weights=list(_mix.values()), k=max(nelms, 0))
+    _registry = {}
+    for _i, _type in enumerate(_types):
+        _dev, _rem = divmod(_i, PROPERTIES_PER_DEVICE * ELEMENTS_PER_PROPERTY)
+        _prop, _elem = divmod(_rem, ELEMENTS_PER_PROPERTY)
+        _k = f"{prefix}{_dev:04d}.P{_prop:02d}.e{_elem:02d}"
+        _registry[_k] = synthetic_entry(datatype=_type, rnd=_rnd, key=_k)
+    return _registry
+
+
+# +
+# function: synthetic_actuators()
+# -
+def synthetic_actuators(device: str = 'ao_dm_synthetic', actuators: int = DM_ACTUATORS, fields: dict = None) -> dict:
+    """returns per-actuator vectors, eg. 336 positions, coils, currents and enables for the deformable mirror"""
+    _registry = {}
+    for _field, (_type, _range, _unit) in (fields or DM_FIELDS).items():
+        for _a in range(max(actuators, 0)):
+            _k = f"{device}.{_field}.act{_a + 1:03d}"
+            _registry[_k] = {
+                "actval": math.nan if _type == 'float' else False, "datarange": _range, "datatype": _type,
+                "label": None, "permission": "ro", "simval": random.uniform if _type == 'float' else random.choice,
+                "tooltip": f"Synthetic DM: {_field} of actuator {_a + 1}", "unit": _unit, "widget": None}
+    return _registry
+
+
+# +
+# function: register_synthetic()
+# -
+def register_synthetic(nelms: int = DEFAULT_NELMS, seed: int = DEFAULT_SEED, actuators: int = 0,
+                       name: str = '') -> str:
+    """adds a synthetic registry to TAB_DATA and TAB_NAMES and returns its module name"""
+    _name = name.strip() if name.strip() != '' else f"synthetic_{nelms}{f'_dm{actuators}' if actuators > 0 else ''}"
+    _registry = synthetic_registry(nelms=nelms, seed=seed)
+    if actuators > 0:
+        _registry.update(synthetic_actuators(actuators=actuators))
+    TAB_DATA[_name] = _registry
+    TAB_NAMES[_name] = f"Synthetic {len(_registry)}"
+    return _name
+
+
+# +
+# function: describe()
+# -
+def describe(registry: dict = None) -> dict:
+    """returns counts by datatype, datarange kind and permission"""
+    _counts = {}
+    for _v in (registry or {}).values():
+        _range = _v['datarange']
+        _kind = 'tuple' if isinstance(_range, tuple) else 'list' if isinstance(_range, list) else \
+            'filetype' if _range in FILETYPES else 'none'
+        for _key in (f"datatype={_v['datatype']}", f"datarange={_kind}", f"permission={_v['permission']}"):
+            _counts[_key] = _counts.get(_key, 0) + 1
+    return dict(sorted(_counts.items()))
+
+
+# +
+# main()
+# -
+if __name__ == '__main__':
+
+    # get command line argument(s)
+    _p = argparse.ArgumentParser(description='maps synthetic registry', formatter_class=argparse.RawTextHelpFormatter)
+    _p.add_argument('--nelms', default=DEFAULT_NELMS, help=f"""Number of stream(s) [%(default)s]""")
+    _p.add_argument('--actuators', default=0, help=f"""Add per-actuator DM vector(s) [%(default)s], eg. {DM_ACTUATORS}""")
+    _p.add_argument('--seed', default=DEFAULT_SEED, help=f"""Random seed [%(default)s]""")
+    _a = _p.parse_args()
+
+    _module = register_synthetic(nelms=int(_a.nelms), seed=int(_a.seed), actuators=int(_a.actuators))
+    _data = TAB_DATA[_module]
+    _valid = all(set(HEADERS).issubset(_v) and set(_v).issubset(HEADERS + OPTIONAL_HEADERS) for _v in _data.values())
+    color_print(msg=f"{'OK' if _valid else 'ERROR'}: {_module} has {len(_data)} items, {describe(_data)}",
+                color='green' if _valid else 'red')
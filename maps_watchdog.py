@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+
+
+# +
+# import(s)
+# -
+from maps_qt import QObject, QTimer, Qt
+
+import collections
+import logging
+import sys
+import threading
+import time
+import traceback
+
+import numpy as np
+
+
+# +
+# constant(s)
+# -
+DEFAULT_PROBE = 50
+DEFAULT_STALLS = 100
+DEFAULT_THRESHOLD = 250
+LATENCY_EDGES = [0.0, 1.0, 2.0, 5.0, 10.0, 20.0, 50.0, 100.0, 200.0, 500.0, 1000.0, 2000.0, 5000.0, np.inf]
+
+
+# +
+# class: Stall()
+# -
+Stall = collections.namedtuple('Stall', ['time', 'duration', 'stack'])
+
+
+# +
+# class: StallWatchdog()
+# use: wd = StallWatchdog(threshold=250, log=log, parent=self)
+#      wd.start()
+#      print(wd.report())
+# -
+# noinspection PyUnresolvedReferences
+class StallWatchdog(QObject):
+    """measures event-loop latency with a probe timer and samples the gui thread stack during stalls"""
+
+    # +
+    # (hidden) method: __init__()
+    # -
+    def __init__(self, probe: int = DEFAULT_PROBE, threshold: int = DEFAULT_THRESHOLD,
+                 stalls: int = DEFAULT_STALLS, log: logging.Logger = None, parent: QObject = None) -> None:
+        super().__init__(parent)
+
+        # get argument(s)
+        self.__probe = probe if probe > 0 else DEFAULT_PROBE
+        self.__threshold = threshold if threshold > 0 else DEFAULT_THRESHOLD
+        self.__log = log
+
+        # latency histogram (ms) and recent stall(s)
+        self.__edges = np.array(LATENCY_EDGES)
+        self.__counts = np.zeros(len(LATENCY_EDGES) - 1, dtype=np.int64)
+        self.__stalls = collections.deque(maxlen=stalls if stalls > 0 else DEFAULT_STALLS)
+        self.__max_lag = 0.0
+        self.__nstalls = 0
+
+        # the probe runs on the gui thread, the sampler on its own so it still runs while the gui is blocked
+        self.__ident = threading.get_ident()
+        self.__heartbeat = time.perf_counter()
+        self.__expected = self.__heartbeat
+        self.__sample = None
+        self.__lock = threading.Lock()
+        self.__stop = threading.Event()
+        self.__thread = None
+        self.__timer = QTimer(self)
+        self.__timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.__timer.timeout.connect(self.__tick__)
+
+    # +
+    # variable getter(s)
+    # -
+    @property
+    def counts(self) -> np.ndarray:
+        return self.__counts
+
+    @property
+    def edges(self) -> np.ndarray:
+        return self.__edges
+
+    @property
+    def max_lag(self) -> float:
+        return float(self.__max_lag)
+
+    @property
+    def nstalls(self) -> int:
+        return int(self.__nstalls)
+
+    @property
+    def running(self) -> bool:
+        return self.__timer.isActive()
+
+    @property
+    def stalls(self) -> list:
+        return list(self.__stalls)
+
+    @property
+    def threshold(self) -> int:
+        return int(self.__threshold)
+
+    # +
+    # (hidden) method: __tick__()
+    # -
+    def __tick__(self) -> None:
+        """records how late the probe fired, in ms"""
+        _now = time.perf_counter()
+        _lag = max((_now - self.__expected) * 1000.0, 0.0)
+        with self.__lock:
+            self.__heartbeat = _now
+            _stack, self.__sample = self.__sample, None
+        self.__expected = _now + self.__probe / 1000.0
+        self.__counts[min(np.searchsorted(self.__edges, _lag, side='right') - 1, self.__counts.size - 1)] += 1
+        self.__max_lag = max(self.__max_lag, _lag)
+        if _lag >= self.__threshold:
+            self.__nstalls += 1
+            self.__stalls.append(Stall(time.time(), _lag, _stack))
+            if self.__log:
+                self.__log.warning(f"event loop stalled for {_lag:.0f} ms"
+                                   f"{':' + chr(10) + ''.join(_stack) if _stack else ''}")
+
+    # +
+    # (hidden) method: __run__()
+    # -
+    # noinspection PyBroadException,PyProtectedMember
+    def __run__(self) -> None:
+        """samples the gui thread stack once per stall, while it is still blocked"""
+        while not self.__stop.wait(self.__threshold / 2000.0):
+            with self.__lock:
+                if self.__sample is not None or (time.perf_counter() - self.__heartbeat) * 1000.0 < self.__threshold:
+                    continue
+                try:
+                    _frame = sys._current_frames().get(self.__ident, None)
+                    self.__sample = traceback.format_stack(_frame) if _frame is not None else []
+                except:
+                    self.__sample = []
+
+    # +
+    # method: start()
+    # -
+    def start(self) -> None:
+        if self.__timer.isActive():
+            return
+        self.__ident = threading.get_ident()
+        self.__heartbeat = self.__expected = time.perf_counter() + self.__probe / 1000.0
+        self.__stop.clear()
+        self.__thread = threading.Thread(target=self.__run__, name='StallWatchdog', daemon=True)
+        self.__thread.start()
+        self.__timer.start(self.__probe)
+
+    # +
+    # method: stop()
+    # -
+    def stop(self) -> None:
+        self.__timer.stop()
+        self.__stop.set()
+        if self.__thread is not None:
+            self.__thread.join(timeout=1.0)
+            self.__thread = None
+
+    # +
+    # method: reset()
+    # -
+    def reset(self) -> None:
+        self.__counts.fill(0)
+        self.__stalls.clear()
+        self.__max_lag, self.__nstalls = 0.0, 0
+
+    # +
+    # method: histogram()
+    # -
+    def histogram(self) -> dict:
+        """returns {'<lo>-<hi>ms': count} for the non-empty bin(s)"""
+        return {f"{self.__edges[_i]:g}-{self.__edges[_i + 1]:g}ms": int(self.__counts[_i])
+                for _i in np.flatnonzero(self.__counts)}
+
+    # +
+    # method: report()
+    # -
+    def report(self) -> str:
+        """returns a one-line summary suitable for a status bar or log"""
+        return f"event loop: probes={int(self.__counts.sum())}, max lag={self.__max_lag:.1f} ms, " \
+               f"stalls(>={self.__threshold} ms)={self.__nstalls}, histogram={self.histogram()}"
@@ -4,28 +4,40 @@
 # +
 # import(s)
 # -
-from astropy.coordinates import AltAz
-from astropy.coordinates import EarthLocation
-from astropy.coordinates import get_body
-from astropy.time import Time
-from astropy import units as u
 from datetime import datetime
 from datetime import timedelta
+from datetime import timezone
 from typing import Any
 
+import atexit
+import collections
+import glob
+import gzip
 import hashlib
+import json
 import logging
-import logging.config
+import logging.handlers
 import math
 import os
 import platform
+import queue
 import random
+import shutil
+import threading
+import time
+import types
+
+import numpy as np
 
 
 # +
 # initialize
 # -
-random.seed(os.getpid())
+random.seed(int(os.getenv('MAPS_SEED', os.getpid())))
+_ASTROPY = None
+_LOG_WRITER = None
+_LOGGERS = {}
+_LOGGERS_LOCK = threading.RLock()
 
 
 # +
@@ -35,16 +47,29 @@ DEFAULT_HOST = 'localhost'
 DEFAULT_PORT = 7624
 DEFAULT_TIMEOUT = 5
 DEGREE = u'\u00b0'
+EPHEMERIS_HOURS = 12.0
+EPHEMERIS_STEP = 120.0
+IERS_MAX_AGE = 30.0
 FALSE_VALUES = [0, False, '0', 'false', 'f', 'FALSE', 'F']
 ISO_FORMAT = '%Y-%m-%dT%H:%M:%S.%f'
 ISO_PATTERN = '[0-9]{4}-[0-9]{2}-[0-9]{2}[ T?][0-9]{2}:[0-9]{2}:[0-9]{2}.[0-9]{6}'
 LOG_CLR_FMT = '%(log_color)s%(asctime)-20s line:%(lineno)-5d %(message)s'
+LOG_BACKUPS = 14
 LOG_CSL_FMT = '%(asctime)-20s line:%(lineno)-5d %(message)s'
 LOG_FIL_FMT = '%(asctime)-20s line:%(lineno)-5d %(message)s'
+LOG_INTERVAL = 86400.0
+LOG_JSON_FIELDS = ('key', 'value', 'latency')
 LOG_LEVELS = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
+LOG_MAX_BYTES = 64 * 1024 * 1024
+LOG_QUEUE_SIZE = 100000
+LOG_REPEAT = 10.0
+LOG_REPEAT_SIZE = 1024
 MAX_BYTES = 9223372036854775807
 MICRON = u'\u03bc'
+SECONDS_PER_DAY = 86400.0
 SUPPORTED_COLORS = ['black', 'blue', 'cyan', 'green', 'magenta', 'red', 'yellow']
+UNIX_EPOCH = datetime(1970, 1, 1)
+UNIX_EPOCH_JD = 2440587.5
 TRUE_VALUES = [1, True, '1', 'true', 't', 'TRUE', 'T']
 
 
@@ -76,10 +101,34 @@ VATT_ELEVATION_METRES = VATT_ELEVATION_FEET * 0.3048
 VATT_LATITUDE_DEGREES = 32.7016
 VATT_LONGITUDE_DEGREES = -109.8719
 
+SITES = {
+    'BOK': (BOK_LATITUDE_DEGREES, BOK_LONGITUDE_DEGREES, BOK_ELEVATION_METRES),
+    'KUIPER': (KUIPER_LATITUDE_DEGREES, KUIPER_LONGITUDE_DEGREES, KUIPER_ELEVATION_METRES),
+    'LBT': (LBT_LATITUDE_DEGREES, LBT_LONGITUDE_DEGREES, LBT_ELEVATION_METRES),
+    'MMT': (MMT_LATITUDE_DEGREES, MMT_LONGITUDE_DEGREES, MMT_ELEVATION_METRES),
+    'VATT': (VATT_LATITUDE_DEGREES, VATT_LONGITUDE_DEGREES, VATT_ELEVATION_METRES)
+}
+
 
 # +
 # function(s)
 # -
+def get_astropy() -> types.SimpleNamespace:
+    """imports astropy on first use, it takes longer than the rest of a gui's imports put together"""
+    global _ASTROPY
+    if _ASTROPY is None:
+        from astropy.coordinates import AltAz
+        from astropy.coordinates import EarthLocation
+        from astropy.coordinates import get_body
+        from astropy.time import Time
+        from astropy.utils import iers
+        from astropy.utils.data import conf as data_conf
+        from astropy import units as u
+        _ASTROPY = types.SimpleNamespace(AltAz=AltAz, EarthLocation=EarthLocation, get_body=get_body, Time=Time,
+                                         iers=iers, data_conf=data_conf, u=u)
+    return _ASTROPY
+
+
 # noinspection PyBroadException
 def get_isot(ndays: float = 0.0) -> str:
     """returns the offset date in isot format or an empty string"""
@@ -102,25 +151,62 @@ def get_utc(ndays: float = 0.0) -> str:
 def get_jd(ndays: float = 0.0) -> float:
     """returns an offset jd or NaN"""
     try:
-        return float(Time(get_isot(ndays)).jd)
+        return datetime_to_jd(datetime.now() + timedelta(days=ndays))
+    except:
+        return math.nan
+
+
+def unix_to_jd(unix: Any = math.nan) -> Any:
+    """returns jd from unix time(s), scalar or array"""
+    return unix / SECONDS_PER_DAY + UNIX_EPOCH_JD
+
+
+def jd_to_unix(jd: Any = math.nan) -> Any:
+    """returns unix time(s) from jd, scalar or array"""
+    return (jd - UNIX_EPOCH_JD) * SECONDS_PER_DAY
+
+
+def datetime_to_unix(dt: datetime = UNIX_EPOCH) -> float:
+    """returns unix time from a datetime, naive datetimes are taken to be utc"""
+    return dt.timestamp() if dt.tzinfo else (dt - UNIX_EPOCH) / timedelta(seconds=1)
+
+
+def datetime_to_jd(dt: datetime = UNIX_EPOCH) -> float:
+    return unix_to_jd(datetime_to_unix(dt))
+
+
+# noinspection PyBroadException
+def isot_to_unix(isot: Any = '') -> Any:
+    """returns unix time from (utc) date(s) in isot format, a string or an array of them, or NaN"""
+    try:
+        if isinstance(isot, str):
+            return datetime_to_unix(datetime.fromisoformat(isot))
+        return (np.asarray(isot, dtype='datetime64[us]') - np.datetime64(0, 'us')) / np.timedelta64(1, 's')
     except:
         return math.nan
 
 
 # noinspection PyBroadException
-def isot_to_jd(isot: str = '') -> float:
-    """returns jd from date in isot format or NaN"""
+def isot_to_jd(isot: str = '', precise: bool = False) -> float:
+    """returns jd from date in isot format or NaN, astropy handles leap seconds and other format(s) if precise"""
     try:
-        return float(Time(isot).jd)
+        if not precise:
+            return unix_to_jd(datetime_to_unix(datetime.fromisoformat(isot)))
+    except:
+        pass
+    try:
+        return float(get_astropy().Time(isot).jd)
     except:
         return math.nan
 
 
 # noinspection PyBroadException
-def jd_to_isot(jd: float = math.nan) -> str:
-    """returns the date in isot format from jd or an empty string"""
+def jd_to_isot(jd: float = math.nan, precise: bool = False) -> str:
+    """returns the date in isot format from jd or an empty string, astropy handles leap seconds if precise"""
     try:
-        return Time(jd, format='jd', precision=6).isot
+        if precise:
+            return get_astropy().Time(jd, format='jd', precision=6).isot
+        return (UNIX_EPOCH + timedelta(seconds=float(jd_to_unix(jd)))).isoformat(timespec='microseconds')
     except:
         return f''
 
@@ -129,51 +215,140 @@ def jd_to_isot(jd: float = math.nan) -> str:
 def get_unix(ndays: float = 0.0) -> int:
     """returns the unix time date or -1"""
     try:
-        _now = isot_to_jd(get_utc(ndays=ndays))
-        _then = isot_to_jd('1970-01-01T00:00:00.00')
-        return int(round((_now - _then)*86400.0))
+        return int(round(time.time() + ndays * SECONDS_PER_DAY))
     except:
         return -1
 
 
-# noinspection PyBroadException,PyUnresolvedReferences
+def get_ephemeris(lat: float = MMT_LATITUDE_DEGREES, lon: float = MMT_LONGITUDE_DEGREES,
+                  ele: float = MMT_ELEVATION_METRES) -> 'Ephemeris':
+    """returns the (cached) ephemeris of a site"""
+    _key = (float(lat), float(lon), float(ele))
+    with _EPHEMERIS_LOCK:
+        if _key not in _EPHEMERIS:
+            _EPHEMERIS[_key] = Ephemeris(lat=lat, lon=lon, ele=ele)
+        return _EPHEMERIS[_key]
+
+
+# noinspection PyBroadException
 def get_lst(lat: float = MMT_LATITUDE_DEGREES, lon: float = MMT_LONGITUDE_DEGREES, ele: float = MMT_ELEVATION_METRES) -> str:
     """returns lst or an empty string"""
     try:
-        _obs = EarthLocation(lat=lat*u.deg, lon=lon*u.deg, height=ele*u.m)
-        _time = Time(get_utc(), scale='utc', location=_obs)
-        _h, _m, _s = _time.sidereal_time('mean').hms
+        _h, _m, _s = get_ephemeris(lat=lat, lon=lon, ele=ele).lst_hms()
         return f"{int(_h):02d}:{int(_m):02d}:{float(_s):05.2f}"
     except:
         return ''
 
 
-# noinspection PyBroadException,PyUnresolvedReferences
+# noinspection PyBroadException
 def get_moon(lat: float = MMT_LATITUDE_DEGREES, lon: float = MMT_LONGITUDE_DEGREES, ele: float = MMT_ELEVATION_METRES) -> tuple:
     """returns moon alt, az or (NaN, NaN)"""
     try:
-        _obs = EarthLocation(lat=lat*u.deg, lon=lon*u.deg, height=ele*u.m)
-        _time = Time(get_utc(), scale='utc', location=_obs)
-        _moon = get_body('moon', _time)
-        _altaz = _moon.transform_to(AltAz(obstime=_time, location=_obs))
-        return _altaz.alt.value, _altaz.az.value
+        return get_ephemeris(lat=lat, lon=lon, ele=ele).moon()
     except:
         return math.nan, math.nan
 
 
-# noinspection PyBroadException,PyUnresolvedReferences
+# noinspection PyBroadException
 def get_sun(lat: float = MMT_LATITUDE_DEGREES, lon: float = MMT_LONGITUDE_DEGREES, ele: float = MMT_ELEVATION_METRES) -> tuple:
     """returns sun alt, az or (NaN, NaN)"""
     try:
-        _obs = EarthLocation(lat=lat*u.deg, lon=lon*u.deg, height=ele*u.m)
-        _time = Time(get_utc(), scale='utc', location=_obs)
-        _moon = get_body('sun', _time)
-        _altaz = _moon.transform_to(AltAz(obstime=_time, location=_obs))
-        return _altaz.alt.value, _altaz.az.value
+        return get_ephemeris(lat=lat, lon=lon, ele=ele).sun()
     except:
         return math.nan, math.nan
 
 
+# noinspection PyUnresolvedReferences
+def as_time(times: Any = None) -> Any:
+    """returns an astropy Time array from unix time(s), isot string(s), datetime(s) or a Time, default now"""
+    _a = get_astropy()
+    if isinstance(times, _a.Time):
+        return times
+    _times = np.atleast_1d(np.asarray(time.time() if times is None else times))
+    if _times.dtype.kind in 'iuf':
+        return _a.Time(_times.astype(float), format='unix', scale='utc')
+    return _a.Time([(_t.astimezone(timezone.utc).replace(tzinfo=None) if _t.tzinfo else _t).isoformat()
+                 if isinstance(_t, datetime) else f"{_t}" for _t in _times.tolist()], scale='utc')
+
+
+def time_grid(start: float = math.nan, hours: float = EPHEMERIS_HOURS, step: float = EPHEMERIS_STEP) -> np.ndarray:
+    """returns unix time(s) every step seconds for hours from start (default now)"""
+    _start = time.time() if math.isnan(start) else start
+    return _start + np.arange(int(hours * 3600.0 / step) + 1) * step
+
+
+# noinspection PyUnresolvedReferences
+def batch_ephemeris(times: Any = None, sites: Any = None, bodies: tuple = ('sun', 'moon')) -> dict:
+    """returns jd and unix (ntimes,) and lst (hours) and body alt, az (degrees) (nsites, ntimes) arrays,
+       sites are SITES names or (lat, lon, ele) tuples and default to every site in SITES"""
+    _sites = list(SITES) if sites is None else [sites] if isinstance(sites, (str, tuple)) else list(sites)
+    _lat, _lon, _ele = np.array([SITES[_s.upper()] if isinstance(_s, str) else _s for _s in _sites], dtype=float).T
+    _a = get_astropy()
+    _location = _a.EarthLocation(lat=_lat*_a.u.deg, lon=_lon*_a.u.deg, height=_ele*_a.u.m)[:, None]
+    _time = as_time(times)
+    _frame = _a.AltAz(obstime=_time[None, :], location=_location)
+    _table = {'sites': _sites, 'jd': np.asarray(_time.jd), 'unix': np.asarray(_time.unix),
+              'lst': np.asarray(_time[None, :].sidereal_time('mean', longitude=_location.lon).hour)}
+    for _body in bodies:
+        _altaz = _a.get_body(_body, _time).transform_to(_frame)
+        _table[f'{_body}_alt'] = np.asarray(_altaz.alt.deg)
+        _table[f'{_body}_az'] = np.asarray(_altaz.az.deg)
+    return _table
+
+
+def astropy_offline(prewarm: bool = True, log: logging.Logger = None) -> Any:
+    """pins astropy to its local iers table(s) and, optionally, prewarms them and the ephemeris in a thread"""
+    _a = get_astropy()
+    _a.iers.conf.auto_download = False
+    _a.iers.conf.auto_max_age = None
+    _a.iers.conf.iers_degraded_accuracy = 'warn'
+    _a.data_conf.allow_internet = False
+    if log:
+        log.info(f"astropy pinned to local iers table(s), auto_download={_a.iers.conf.auto_download}")
+    return prewarm_ephemeris(log=log) if prewarm else None
+
+
+# noinspection PyBroadException
+def iers_report() -> dict:
+    """returns the iers table in use and how fresh its measured and predicted value(s) are"""
+    _iers = get_astropy().iers
+    try:
+        _table = _iers.earth_orientation_table.get()
+        _mjd = np.asarray(getattr(_table['MJD'], 'value', _table['MJD']), dtype=float)
+        _flags = np.asarray(_table['PolPMFlag_A']) if 'PolPMFlag_A' in _table.colnames else np.full(_mjd.size, 'B')
+        _measured = float(_mjd[_flags != 'P'][-1]) if (_flags != 'P').any() else math.nan
+        _age = time.time() / 86400.0 + 40587.0 - _measured
+        return {'table': type(_table).__name__, 'path': f"{_table.meta.get('data_path', '')}",
+                'measured': jd_to_isot(_measured + 2400000.5)[:10], 'predicted': jd_to_isot(_mjd[-1] + 2400000.5)[:10],
+                'age_days': round(_age, 1), 'fresh': bool(_age <= IERS_MAX_AGE),
+                'auto_download': bool(_iers.conf.auto_download)}
+    except Exception as _:
+        return {'table': '', 'error': f"{_}", 'fresh': False, 'auto_download': bool(_iers.conf.auto_download)}
+
+
+# noinspection PyBroadException
+def prewarm_ephemeris(sites: list = None, log: logging.Logger = None) -> threading.Thread:
+    """loads the iers table(s) and builds the ephemeris of each (lat, lon, ele) site in a daemon thread"""
+    def _prewarm() -> None:
+        _t0 = time.perf_counter()
+        _report = iers_report()
+        for _lat, _lon, _ele in (sites or [(MMT_LATITUDE_DEGREES, MMT_LONGITUDE_DEGREES, MMT_ELEVATION_METRES)]):
+            try:
+                get_ephemeris(lat=_lat, lon=_lon, ele=_ele).sun()
+            except Exception as _:
+                if log:
+                    log.error(f"failed to prewarm ephemeris at ({_lat}, {_lon}, {_ele}), error='{_}'")
+        if log:
+            _msg = f"iers {_report}, ephemeris prewarmed in {time.perf_counter() - _t0:.2f}s"
+            if _report.get('fresh', False):
+                log.info(_msg)
+            else:
+                log.warning(_msg)
+    _thread = threading.Thread(target=_prewarm, name='Prewarm', daemon=True)
+    _thread.start()
+    return _thread
+
+
 # noinspection PyBroadException
 def get_hash() -> str:
     """returns a random hash string or an empty string"""
@@ -220,6 +395,140 @@ def flatten_dictionary(_dict: Any = None, _sep: str = '.', _pre: str = '') -> di
         return {}
 
 
+# +
+# class: Ephemeris()
+# use: eph = Ephemeris(lat=MMT_LATITUDE_DEGREES, lon=MMT_LONGITUDE_DEGREES, ele=MMT_ELEVATION_METRES)
+#      _alt, _az = eph.sun()
+# -
+# noinspection PyUnresolvedReferences
+class Ephemeris(object):
+    """sun and moon alt-az and lst for one site, computed on a time grid and interpolated"""
+
+    # +
+    # (hidden) method: __init__()
+    # -
+    def __init__(self, lat: float = MMT_LATITUDE_DEGREES, lon: float = MMT_LONGITUDE_DEGREES,
+                 ele: float = MMT_ELEVATION_METRES, hours: float = EPHEMERIS_HOURS, step: float = EPHEMERIS_STEP) -> None:
+
+        # get argument(s)
+        self.__site = (float(lat), float(lon), float(ele))
+        _a = get_astropy()
+        self.__location = _a.EarthLocation(lat=lat*_a.u.deg, lon=lon*_a.u.deg, height=ele*_a.u.m)
+        self.__hours = hours if hours > 0.0 else EPHEMERIS_HOURS
+        self.__step = step if step > 0.0 else EPHEMERIS_STEP
+
+        # grid of unix time(s) and, per column, unwrapped lst (hours) and sun / moon alt, az (degrees)
+        self.__grid = np.empty(0)
+        self.__table = {}
+        self.__lock = threading.Lock()
+        self.__build_lock = threading.Lock()
+        self.__refresh = None
+
+    # +
+    # decorator(s)
+    # -
+    @property
+    def grid(self) -> np.ndarray:
+        return self.__grid
+
+    @property
+    def location(self) -> Any:
+        return self.__location
+
+    # +
+    # (hidden) method: __build__()
+    # -
+    def __build__(self, start: float = 0.0) -> tuple:
+        """computes every column over the grid in one vectorized call"""
+        _grid = time_grid(start=start, hours=self.__hours, step=self.__step)
+        _batch = batch_ephemeris(times=_grid, sites=[self.__site])
+        _table = {'lst': np.unwrap(_batch['lst'][0], period=24.0)}
+        for _body in ('sun', 'moon'):
+            _table[f'{_body}_alt'] = _batch[f'{_body}_alt'][0]
+            _table[f'{_body}_az'] = np.unwrap(_batch[f'{_body}_az'][0], period=360.0)
+        return _grid, _table
+
+    # +
+    # (hidden) method: __refresh__()
+    # -
+    # noinspection PyBroadException
+    def __refresh__(self, start: float = 0.0) -> None:
+        """builds the next grid off the caller's thread and swaps it in"""
+        try:
+            with self.__build_lock:
+                _grid, _table = self.__build__(start=start)
+                with self.__lock:
+                    self.__grid, self.__table = _grid, _table
+        except:
+            pass
+
+    # +
+    # (hidden) method: __first__()
+    # -
+    def __first__(self, when: float = 0.0) -> tuple:
+        """builds the first grid in the caller's thread, or waits for the one being built (eg by prewarm_ephemeris)"""
+        with self.__build_lock:
+            with self.__lock:
+                if self.__grid.size == 0:
+                    self.__grid, self.__table = self.__build__(start=when - self.__step)
+                return self.__grid, self.__table
+
+    # +
+    # (hidden) method: __interp__()
+    # -
+    @staticmethod
+    def __interp__(when: float = 0.0, grid: np.ndarray = None, values: np.ndarray = None) -> float:
+        """interpolates inside the grid and extends its end segment outside it"""
+        if when > grid[-1]:
+            return float(values[-1] + (values[-1] - values[-2]) * (when - grid[-1]) / (grid[-1] - grid[-2]))
+        if when < grid[0]:
+            return float(values[0] - (values[1] - values[0]) * (grid[0] - when) / (grid[1] - grid[0]))
+        return float(np.interp(when, grid, values))
+
+    # +
+    # method: at()
+    # -
+    def at(self, column: str = 'lst', when: float = math.nan) -> float:
+        """returns a column interpolated at a unix time (default now), the grid is rebuilt in the background
+           once half of it has gone by, or the time falls outside it, and the old grid answers until then"""
+        _when = time.time() if math.isnan(when) else when
+        with self.__lock:
+            _grid, _table = self.__grid, self.__table
+            if _grid.size > 0 and (_when < _grid[0] or _when > _grid[-1] - self.__hours * 1800.0) and \
+                    (self.__refresh is None or not self.__refresh.is_alive()):
+                self.__refresh = threading.Thread(target=self.__refresh__, kwargs={'start': _when - self.__step},
+                                                  name='Ephemeris', daemon=True)
+                self.__refresh.start()
+        if _grid.size == 0:
+            _grid, _table = self.__first__(when=_when)
+        _value = self.__interp__(_when, _grid, _table[column])
+        return _value % 24.0 if column == 'lst' else _value % 360.0 if column.endswith('_az') else _value
+
+    # +
+    # method: lst_hms()
+    # -
+    def lst_hms(self, when: float = math.nan) -> tuple:
+        _h = self.at('lst', when)
+        _m = (_h - int(_h)) * 60.0
+        return int(_h), int(_m), (_m - int(_m)) * 60.0
+
+    # +
+    # method: moon()
+    # -
+    def moon(self, when: float = math.nan) -> tuple:
+        return self.at('moon_alt', when), self.at('moon_az', when)
+
+    # +
+    # method: sun()
+    # -
+    def sun(self, when: float = math.nan) -> tuple:
+        return self.at('sun_alt', when), self.at('sun_az', when)
+
+
+_EPHEMERIS = {}
+_EPHEMERIS_LOCK = threading.Lock()
+
+
 # +
 # class: CustomException()
 # use: raise CustomException(errnum=-2, extra='Something bad happened!')
@@ -275,6 +584,305 @@ class CustomException(Exception):
         return f"{self.__errstr}"
 
 
+# +
+# class: LogRepeatFilter()
+# use: _keep = LogRepeatFilter(interval=10.0).filter(record)
+# -
+class LogRepeatFilter(logging.Filter):
+    """drops a message repeated within interval seconds and says how often it repeated when it next passes,
+       a LogWriter runs it on its own thread since it has to interpolate the message"""
+
+    # +
+    # (hidden) method: __init__()
+    # -
+    def __init__(self, interval: float = LOG_REPEAT, size: int = LOG_REPEAT_SIZE) -> None:
+
+        # get argument(s)
+        super().__init__()
+        self.__interval = interval
+        self.__size = size if size > 0 else LOG_REPEAT_SIZE
+
+        # {(level, message): [time last passed, number suppressed since]}, least recently passed first
+        self.__seen = collections.OrderedDict()
+        self.__lock = threading.Lock()
+        self.__suppressed = 0
+
+    # +
+    # variable getter(s)
+    # -
+    @property
+    def suppressed(self) -> int:
+        return int(self.__suppressed)
+
+    # +
+    # method: filter()
+    # -
+    def filter(self, record: logging.LogRecord = None) -> bool:
+        if self.__interval <= 0.0:
+            return True
+        _message = record.getMessage()
+        record.msg, record.args = _message, None
+        _key = (record.levelno, _message)
+        with self.__lock:
+            _seen = self.__seen.get(_key, None)
+            if _seen is not None and record.created - _seen[0] < self.__interval:
+                _seen[1] += 1
+                self.__suppressed += 1
+                return False
+            if _seen is not None and _seen[1] > 0:
+                record.msg = f"{_message} [repeated {_seen[1]} time(s) in {record.created - _seen[0]:.0f}s]"
+            self.__seen[_key] = [record.created, 0]
+            self.__seen.move_to_end(_key)
+            while len(self.__seen) > self.__size:
+                self.__seen.popitem(last=False)
+        return True
+
+
+# +
+# class: LogQueueHandler()
+# use: handler = LogQueueHandler(log_writer().queue, route='maps_status_gui')
+# -
+class LogQueueHandler(logging.handlers.QueueHandler):
+    """enqueues (route, record) without ever blocking the caller, counting those dropped when the queue is full"""
+
+    # +
+    # (hidden) method: __init__()
+    # -
+    def __init__(self, records: queue.Queue = None, route: str = '') -> None:
+        super().__init__(records if records is not None else queue.Queue(maxsize=LOG_QUEUE_SIZE))
+        self.__route = route
+        self.__dropped = 0
+
+    # +
+    # variable getter(s)
+    # -
+    @property
+    def dropped(self) -> int:
+        return int(self.__dropped)
+
+    # +
+    # method: prepare()
+    # -
+    def prepare(self, record: logging.LogRecord = None) -> logging.LogRecord:
+        """returns the record as is: message argument(s) are interpolated on the writer thread, not the caller's"""
+        return record
+
+    # +
+    # method: enqueue()
+    # -
+    def enqueue(self, record: logging.LogRecord = None) -> None:
+        try:
+            self.queue.put_nowait((self.__route or record.name, record))
+        except queue.Full:
+            self.__dropped += 1
+
+
+# +
+# class: LogWriter()
+# use: lw = LogWriter()
+#      lw.attach(name='maps_status_gui', handlers=[console, file])
+#      logger.addHandler(LogQueueHandler(lw.queue, route='maps_status_gui'))
+# -
+class LogWriter(logging.handlers.QueueListener):
+    """one background thread that suppresses repeat(s), formats and writes the queued record(s) of every attached
+       logger through its own handler(s)"""
+
+    # +
+    # (hidden) method: __init__()
+    # -
+    def __init__(self, maxsize: int = LOG_QUEUE_SIZE) -> None:
+        super().__init__(queue.Queue(maxsize=maxsize if maxsize > 0 else LOG_QUEUE_SIZE), respect_handler_level=True)
+        self.__routes = {}
+        self.__lock = threading.Lock()
+
+    # +
+    # variable getter(s)
+    # -
+    @property
+    def routes(self) -> list:
+        return sorted(self.__routes)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    # +
+    # method: attach()
+    # -
+    def attach(self, name: str = '', handlers: list = None, repeat: float = LOG_REPEAT) -> list:
+        """routes name's record(s) to handlers, starts the thread if need be and returns any handler(s) replaced"""
+        with self.__lock:
+            _old, _ = self.__routes.get(name, ([], None))
+            self.__routes[name] = (list(handlers or []), LogRepeatFilter(interval=repeat) if repeat > 0.0 else None)
+            if not self.running:
+                self.start()
+        return _old
+
+    # +
+    # method: handle()
+    # -
+    def handle(self, item: tuple = None) -> None:
+        _route, _record = item
+        _handlers, _repeat = self.__routes.get(_route, ([], None))
+        if _repeat is not None and not _repeat.filter(_record):
+            return
+        for _h in _handlers:
+            if _record.levelno >= _h.level:
+                _h.handle(_record)
+
+    # +
+    # method: enqueue_sentinel()
+    # -
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+    # +
+    # method: stop()
+    # -
+    def stop(self) -> None:
+        """writes out every queued record and stops the thread, the next attach() starts it again"""
+        with self.__lock:
+            if self.running:
+                super().stop()
+
+
+# +
+# function: log_writer()
+# -
+def log_writer() -> LogWriter:
+    """returns the process' one LogWriter"""
+    global _LOG_WRITER
+    with _LOGGERS_LOCK:
+        if _LOG_WRITER is None:
+            _LOG_WRITER = LogWriter()
+        return _LOG_WRITER
+
+
+# +
+# function: read_log_json()
+# -
+def read_log_json(filename: str = '') -> list:
+    """returns the record(s) of a JSON-lines log, plain or gzipped, as a list of dictionaries"""
+    _open = gzip.open if filename.endswith('.gz') else open
+    with _open(filename, 'rt') as _fd:
+        return [json.loads(_line) for _line in _fd if _line.strip() != '']
+
+
+# +
+# class: LogJsonFormatter()
+# use: handler.setFormatter(LogJsonFormatter())
+#      log.info("update", extra={'key': 'Time.Now.JD', 'value': 2460000.5, 'latency': 0.012})
+# -
+class LogJsonFormatter(logging.Formatter):
+    """formats a record as one JSON object per line, with key, value and latency when given as extra(s)"""
+
+    # +
+    # method: format()
+    # -
+    def format(self, record: logging.LogRecord = None) -> str:
+        _line = {'time': record.created, 'level': record.levelname, 'name': record.name, 'line': record.lineno,
+                 'message': record.getMessage()}
+        for _field in LOG_JSON_FIELDS:
+            if hasattr(record, _field):
+                _line[_field] = getattr(record, _field)
+        if record.exc_info:
+            _line['exception'] = self.formatException(record.exc_info)
+        return json.dumps(_line, default=lambda _o: _o.item() if hasattr(_o, 'item') else f"{_o}")
+
+
+# +
+# class: LogRotatingFileHandler()
+# use: handler = LogRotatingFileHandler(filename='/tmp/maps.log', max_bytes=64*1024*1024, interval=86400.0)
+# -
+class LogRotatingFileHandler(logging.handlers.BaseRotatingHandler):
+    """rolls a log file over at a size or a time boundary, whichever comes first, and gzips the rolled file"""
+
+    # +
+    # (hidden) method: __init__()
+    # -
+    def __init__(self, filename: str = '', max_bytes: int = LOG_MAX_BYTES, interval: float = LOG_INTERVAL,
+                 backups: int = LOG_BACKUPS, compress: bool = True, encoding: str = None) -> None:
+
+        # get argument(s)
+        super().__init__(filename, 'a', encoding=encoding, delay=True)
+        self.__max_bytes = max(int(max_bytes), 0)
+        self.__interval = max(float(interval), 0.0)
+        self.__backups = max(int(backups), 0)
+        self.__compress = compress
+        self.rotator = self.__gzip__ if compress else None
+
+        # time boundaries are counted from local midnight, a file left from an earlier period rolls over first
+        self.__rollover = self.__boundary__(time.time())
+        if self.__interval > 0.0 and os.path.isfile(self.baseFilename) and os.path.getsize(self.baseFilename) > 0 \
+                and os.path.getmtime(self.baseFilename) < self.__rollover - self.__interval:
+            self.__rollover = 0.0
+
+    # +
+    # variable getter(s)
+    # -
+    @property
+    def rolled(self) -> list:
+        """returns the rolled file(s), oldest first"""
+        return sorted(glob.glob(f"{glob.escape(self.baseFilename)}.*"), key=os.path.getmtime)
+
+    # +
+    # (hidden) method: __boundary__()
+    # -
+    def __boundary__(self, now: float = 0.0) -> float:
+        if self.__interval <= 0.0:
+            return math.inf
+        _midnight = datetime.fromtimestamp(now).replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
+        return _midnight + (math.floor((now - _midnight) / self.__interval) + 1.0) * self.__interval
+
+    # +
+    # (hidden) method: __gzip__()
+    # -
+    @staticmethod
+    def __gzip__(source: str = '', dest: str = '') -> None:
+        with open(source, 'rb') as _src, gzip.open(dest, 'wb') as _dst:
+            shutil.copyfileobj(_src, _dst)
+        os.remove(source)
+
+    # +
+    # method: shouldRollover()
+    # -
+    def shouldRollover(self, record: logging.LogRecord = None) -> bool:
+        if time.time() >= self.__rollover:
+            return True
+        if self.__max_bytes > 0:
+            if self.stream is None:
+                self.stream = self._open()
+            return self.stream.tell() >= self.__max_bytes
+        return False
+
+    # +
+    # method: doRollover()
+    # -
+    # noinspection PyBroadException
+    def doRollover(self) -> None:
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+
+        # rolled file(s) are named by when they rolled over
+        if os.path.isfile(self.baseFilename) and os.path.getsize(self.baseFilename) > 0:
+            _stamp, _ext = datetime.now().strftime('%Y%m%dT%H%M%S'), '.gz' if self.__compress else ''
+            _dest, _n = f"{self.baseFilename}.{_stamp}", 0
+            while os.path.exists(f"{_dest}{_ext}"):
+                _n += 1
+                _dest = f"{self.baseFilename}.{_stamp}-{_n}"
+            self.rotate(self.baseFilename, f"{_dest}{_ext}")
+
+            # keep the newest backup(s), 0 keeps them all
+            _rolled = self.rolled
+            for _f in _rolled[:max(len(_rolled) - self.__backups, 0)] if self.__backups > 0 else []:
+                try:
+                    os.remove(_f)
+                except:
+                    pass
+        self.__rollover = self.__boundary__(time.time())
+
+
 # +
 # class: UtilLogger()
 # use: log = UtilLogger(name='CustomLogger', level='DEBUG').logger
@@ -286,84 +894,41 @@ class UtilLogger(object):
     # +
     # (hidden) method: __init__()
     # -
-    def __init__(self, name: str = '', level: str = LOG_LEVELS[0]) -> None:
+    def __init__(self, name: str = '', level: str = LOG_LEVELS[0], queued: bool = True,
+                 repeat: float = LOG_REPEAT, structured: bool = False, max_bytes: int = LOG_MAX_BYTES,
+                 interval: float = LOG_INTERVAL, backups: int = LOG_BACKUPS, compress: bool = True) -> None:
 
         # get arguments(s)
         self.name = name
         self.level = level
+        self.__queued = queued
+        self.__repeat = repeat
+        self.__options = {'queued': queued, 'repeat': repeat, 'structured': structured, 'max_bytes': max_bytes,
+                          'interval': interval, 'backups': backups, 'compress': compress}
 
         # define some variables and initialize them
         self.__msg = None
-        self.__logfile = f'/tmp/{self.__name}.log' if os.path.exists('/tmp') else f'{os.getcwd()}/{self.__name}.log'
-
-        # logger dictionary
-        sassy_logger_dictionary = {
-
-            # logging version
-            'version': 1,
-
-            # do not disable any existing loggers
-            'disable_existing_loggers': False,
-
-            # use the same formatter for everything
-            'formatters': {
-                'SassyColoredFormatter': {
-                    '()': 'colorlog.ColoredFormatter',
-                    'format': LOG_CLR_FMT,
-                    'log_colors': {
-                        'DEBUG': 'cyan',
-                        'INFO': 'green',
-                        'WARNING': 'yellow',
-                        'ERROR': 'red',
-                        'CRITICAL': 'white,bg_red',
-                    }
-                },
-                'SassyConsoleFormatter': {
-                    'format': LOG_CSL_FMT
-                },
-                'SassyFileFormatter': {
-                    'format': LOG_FIL_FMT
-                }
-            },
-
-            # define file and console handlers
-            'handlers': {
-                'colored': {
-                    'class': 'logging.StreamHandler',
-                    'formatter': 'SassyColoredFormatter',
-                    'level': self.__level,
-                },
-                'console': {
-                    'class': 'logging.StreamHandler',
-                    'formatter': 'SassyConsoleFormatter',
-                    'level': self.__level,
-                    'stream': 'ext://sys.stdout'
-                },
-                'file': {
-                    'backupCount': 10,
-                    'class': 'logging.handlers.RotatingFileHandler',
-                    'formatter': 'SassyFileFormatter',
-                    'filename': self.__logfile,
-                    'level': self.__level,
-                    'maxBytes': MAX_BYTES
-                }
-            },
-
-            # make this logger use file and console handlers
-            'loggers': {
-                self.__name: {
-                    'handlers': ['colored', 'file'],
-                    'level': self.__level,
-                    'propagate': True
-                }
-            }
-        }
-
-        # configure logger
-        logging.config.dictConfig(sassy_logger_dictionary)
-
-        # get logger
+        _ext = 'jsonl' if structured else 'log'
+        self.__logfile = f'/tmp/{self.__name}.{_ext}' if os.path.exists('/tmp') else f'{os.getcwd()}/{self.__name}.{_ext}'
+
+        # build the handler(s) once, rather than reconfigure the whole logging module with dictConfig
+        self.__handlers = self.__build__(structured=structured, max_bytes=max_bytes, interval=interval,
+                                         backups=backups, compress=compress)
+
+        # get logger and replace whatever handler(s) an earlier configuration of this name left on it
         self.logger = logging.getLogger(self.__name)
+        self.logger.setLevel(self.__level)
+        self.logger.propagate = True
+        for _h in list(self.logger.handlers):
+            self.logger.removeHandler(_h)
+            _h.close()
+
+        # the caller only enqueues, the shared background thread formats and writes through the handler(s)
+        if self.__queued:
+            self.__listen__()
+        else:
+            for _h in self.__handlers:
+                self.logger.addHandler(_h)
 
     # +
     # decorator(s)
@@ -383,3 +948,92 @@ class UtilLogger(object):
     @level.setter
     def level(self, level: str = '') -> None:
         self.__level = level.strip().upper() if level.strip().upper() in LOG_LEVELS else LOG_LEVELS[0]
+
+    @property
+    def logfile(self) -> str:
+        return f"{self.__logfile}"
+
+    @property
+    def options(self) -> dict:
+        return dict(self.__options)
+
+    # +
+    # method: set_level()
+    # -
+    def set_level(self, level: str = '') -> None:
+        """changes the level of the logger and its handler(s) in place, without reconfiguring them"""
+        self.level = level
+        self.logger.setLevel(self.__level)
+        for _h in self.__handlers + list(self.logger.handlers):
+            _h.setLevel(self.__level)
+
+    # +
+    # (hidden) method: __build__()
+    # -
+    def __build__(self, structured: bool = False, max_bytes: int = LOG_MAX_BYTES, interval: float = LOG_INTERVAL,
+                  backups: int = LOG_BACKUPS, compress: bool = True) -> list:
+        """returns the colored console and the rotating file handler(s) of this logger"""
+        import colorlog
+        _colored = logging.StreamHandler()
+        _colored.setFormatter(colorlog.ColoredFormatter(LOG_CLR_FMT, log_colors={
+            'DEBUG': 'cyan', 'INFO': 'green', 'WARNING': 'yellow', 'ERROR': 'red', 'CRITICAL': 'white,bg_red'}))
+        _file = LogRotatingFileHandler(filename=self.__logfile, max_bytes=max_bytes, interval=interval,
+                                       backups=backups, compress=compress)
+        _file.setFormatter(LogJsonFormatter() if structured else logging.Formatter(LOG_FIL_FMT))
+        for _h in (_colored, _file):
+            _h.setLevel(self.__level)
+        return [_colored, _file]
+
+    # +
+    # (hidden) method: __listen__()
+    # -
+    def __listen__(self) -> None:
+        _writer = log_writer()
+        _handler = LogQueueHandler(_writer.queue, route=self.__name)
+        _handler.setLevel(self.__level)
+        self.logger.addHandler(_handler)
+        for _h in _writer.attach(name=self.__name, handlers=self.__handlers, repeat=self.__repeat):
+            _h.close()
+
+
+# +
+# function: stop_loggers()
+# -
+def stop_loggers() -> None:
+    """writes out every queued record and stops the background writer"""
+    if _LOG_WRITER is not None:
+        _LOG_WRITER.stop()
+
+
+# +
+# function: get_logger()
+# -
+def get_logger(name: str = '', level: str = None, **kwargs) -> logging.Logger:
+    """returns the logger for name, configured by UtilLogger(name, level, **kwargs) only the first time. later
+       call(s) set the level, if given, of the existing logger and warn about option(s) that differ"""
+    _name = name.strip() if name.strip() != '' else os.getenv('USER')
+    with _LOGGERS_LOCK:
+        if _name not in _LOGGERS:
+            _LOGGERS[_name] = UtilLogger(name=_name, level=level or LOG_LEVELS[0], **kwargs)
+            return _LOGGERS[_name].logger
+        _util = _LOGGERS[_name]
+        _options = _util.options
+        _conflicts = {_k: _v for _k, _v in kwargs.items() if _k not in _options or _options[_k] != _v}
+        if level is not None and level.strip().upper() != _util.level:
+            _util.set_level(level)
+    if _conflicts:
+        _util.logger.warning(f"get_logger(name='{_name}') ignored {_conflicts}, already configured with {_options}")
+    return _util.logger
+
+
+# +
+# initialize astropy offline, without prewarming, when asked for in the environment
+# -
+if os.getenv('MAPS_ASTROPY_OFFLINE', '') in TRUE_VALUES:
+    astropy_offline(prewarm=False)
+
+
+# +
+# flush queued log record(s) at exit, before logging shuts its handler(s) down
+# -
+atexit.register(stop_loggers)
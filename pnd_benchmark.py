@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+
+
+# +
+# import(s)
+# -
+from pnd import get_astropy
+from pnd import get_isot
+from pnd import get_jd
+from pnd import get_unix
+from pnd import get_utc
+from pnd import isot_to_jd
+from pnd import jd_to_isot
+from pnd import unix_to_jd
+
+import argparse
+import time
+import timeit
+
+import numpy as np
+
+
+# +
+# constant(s)
+# -
+__doc__ = """python3 pnd_benchmark.py --help"""
+DEFAULT_NUMBER = 2000
+DEFAULT_SIZE = 100000
+ISOT = '2026-10-19T03:11:07.887463'
+JD = 2461332.632730179
+
+
+# +
+# function: astropy_unix()
+# -
+def astropy_unix(ndays: float = 0.0) -> int:
+    """the previous get_unix(), which built two Time objects from isot strings to subtract them"""
+    _now = isot_to_jd(get_utc(ndays=ndays), precise=True)
+    _then = isot_to_jd('1970-01-01T00:00:00.00', precise=True)
+    return int(round((_now - _then)*86400.0))
+
+
+# +
+# function: cases()
+# -
+def cases(size: int = DEFAULT_SIZE) -> list:
+    """returns (name, astropy callable, fast callable, number scale) for each conversion"""
+    _unix = time.time() + np.arange(size, dtype=float)
+    return [
+        ('isot_to_jd', lambda: isot_to_jd(ISOT, precise=True), lambda: isot_to_jd(ISOT), 1.0),
+        ('jd_to_isot', lambda: jd_to_isot(JD, precise=True), lambda: jd_to_isot(JD), 1.0),
+        ('get_jd', lambda: float(get_astropy().Time(get_isot()).jd), lambda: get_jd(), 1.0),
+        ('get_unix', lambda: astropy_unix(), lambda: get_unix(), 1.0),
+        (f'unix_to_jd[{size}]', lambda: get_astropy().Time(_unix, format='unix', scale='utc').jd, lambda: unix_to_jd(_unix), 0.01),
+    ]
+
+
+# +
+# function: execute()
+# -
+def execute(_number: int = DEFAULT_NUMBER, _size: int = DEFAULT_SIZE) -> None:
+    """times each conversion through astropy and through plain arithmetic, after one warm-up call each"""
+    print(f"{'conversion':24s} {'astropy us':>12s} {'fast us':>10s} {'speedup':>9s} {'max diff':>12s}")
+    for _name, _slow, _fast, _scale in cases(size=_size):
+        _n = max(int(_number * _scale), 1)
+        _a, _b = _slow(), _fast()
+        _diff = np.max(np.abs(np.asarray(_a, dtype=float) - np.asarray(_b, dtype=float))) \
+            if not isinstance(_a, str) else float(_a != _b)
+        _ts = timeit.timeit(_slow, number=_n) / _n * 1.0e6
+        _tf = timeit.timeit(_fast, number=_n) / _n * 1.0e6
+        print(f"{_name:24s} {_ts:12.2f} {_tf:10.2f} {_ts / _tf:8.0f}x {_diff:12.3g}")
+
+
+# +
+# main()
+# -
+if __name__ == '__main__':
+
+    # get command line argument(s)
+    _p = argparse.ArgumentParser(description='pnd time conversion benchmark', formatter_class=argparse.RawTextHelpFormatter)
+    _p.add_argument('--number', default=DEFAULT_NUMBER, help=f"""Call(s) per scalar conversion [%(default)s]""")
+    _p.add_argument('--size', default=DEFAULT_SIZE, help=f"""Array size [%(default)s]""")
+    _a = _p.parse_args()
+
+    execute(_number=int(_a.number), _size=int(_a.size))
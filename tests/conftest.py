@@ -0,0 +1,14 @@
+#!/usr/bin/env python3
+
+
+# +
+# import(s)
+# -
+import os
+import sys
+
+
+# +
+# the module(s) under test live in the repository root, not in a package
+# -
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+
+
+# +
+# import(s)
+# -
+from maps_alarm import ALARM_COLD
+from maps_alarm import ALARM_HOT
+from maps_alarm import ALARM_INVALID
+from maps_alarm import ALARM_NORMAL
+from maps_alarm import AlarmEngine
+from maps_registry import CompiledRegistry
+
+
+# +
+# constant(s)
+# -
+DATA = {
+    'tcs.temp': {'datatype': 'float', 'datarange': (0.0, 100.0)},
+    'tcs.mode': {'datatype': 'str', 'datarange': ['on', 'off']},
+}
+
+
+# +
+# function: states()
+# -
+def states(engine: AlarmEngine = None, value: float = 0.0) -> list:
+    return [(_e.old, _e.new) for _e in engine.evaluate([0], [value])]
+
+
+# +
+# test(s)
+# -
+def test_hysteresis_holds_until_back_inside():
+    _ae = AlarmEngine(registry=CompiledRegistry(DATA), deadband=0.0, hysteresis=0.05)
+    assert states(_ae, 50.0) == []
+    assert states(_ae, 101.0) == [(ALARM_NORMAL, ALARM_HOT)]
+    assert states(_ae, 99.0) == []
+    assert states(_ae, 94.0) == [(ALARM_HOT, ALARM_NORMAL)]
+    assert states(_ae, -1.0) == [(ALARM_NORMAL, ALARM_COLD)]
+    assert states(_ae, 4.0) == []
+    assert states(_ae, 6.0) == [(ALARM_COLD, ALARM_NORMAL)]
+
+
+def test_deadband_delays_raising():
+    _ae = AlarmEngine(registry=CompiledRegistry(DATA), deadband=0.1, hysteresis=0.0)
+    assert states(_ae, 109.0) == []
+    assert states(_ae, 111.0) == [(ALARM_NORMAL, ALARM_HOT)]
+
+
+def test_nan_keeps_state():
+    _ae = AlarmEngine(registry=CompiledRegistry(DATA), deadband=0.0, hysteresis=0.0)
+    assert states(_ae, 101.0) == [(ALARM_NORMAL, ALARM_HOT)]
+    assert states(_ae, 'garbage') == []
+    assert _ae.nactive == 1
+
+
+def test_choices():
+    _ae = AlarmEngine(registry=CompiledRegistry(DATA))
+    assert [_e.new for _e in _ae.evaluate([1], ['broken'])] == [ALARM_INVALID]
+    assert [_e.new for _e in _ae.evaluate([1], ['on'])] == [ALARM_NORMAL]
+    assert len(_ae.history) == 2
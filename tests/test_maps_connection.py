@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+
+
+# +
+# import(s)
+# -
+from maps_connection import parse_routes
+from pnd import CustomException
+
+import pytest
+
+
+# +
+# test(s)
+# -
+def test_parse_routes():
+    assert parse_routes('') == {}
+    assert parse_routes('Time=host1:7624, tcs=host2:7625', host='h', port=1) == \
+        {'Time': ('host1', 7624), 'tcs': ('host2', 7625)}
+
+
+def test_parse_routes_defaults():
+    assert parse_routes('Time=host1,tcs=:7625,,', host='h', port=1) == {'Time': ('host1', 1), 'tcs': ('h', 7625)}
+
+
+def test_parse_routes_rejects_bad_route():
+    with pytest.raises(CustomException):
+        parse_routes('Time')
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+
+
+# +
+# import(s)
+# -
+from maps_ingest import IngestQueue
+
+import math
+import queue
+
+import pytest
+
+
+# +
+# test(s)
+# -
+def test_drop_oldest_drops_whole_messages():
+    _iq = IngestQueue(maxsize=2, policy='drop-oldest')
+    for _i in range(4):
+        assert _iq.put((float(_i), math.nan, {'a': _i, 'b': _i}))
+    assert _iq.qsize() == 2
+    assert _iq.drain() == {'a': 3, 'b': 3}
+    assert (_iq.received, _iq.delivered, _iq.dropped, _iq.coalesced, _iq.blocked) == (8, 4, 4, 0, 0)
+
+
+def test_latest_per_key_coalesces_and_bounds_keys():
+    _iq = IngestQueue(maxsize=2, policy='latest-per-key')
+    _iq.put((1.0, math.nan, {'a': 1, 'b': 1}))
+    _iq.put((2.0, math.nan, {'a': 2}))
+    _iq.put((3.0, math.nan, {'c': 3}))
+    _stamps = {}
+    assert _iq.drain(stamps=_stamps) == {'a': 2, 'c': 3}
+    assert sorted(_stamps) == ['a', 'c'] and _stamps['a'][0] == 2.0
+    assert (_iq.received, _iq.delivered, _iq.dropped, _iq.coalesced) == (4, 2, 1, 1)
+
+
+def test_block_times_out_when_full():
+    _iq = IngestQueue(maxsize=1, policy='block')
+    assert _iq.put((1.0, math.nan, {'a': 1}))
+    assert not _iq.put((2.0, math.nan, {'a': 2}), timeout=0.01)
+    assert (_iq.received, _iq.blocked) == (1, 1)
+    _received, _, _message = _iq.get_nowait()
+    assert (_received, _message) == (1.0, {'a': 1})
+    assert _iq.put((3.0, math.nan, {'a': 3}), timeout=0.01)
+
+
+def test_get_nowait_raises_when_empty():
+    for _policy in ('drop-oldest', 'latest-per-key', 'block'):
+        with pytest.raises(queue.Empty):
+            IngestQueue(policy=_policy).get_nowait()
+
+
+def test_drain_limit():
+    _iq = IngestQueue(maxsize=10, policy='drop-oldest')
+    for _i in range(3):
+        _iq.put((float(_i), math.nan, {f"k{_i}": _i}))
+    assert _iq.drain(limit=2) == {'k0': 0, 'k1': 1}
+    assert _iq.qsize() == 1
+
+
+def test_unknown_policy_falls_back():
+    assert IngestQueue(maxsize=0, policy='nonsense').policy == 'drop-oldest'
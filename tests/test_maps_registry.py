@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+
+
+# +
+# import(s)
+# -
+from maps_registry import CompiledRegistry
+from maps_registry import StaleTracker
+
+import numpy as np
+
+
+# +
+# constant(s)
+# -
+DATA = {
+    'Time.Now.JD': {'datatype': 'float', 'rate': 1.0},
+    'Time.Site.Name': {'datatype': 'str'},
+}
+
+
+# +
+# test(s)
+# -
+def test_limits_follow_rate_or_timeout():
+    _st = StaleTracker(registry=CompiledRegistry(DATA), timeout=30.0, factor=5.0, now=0.0)
+    assert _st.limits.tolist() == [5.0, 30.0]
+
+
+def test_sweep_reports_transitions_once():
+    _st = StaleTracker(registry=CompiledRegistry(DATA), timeout=30.0, factor=5.0, now=0.0)
+    _stale, _fresh = _st.sweep(now=1.0)
+    assert (_stale.size, _fresh.size) == (0, 0)
+
+    # the rated stream goes stale first, then the other, and neither is reported twice
+    _stale, _fresh = _st.sweep(now=10.0)
+    assert (_stale.tolist(), _fresh.tolist()) == ([0], [])
+    _stale, _fresh = _st.sweep(now=11.0)
+    assert (_stale.size, _fresh.size) == (0, 0)
+    _stale, _fresh = _st.sweep(now=31.0)
+    assert (_stale.tolist(), _fresh.tolist()) == ([1], [])
+    assert _st.nstale == 2
+
+    # an update makes it fresh again
+    _st.touch(np.array([0]), now=40.0)
+    _stale, _fresh = _st.sweep(now=41.0)
+    assert (_stale.tolist(), _fresh.tolist()) == ([], [0])
+    assert _st.nstale == 1
+
+
+def test_expire_forces_stale():
+    _st = StaleTracker(registry=CompiledRegistry(DATA), now=0.0)
+    _st.expire(np.ones(2, dtype=bool))
+    _stale, _ = _st.sweep(now=0.0)
+    assert _stale.tolist() == [0, 1]
+    _st.touch_all(now=1.0)
+    _, _fresh = _st.sweep(now=1.0)
+    assert _fresh.tolist() == [0, 1]
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+
+
+# +
+# import(s)
+# -
+from pnd import LogRotatingFileHandler
+from pnd import isot_to_unix
+from pnd import jd_to_unix
+from pnd import unix_to_jd
+
+import logging
+import math
+import os
+import time
+
+import numpy as np
+import pytest
+
+
+# +
+# constant(s)
+# -
+ISOTS = ['1970-01-01T00:00:00', '2000-01-01T12:00:00', '2026-10-19T03:11:07.887463']
+
+
+# +
+# function: record()
+# -
+def record(message: str = '') -> logging.LogRecord:
+    return logging.LogRecord('test', logging.INFO, __file__, 0, message, None, None)
+
+
+# +
+# test(s)
+# -
+def test_unix_to_jd_against_astropy():
+    _time = pytest.importorskip('astropy.time').Time
+    _unix = np.array([0.0, 946728000.0, 1792379467.887463])
+    assert np.allclose(unix_to_jd(_unix), _time(_unix, format='unix').jd, rtol=0.0, atol=1.0e-9)
+    assert np.allclose(jd_to_unix(unix_to_jd(_unix)), _unix, rtol=0.0, atol=1.0e-4)
+
+
+def test_isot_to_unix_against_astropy():
+    _time = pytest.importorskip('astropy.time').Time
+    _expected = _time(ISOTS, format='isot', scale='utc').unix
+    assert np.allclose(isot_to_unix(ISOTS), _expected, rtol=0.0, atol=1.0e-6)
+    for _isot, _unix in zip(ISOTS, _expected):
+        assert math.isclose(isot_to_unix(_isot), _unix, abs_tol=1.0e-6)
+    assert math.isnan(isot_to_unix('not a date'))
+
+
+def test_log_rolls_over_at_size(tmp_path):
+    _handler = LogRotatingFileHandler(filename=str(tmp_path / 'maps.log'), max_bytes=100, interval=0.0,
+                                      backups=2, compress=True)
+    _handler.setFormatter(logging.Formatter('%(message)s'))
+    for _i in range(10):
+        _handler.handle(record('x' * 60))
+    _handler.close()
+    assert len(_handler.rolled) == 2
+    assert all(_f.endswith('.gz') for _f in _handler.rolled)
+    assert os.path.getsize(tmp_path / 'maps.log') < 200
+
+
+def test_log_rolls_over_at_time(tmp_path, monkeypatch):
+    _now = [time.time()]
+    monkeypatch.setattr(time, 'time', lambda: _now[0])
+    _handler = LogRotatingFileHandler(filename=str(tmp_path / 'maps.log'), max_bytes=0, interval=60.0,
+                                      backups=0, compress=False)
+    _handler.setFormatter(logging.Formatter('%(message)s'))
+    _handler.handle(record('before'))
+    assert _handler.rolled == []
+    _now[0] += 61.0
+    _handler.handle(record('after'))
+    _handler.close()
+    assert len(_handler.rolled) == 1
+    with open(_handler.rolled[0]) as _f:
+        assert _f.read() == 'before\n'
+    with open(tmp_path / 'maps.log') as _f:
+        assert _f.read() == 'after\n'